@@ -4,6 +4,7 @@ import re
 from collections import namedtuple
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
 
 from django.utils.functional import cached_property
@@ -1136,6 +1137,17 @@ default_config = SearchConfig(
 )
 
 
+# Parse trees only depend on the query string, so the same query shapes built
+# over and over (dashboards, alert subscriptions) skip the grammar entirely.
+# Visiting the tree still happens per call since it depends on the params.
+SEARCH_TREE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=SEARCH_TREE_CACHE_SIZE)
+def parse_search_tree(query: str) -> Node:
+    return event_search_grammar.parse(query)
+
+
 def parse_search_query(
     query, config=None, params=None, builder=None, config_overrides=None
 ) -> list[SearchFilter]:
@@ -1143,7 +1155,7 @@ def parse_search_query(
         config = default_config
 
     try:
-        tree = event_search_grammar.parse(query)
+        tree = parse_search_tree(query)
     except IncompleteParseError as e:
         idx = e.column()
         prefix = query[max(0, idx - 5) : idx]
@@ -1,3 +1,4 @@
+import io
 import zlib
 
 from sentry.utils import metrics
@@ -7,6 +8,12 @@ ATTACHMENT_META_KEY = "{key}:a"
 ATTACHMENT_UNCHUNKED_DATA_KEY = "{key}:a:{id}"
 ATTACHMENT_DATA_CHUNK_KEY = "{key}:a:{id}:{chunk_index}"
 
+# Number of chunks fetched or stored with a single cache call. Together with
+# the chunk size this bounds the memory used for streaming an attachment.
+ATTACHMENT_CHUNK_WINDOW = 8
+# Maximum size of the pieces that chunks are decompressed into.
+ATTACHMENT_STREAM_READ_SIZE = 1024 * 1024
+
 UNINITIALIZED_DATA = object()
 
 
@@ -14,6 +21,31 @@ class MissingAttachmentChunks(Exception):
     pass
 
 
+class AttachmentReader(io.RawIOBase):
+    """
+    Read-only file-like object over the decompressed pieces of an attachment.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
 class CachedAttachment:
     def __init__(
         self,
@@ -63,9 +95,20 @@ class CachedAttachment:
         assert self._data is not UNINITIALIZED_DATA
         return self._data
 
+    def open(self):
+        """
+        Returns a binary file-like object with the attachment's data.
+
+        Cached data is streamed from the cache without holding the entire
+        attachment in memory. Raises ``MissingAttachmentChunks`` while reading
+        if a chunk is missing.
+        """
+        if self._data is UNINITIALIZED_DATA and self._cache is not None:
+            return self._cache.open_data(self)
+        return io.BytesIO(self.data)
+
     def delete(self):
-        for key in self.chunk_keys:
-            self._cache.inner.delete(key)
+        self._cache.inner.delete_many(list(self.chunk_keys))
 
     @property
     def chunk_keys(self):
@@ -132,6 +175,30 @@ class BaseAttachmentCache:
         key = ATTACHMENT_DATA_CHUNK_KEY.format(key=key, id=id, chunk_index=chunk_index)
         self.inner.set(key, zlib.compress(chunk_data), timeout, raw=True)
 
+    def set_chunks(self, key, id, chunks, timeout=None):
+        """
+        Stores the chunks of an attachment, ``ATTACHMENT_CHUNK_WINDOW`` chunks
+        at a time. Returns the number of chunks and their total size.
+        """
+        num_chunks = 0
+        size = 0
+        pending = {}
+
+        for chunk_index, chunk_data in enumerate(chunks):
+            chunk_key = ATTACHMENT_DATA_CHUNK_KEY.format(key=key, id=id, chunk_index=chunk_index)
+            pending[chunk_key] = zlib.compress(chunk_data)
+            num_chunks += 1
+            size += len(chunk_data)
+
+            if len(pending) >= ATTACHMENT_CHUNK_WINDOW:
+                self.inner.set_many(pending, timeout, raw=True)
+                pending = {}
+
+        if pending:
+            self.inner.set_many(pending, timeout, raw=True)
+
+        return num_chunks, size
+
     def set_unchunked_data(self, key, id, data, timeout=None, metrics_tags=None):
         key = ATTACHMENT_UNCHUNKED_DATA_KEY.format(key=key, id=id)
         compressed = zlib.compress(data)
@@ -152,18 +219,40 @@ class BaseAttachmentCache:
             yield CachedAttachment(cache=self, **attachment)
 
     def get_data(self, attachment):
-        data = []
-
-        for key in attachment.chunk_keys:
-            raw_data = self.inner.get(key, raw=True)
-            if raw_data is None:
-                raise MissingAttachmentChunks()
-            data.append(zlib.decompress(raw_data))
-
-        return b"".join(data)
+        return b"".join(self.iter_data(attachment))
+
+    def open_data(self, attachment):
+        return io.BufferedReader(AttachmentReader(self.iter_data(attachment)))
+
+    def iter_data(self, attachment):
+        """
+        Yields the decompressed data of an attachment in pieces of at most
+        ``ATTACHMENT_STREAM_READ_SIZE`` bytes.
+        """
+        keys = list(attachment.chunk_keys)
+
+        for start in range(0, len(keys), ATTACHMENT_CHUNK_WINDOW):
+            window = keys[start : start + ATTACHMENT_CHUNK_WINDOW]
+            raw_chunks = self.inner.get_many(window, raw=True)
+
+            for key in window:
+                raw_data = raw_chunks.pop(key, None)
+                if raw_data is None:
+                    raise MissingAttachmentChunks()
+
+                decompressor = zlib.decompressobj()
+                while not decompressor.eof:
+                    data = decompressor.decompress(raw_data, ATTACHMENT_STREAM_READ_SIZE)
+                    raw_data = decompressor.unconsumed_tail
+                    if data:
+                        yield data
+                    elif not raw_data and not decompressor.eof:
+                        raise zlib.error("Incomplete attachment chunk")
 
     def delete(self, key):
+        keys = []
         for attachment in self.get(key):
-            attachment.delete()
+            keys.extend(attachment.chunk_keys)
+        keys.append(ATTACHMENT_META_KEY.format(key=key))
 
-        self.inner.delete(ATTACHMENT_META_KEY.format(key=key))
+        self.inner.delete_many(keys)
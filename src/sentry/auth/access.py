@@ -21,7 +21,8 @@ import sentry_sdk
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 
-from sentry import features, roles
+from sentry import features, options, roles
+from sentry.auth.access_snapshot import AccessSnapshot, get_access_snapshot
 from sentry.auth.superuser import is_active_superuser
 from sentry.auth.system import SystemToken, is_system_auth
 from sentry.models import (
@@ -240,6 +241,8 @@ class DbAccess(Access):
     permissions: FrozenSet[str] = frozenset()
 
     _member: OrganizationMember | None = None
+    # Precomputed memberships, when available; see `sentry.auth.access_snapshot`.
+    _snapshot: AccessSnapshot | None = None
 
     # TODO(cathy): remove this
     @property
@@ -248,6 +251,8 @@ class DbAccess(Access):
 
     @property
     def roles(self) -> Iterable[str] | None:
+        if self._snapshot is not None:
+            return list(self._snapshot.roles)
         return self._member.get_all_org_roles() if self._member else None
 
     @cached_property
@@ -272,6 +277,8 @@ class DbAccess(Access):
         Compare to accessible_team_ids, which is equal to this property in the
         typical case but represents a superset of IDs in case of superuser access.
         """
+        if self._snapshot is not None:
+            return self._snapshot.team_ids
         return frozenset(team.id for team in self._team_memberships.keys())
 
     @property
@@ -295,6 +302,9 @@ class DbAccess(Access):
         Compare to accessible_project_ids, which is equal to this property in the
         typical case but represents a superset of IDs in case of superuser access.
         """
+        if self._snapshot is not None:
+            return self._snapshot.project_id_set
+
         teams = self._team_memberships.keys()
         if not teams:
             return frozenset()
@@ -632,6 +642,7 @@ class OrganizationMemberAccess(DbAccess):
         scopes: Iterable[str],
         permissions: Iterable[str],
         scopes_upper_bound: Iterable[str] | None,
+        snapshot: AccessSnapshot | None = None,
     ) -> None:
         auth_state = auth_service.get_user_auth_state(
             organization_id=member.organization_id,
@@ -646,6 +657,7 @@ class OrganizationMemberAccess(DbAccess):
 
         super().__init__(
             _member=member,
+            _snapshot=snapshot,
             sso_is_valid=sso_state.is_valid,
             requires_sso=sso_state.is_required,
             has_global_access=has_global_access,
@@ -668,6 +680,8 @@ class OrganizationMemberAccess(DbAccess):
             return False
         if self.has_global_access and self._member.organization.id == project.organization_id:
             return True
+        if self._snapshot is not None:
+            return self._snapshot.has_project(project.id)
         return project.id in self.project_ids_with_team_membership
 
 
@@ -1122,14 +1136,23 @@ def from_member(
     scopes: Iterable[str] | None = None,
     is_superuser: bool = False,
 ) -> Access:
+    snapshot = None
+    if options.get("auth.access-snapshots.enabled"):
+        snapshot = get_access_snapshot(member)
+        member_scopes = snapshot.scopes
+    else:
+        member_scopes = member.get_scopes()
+
     if scopes is not None:
-        scope_intersection = frozenset(scopes) & member.get_scopes()
+        scope_intersection = frozenset(scopes) & member_scopes
     else:
-        scope_intersection = member.get_scopes()
+        scope_intersection = member_scopes
 
     permissions = get_permissions_for_user(member.user_id) if is_superuser else frozenset()
 
-    return OrganizationMemberAccess(member, scope_intersection, permissions, scopes)
+    return OrganizationMemberAccess(
+        member, scope_intersection, permissions, scopes, snapshot=snapshot
+    )
 
 
 def from_rpc_member(
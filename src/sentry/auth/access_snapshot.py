@@ -0,0 +1,195 @@
+"""
+Precomputed, versioned snapshots of an organization member's access.
+
+Building an ``Access`` for an organization member requires a handful of queries
+(team memberships, the projects reachable through those teams and org roles
+granted by teams). Endpoints that evaluate access for many projects, or that are
+hit many times per second by the same user, would otherwise repeat that work on
+every request.
+
+A snapshot is cached in two tiers: a short-lived, bounded in-process cache and
+the shared Django cache. Every snapshot is stamped with the organization's
+access version, which is rotated whenever a membership, team, project or
+organization setting changes (see ``sentry.receivers.access``). A snapshot whose
+version does not match the current one is treated as a miss.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import FrozenSet, Optional, Tuple
+
+from django.db import router, transaction
+
+from sentry.constants import ObjectStatus
+from sentry.models import OrganizationMember, OrganizationMemberTeam, Project, TeamStatus
+from sentry.utils import metrics
+from sentry.utils.cache import cache
+
+# Bump when the layout of ``AccessSnapshot`` changes so that stale pickles are ignored.
+SNAPSHOT_SCHEMA_VERSION = 1
+
+# How long snapshots and version tokens live in the shared cache.
+CACHE_TTL = 60 * 60
+# How long a snapshot may be served from process memory without checking the
+# organization's version in the shared cache.
+LOCAL_CACHE_TTL = 5
+LOCAL_CACHE_MAX_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class AccessSnapshot:
+    version: str
+    member_id: int
+    roles: Tuple[str, ...]
+    scopes: FrozenSet[str]
+    team_ids: FrozenSet[int]
+    # Sorted so membership checks can bisect without materializing a set.
+    project_ids: array
+
+    def has_project(self, project_id: int) -> bool:
+        idx = bisect_left(self.project_ids, project_id)
+        return idx < len(self.project_ids) and self.project_ids[idx] == project_id
+
+    @property
+    def project_id_set(self) -> FrozenSet[int]:
+        return frozenset(self.project_ids)
+
+
+class _LocalSnapshotCache:
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._items: OrderedDict[Tuple[int, int], Tuple[float, AccessSnapshot]] = OrderedDict()
+
+    def get(self, organization_id: int, member_id: int) -> Optional[AccessSnapshot]:
+        key = (organization_id, member_id)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, snapshot = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return snapshot
+
+    def set(self, organization_id: int, snapshot: AccessSnapshot) -> None:
+        key = (organization_id, snapshot.member_id)
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, snapshot)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear_organization(self, organization_id: int) -> None:
+        with self._lock:
+            for key in [k for k in self._items if k[0] == organization_id]:
+                del self._items[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_local_cache = _LocalSnapshotCache(ttl=LOCAL_CACHE_TTL, max_size=LOCAL_CACHE_MAX_SIZE)
+
+
+def _get_version_key(organization_id: int) -> str:
+    return f"access-snapshot:version:{organization_id}"
+
+
+def _get_snapshot_key(organization_id: int, member_id: int) -> str:
+    return f"access-snapshot:{SNAPSHOT_SCHEMA_VERSION}:{organization_id}:{member_id}"
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def build_access_snapshot(member: OrganizationMember, version: str) -> AccessSnapshot:
+    team_ids = frozenset(
+        OrganizationMemberTeam.objects.filter(
+            organizationmember=member, is_active=True, team__status=TeamStatus.ACTIVE
+        ).values_list("team_id", flat=True)
+    )
+    project_ids: array = array("q")
+    if team_ids:
+        project_ids.extend(
+            sorted(
+                Project.objects.filter(status=ObjectStatus.ACTIVE, teams__in=team_ids)
+                .distinct()
+                .values_list("id", flat=True)
+            )
+        )
+
+    return AccessSnapshot(
+        version=version,
+        member_id=member.id,
+        roles=tuple(sorted(member.get_all_org_roles())),
+        scopes=member.get_scopes(),
+        team_ids=team_ids,
+        project_ids=project_ids,
+    )
+
+
+def get_access_snapshot(member: OrganizationMember) -> AccessSnapshot:
+    """
+    Return the access snapshot for ``member``, building and caching it if no
+    snapshot for the organization's current access version exists.
+    """
+    organization_id = member.organization_id
+
+    snapshot = _local_cache.get(organization_id, member.id)
+    if snapshot is not None:
+        metrics.incr("auth.access_snapshot.lookup", tags={"result": "local"}, sample_rate=0.1)
+        return snapshot
+
+    version_key = _get_version_key(organization_id)
+    snapshot_key = _get_snapshot_key(organization_id, member.id)
+    cached = cache.get_many([version_key, snapshot_key])
+
+    version = cached.get(version_key)
+    if version is None:
+        # ``add`` so that concurrent readers agree on a single token.
+        cache.add(version_key, _new_version(), CACHE_TTL)
+        version = cache.get(version_key) or _new_version()
+
+    snapshot = cached.get(snapshot_key)
+    if isinstance(snapshot, AccessSnapshot) and snapshot.version == version:
+        metrics.incr("auth.access_snapshot.lookup", tags={"result": "remote"}, sample_rate=0.1)
+    else:
+        metrics.incr("auth.access_snapshot.lookup", tags={"result": "miss"}, sample_rate=0.1)
+        # The version is read before building so that a concurrent invalidation
+        # leaves this snapshot stamped with the outdated version.
+        snapshot = build_access_snapshot(member, version)
+        cache.set(snapshot_key, snapshot, CACHE_TTL)
+
+    _local_cache.set(organization_id, snapshot)
+    return snapshot
+
+
+def invalidate_organization_access(organization_id: int) -> None:
+    """
+    Rotate the organization's access version, invalidating every member snapshot.
+    """
+    cache.set(_get_version_key(organization_id), _new_version(), CACHE_TTL)
+    _local_cache.clear_organization(organization_id)
+    metrics.incr("auth.access_snapshot.invalidate")
+
+
+def schedule_invalidate_organization_access(model: type, organization_id: int) -> None:
+    """
+    Invalidate the organization's access snapshots once the current transaction
+    on ``model``'s database commits.
+    """
+    transaction.on_commit(
+        lambda: invalidate_organization_access(organization_id), router.db_for_write(model)
+    )
@@ -38,6 +38,26 @@ class BaseCache(local):
     def get(self, key, version=None, raw=False):
         raise NotImplementedError
 
+    def set_many(self, mapping, timeout, version=None, raw=False):
+        for key, value in mapping.items():
+            self.set(key, value, timeout, version=version, raw=raw)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.delete(key, version=version)
+
+    def get_many(self, keys, version=None, raw=False):
+        """
+        Returns a dictionary of the values found for ``keys``. Keys that are
+        not in the cache are omitted.
+        """
+        results = {}
+        for key in keys:
+            result = self.get(key, version=version, raw=raw)
+            if result is not None:
+                results[key] = result
+        return results
+
     def _mark_transaction(self, op):
         """
         Mark transaction with a tag so we can identify system components that rely
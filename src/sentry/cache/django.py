@@ -16,3 +16,16 @@ class DjangoCache(BaseCache):
         result = cache.get(key, version=version or self.version)
         self._mark_transaction("get")
         return result
+
+    def set_many(self, mapping, timeout, version=None, raw=False):
+        cache.set_many(mapping, timeout, version=version or self.version)
+        self._mark_transaction("set_many")
+
+    def delete_many(self, keys, version=None):
+        cache.delete_many(keys, version=version or self.version)
+        self._mark_transaction("delete_many")
+
+    def get_many(self, keys, version=None, raw=False):
+        results = cache.get_many(keys, version=version or self.version)
+        self._mark_transaction("get_many")
+        return results
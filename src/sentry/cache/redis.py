@@ -1,49 +1,182 @@
+import msgpack
+import zstandard
+
+from sentry.exceptions import InvalidConfiguration
 from sentry.utils import json
 from sentry.utils.redis import get_cluster_from_options, redis_clusters
 
 from .base import BaseCache
 
+# Values written by the binary codec start with a NUL byte, which never
+# starts a JSON document, followed by the codec version. Entries written as
+# JSON therefore stay readable when the codec is switched on or off.
+MSGPACK_PREFIX = b"\x00\x01"
+MSGPACK_ZSTD_PREFIX = b"\x00\x02"
+
+CODECS = frozenset(["json", "msgpack"])
+
 
 class ValueTooLarge(Exception):
     pass
 
 
+def _has_only_str_keys(value):
+    """
+    Returns whether all dicts nested in ``value`` have string keys. JSON
+    stringifies other keys while msgpack keeps them, and they cannot be
+    unpacked by default.
+    """
+    pending = [value]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    return False
+                if isinstance(item, (dict, list, tuple)):
+                    pending.append(item)
+        elif isinstance(value, (list, tuple)):
+            pending.extend(item for item in value if isinstance(item, (dict, list, tuple)))
+    return True
+
+
 class CommonRedisCache(BaseCache):
     key_expire = 60 * 60  # 1 hour
     max_size = 50 * 1024 * 1024  # 50MB
+    # msgpack payloads smaller than this are stored uncompressed.
+    compression_threshold = 1024
 
-    def __init__(self, client, **options):
+    def __init__(self, client, codec="json", **options):
+        if codec not in CODECS:
+            raise InvalidConfiguration(f"Unknown cache codec: {codec!r}")
         self.client = client
+        self.codec = codec
         BaseCache.__init__(self, **options)
 
+    def _encode_many(self, values):
+        if self.codec == "json":
+            return [json.dumps(value) for value in values]
+
+        compressor = None
+        encoded = []
+        for value in values:
+            try:
+                if not _has_only_str_keys(value):
+                    raise TypeError("dict keys must be strings")
+                packed = msgpack.packb(value, use_bin_type=True)
+            except (TypeError, OverflowError, ValueError):
+                # Types that only the JSON encoder knows about (dates, UUIDs,
+                # ...), dicts with non-string keys and integers outside of the
+                # 64 bit range are stored as JSON.
+                encoded.append(json.dumps(value))
+                continue
+
+            if len(packed) < self.compression_threshold:
+                encoded.append(MSGPACK_PREFIX + packed)
+            else:
+                if compressor is None:
+                    compressor = zstandard.ZstdCompressor()
+                encoded.append(MSGPACK_ZSTD_PREFIX + compressor.compress(packed))
+        return encoded
+
+    def _decode_many(self, values):
+        decompressor = None
+        decoded = []
+        for value in values:
+            if value is None:
+                decoded.append(None)
+            elif isinstance(value, bytes) and value.startswith(MSGPACK_PREFIX):
+                decoded.append(msgpack.unpackb(value[len(MSGPACK_PREFIX) :], raw=False))
+            elif isinstance(value, bytes) and value.startswith(MSGPACK_ZSTD_PREFIX):
+                if decompressor is None:
+                    decompressor = zstandard.ZstdDecompressor()
+                packed = decompressor.decompress(value[len(MSGPACK_ZSTD_PREFIX) :])
+                decoded.append(msgpack.unpackb(packed, raw=False))
+            else:
+                decoded.append(json.loads(value))
+        return decoded
+
+    def _execute_many(self, commands):
+        """
+        Runs ``(command, *args)`` tuples in a non-transactional pipeline and
+        returns their results. Cluster clients split the pipeline by node.
+        """
+        with self.client.pipeline(transaction=False) as pipe:
+            for command, *args in commands:
+                getattr(pipe, command)(*args)
+            return pipe.execute()
+
+    def _make_set_command(self, key, value, timeout):
+        if len(value) > self.max_size:
+            raise ValueTooLarge(f"Cache key too large: {key!r} {len(value)!r}")
+        if timeout:
+            return ("setex", key, int(timeout), value)
+        return ("set", key, value)
+
     def set(self, key, value, timeout, version=None, raw=False):
         key = self.make_key(key, version=version)
-        v = json.dumps(value) if not raw else value
-        if len(v) > self.max_size:
-            raise ValueTooLarge(f"Cache key too large: {key!r} {len(v)!r}")
-        if timeout:
-            self.client.setex(key, int(timeout), v)
-        else:
-            self.client.set(key, v)
+        v = self._encode_many([value])[0] if not raw else value
+        command, *args = self._make_set_command(key, v, timeout)
+        getattr(self.client, command)(*args)
 
         self._mark_transaction("set")
 
+    def set_many(self, mapping, timeout, version=None, raw=False):
+        if not mapping:
+            return
+
+        keys = [self.make_key(key, version=version) for key in mapping.keys()]
+        values = list(mapping.values())
+        if not raw:
+            values = self._encode_many(values)
+        commands = [self._make_set_command(key, value, timeout) for key, value in zip(keys, values)]
+        self._execute_many(commands)
+
+        self._mark_transaction("set_many")
+
     def delete(self, key, version=None):
         key = self.make_key(key, version=version)
         self.client.delete(key)
 
         self._mark_transaction("delete")
 
+    def delete_many(self, keys, version=None):
+        if not keys:
+            return
+
+        self._execute_many([("delete", self.make_key(key, version=version)) for key in keys])
+
+        self._mark_transaction("delete_many")
+
     def get(self, key, version=None, raw=False):
         key = self.make_key(key, version=version)
         result = self.client.get(key)
         if result is not None and not raw:
-            result = json.loads(result)
+            result = self._decode_many([result])[0]
 
         self._mark_transaction("get")
 
         return result
 
+    def get_many(self, keys, version=None, raw=False):
+        """
+        Returns a dictionary of the values found for ``keys``. Keys that are
+        not in the cache are omitted.
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        results = self._execute_many([("get", self.make_key(key, version=version)) for key in keys])
+        found = [(key, result) for key, result in zip(keys, results) if result is not None]
+        values = [result for _, result in found]
+        if not raw:
+            values = self._decode_many(values)
+
+        self._mark_transaction("get_many")
+
+        return {key: value for (key, _), value in zip(found, values)}
+
 
 class RbCache(CommonRedisCache):
     def __init__(self, **options):
@@ -51,6 +184,13 @@ class RbCache(CommonRedisCache):
         client = cluster.get_routing_client()
         CommonRedisCache.__init__(self, client, **options)
 
+    def _execute_many(self, commands):
+        # The mapping client batches the commands of every host (GETs into a
+        # single MGET) and sends them to all hosts concurrently.
+        with self.client.map() as client:
+            promises = [getattr(client, command)(*args) for command, *args in commands]
+        return [promise.value for promise in promises]
+
 
 # Confusing legacy name for RbCache.  We don't actually have a pure redis cache
 RedisCache = RbCache
@@ -58,5 +198,9 @@ RedisCache = RbCache
 
 class RedisClusterCache(CommonRedisCache):
     def __init__(self, cluster_id, **options):
+        if options.get("codec", "json") != "json":
+            # Clients of redis clusters decode responses as strings, which
+            # binary values cannot survive.
+            raise InvalidConfiguration("RedisClusterCache only supports the json codec")
         client = redis_clusters.get(cluster_id)
         CommonRedisCache.__init__(self, client=client, **options)
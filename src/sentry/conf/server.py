@@ -113,6 +113,7 @@ SENTRY_TRANSACTION_NAMES_REDIS_CLUSTER = "default"
 SENTRY_WEBHOOK_LOG_REDIS_CLUSTER = "default"
 SENTRY_ARTIFACT_BUNDLES_INDEXING_REDIS_CLUSTER = "default"
 SENTRY_DEBUG_FILES_REDIS_CLUSTER = "default"
+SENTRY_GROUPHASH_CACHE_REDIS_CLUSTER = "default"
 
 # Hosts that are allowed to use system token authentication.
 # http://en.wikipedia.org/wiki/Reserved_IP_addresses
@@ -2329,6 +2330,9 @@ SENTRY_TEAM_ROLES = (
 # See sentry/options/__init__.py for more information
 SENTRY_OPTIONS: dict[str, Any] = {}
 SENTRY_DEFAULT_OPTIONS: dict[str, Any] = {}
+# Serve options from an in-process snapshot which is reloaded whenever an option
+# changes, instead of expiring every option separately.
+SENTRY_OPTIONS_SUBSCRIBE = False
 
 # You should not change this setting after your database has been created
 # unless you have altered all schemas first
@@ -3611,6 +3615,10 @@ SENTRY_PROCESSING_SERVICES: Mapping[str, Any] = {
 #     router implementation.
 SENTRY_MODEL_CACHE_USE_REPLICA = False
 
+# Keep instances of models that opt in via `process_cache_ttl` in process memory,
+# in front of the shared cache used by `get_from_cache` and `get_many_from_cache`.
+SENTRY_MODEL_PROCESS_CACHE_ENABLED = False
+
 # Additional consumer definitions beyond the ones defined in sentry.consumers.
 # Necessary for getsentry to define custom consumers.
 SENTRY_KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {}
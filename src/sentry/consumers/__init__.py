@@ -94,7 +94,7 @@ _POST_PROCESS_FORWARDER_OPTIONS = [
         ["--concurrency"],
         default=5,
         type=int,
-        help="Thread pool size for post process worker.",
+        help="Number of post process worker lanes. Messages of a group always use the same lane.",
     )
 ]
 
@@ -1,21 +1,30 @@
 from __future__ import annotations
 
+import copy
+import datetime
+import decimal
 import logging
 import threading
+import time
+import uuid
 import weakref
+from collections import OrderedDict, deque
 from contextlib import contextmanager
 from enum import IntEnum, auto
 from typing import (
     Any,
     Callable,
     Collection,
+    Deque,
     Dict,
+    FrozenSet,
     Generator,
     Generic,
     Mapping,
     MutableMapping,
     Optional,
     Sequence,
+    Set,
     Tuple,
     Type,
 )
@@ -30,6 +39,7 @@ from sentry.db.models.manager import M, make_key
 from sentry.db.models.manager.base_query_set import BaseQuerySet
 from sentry.db.models.query import create_or_update
 from sentry.silo import SiloLimit
+from sentry.utils import metrics
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import md5_text
 
@@ -39,6 +49,207 @@ _local_cache = threading.local()
 _local_cache_generation = 0
 _local_cache_enabled = False
 
+#: Stored in the process cache for lookups that did not match any row.
+_DOES_NOT_EXIST = object()
+
+_process_caches: Dict[str, _ProcessModelCache] = {}
+_process_caches_lock = threading.Lock()
+
+#: Field values of these types can't be mutated in place, and are shared
+#: between the copies of a cached instance.
+_IMMUTABLE_TYPES = (
+    type(None),
+    bool,
+    int,
+    float,
+    str,
+    bytes,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    decimal.Decimal,
+    uuid.UUID,
+)
+
+
+def _copy_instance(instance: Any) -> Any:
+    """
+    Copy a model instance so that mutating the copy, including the values of
+    fields such as ``JSONField`` and the related instances it caches, doesn't
+    change the original.
+    """
+    instance = copy.copy(instance)
+    attrs = instance.__dict__
+    for name, value in attrs.items():
+        if name != "_state" and not isinstance(value, _IMMUTABLE_TYPES):
+            attrs[name] = copy.deepcopy(value)
+    state = attrs["_state"] = copy.copy(attrs["_state"])
+    state.fields_cache = {}
+    return instance
+
+
+class _ProcessModelCache:
+    """
+    A bounded cache of model instances shared by all threads of a process.
+
+    Saving or deleting an instance evicts its lookup keys from the cache of the
+    process right away, and appends them to an invalidation log in the shared
+    cache. Other processes poll the log at most every ``version_check_interval``
+    seconds and evict the logged keys, which bounds how long a process serves an
+    instance that was changed by another process. A process that can't catch
+    up with the log, e.g. because its entries expired, clears its whole cache.
+    """
+
+    #: How many log entries a process catches up on, and how long they are kept.
+    max_log_catch_up = 100
+    log_entry_ttl = 60
+
+    def __init__(
+        self,
+        log_key: str,
+        ttl: float,
+        max_size: int,
+        metrics_tags: Mapping[str, str],
+        version_check_interval: float = 1,
+    ) -> None:
+        self.log_key = log_key
+        self.ttl = ttl
+        self.max_size = max_size
+        self.metrics_tags = metrics_tags
+        self.version_check_interval = version_check_interval
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        # The last position of the shared log that was applied.
+        self._sequence: Optional[int] = None
+        self._checked_at = 0.0
+        # A local counter of evictions, and the keys evicted by the recent ones
+        # (``None`` for all keys). Values loaded before an eviction of their key
+        # are not cached.
+        self._version = 0
+        self._evictions: Deque[Tuple[int, Optional[FrozenSet[str]]]] = deque(
+            maxlen=self.max_log_catch_up
+        )
+
+    def _log_entry_key(self, sequence: int) -> str:
+        return f"{self.log_key}:{sequence}"
+
+    def _evict(self, keys: Optional[Collection[str]]) -> None:
+        # Must be called with the lock held.
+        self._version += 1
+        if keys is None:
+            self._items.clear()
+            self._evictions.append((self._version, None))
+        else:
+            for key in keys:
+                self._items.pop(key, None)
+            self._evictions.append((self._version, frozenset(keys)))
+
+    def _evicted_since(self, key: str, version: int) -> bool:
+        # Must be called with the lock held.
+        if version == self._version:
+            return False
+        if len(self._evictions) == self._evictions.maxlen and self._evictions[0][0] > version + 1:
+            # The evictions since ``version`` are no longer known.
+            return True
+        return any(
+            evicted_version > version and (keys is None or key in keys)
+            for evicted_version, keys in self._evictions
+        )
+
+    def version(self) -> int:
+        """
+        Catch up with the invalidation log if it wasn't checked recently, and
+        return the version to pass to ``set`` for values loaded from now on.
+        """
+        now = time.monotonic()
+        if self._sequence is not None and now - self._checked_at < self.version_check_interval:
+            return self._version
+
+        sequence = cache.get(self.log_key)
+        if sequence is None:
+            cache.add(self.log_key, 0, timeout=None)
+            sequence = cache.get(self.log_key) or 0
+
+        last_sequence = self._sequence
+        evicted: Optional[Set[str]] = set()
+        if last_sequence is None or not 0 <= sequence - last_sequence <= self.max_log_catch_up:
+            evicted = None
+        elif sequence > last_sequence:
+            entry_keys = [self._log_entry_key(n) for n in range(last_sequence + 1, sequence + 1)]
+            entries = cache.get_many(entry_keys)
+            if len(entries) < len(entry_keys):
+                # Expired, or not written yet.
+                evicted = None
+            else:
+                for keys in entries.values():
+                    evicted.update(keys)
+
+        with self._lock:
+            if evicted is None or evicted:
+                self._evict(evicted)
+            self._sequence = sequence
+            self._checked_at = now
+            return self._version
+
+    def get(self, key: str) -> Any:
+        """
+        Return a copy of the cached instance, ``_DOES_NOT_EXIST`` or ``None``
+        on a miss.
+        """
+        self.version()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] < time.monotonic():
+                del self._items[key]
+                item = None
+            if item is not None:
+                self._items.move_to_end(key)
+
+        if item is None:
+            result = "miss"
+            value = None
+        elif item[1] is _DOES_NOT_EXIST:
+            result = "negative_hit"
+            value = _DOES_NOT_EXIST
+        else:
+            result = "hit"
+            value = _copy_instance(item[1])
+        metrics.incr(
+            "db.model_cache.process.lookup",
+            tags={**self.metrics_tags, "result": result},
+            sample_rate=0.1,
+        )
+        return value
+
+    def set(self, key: str, value: Any, version: int) -> None:
+        """
+        Cache ``value``, which must have been loaded after ``version`` was read.
+        """
+        if value is not _DOES_NOT_EXIST:
+            value = _copy_instance(value)
+        with self._lock:
+            if self._evicted_since(key, version):
+                return
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, keys: Collection[str]) -> None:
+        """
+        Evict ``keys`` in this process, and in all other processes once they
+        poll the invalidation log.
+        """
+        try:
+            sequence = cache.incr(self.log_key)
+        except ValueError:
+            cache.add(self.log_key, 0, timeout=None)
+            sequence = cache.incr(self.log_key)
+        cache.set(self._log_entry_key(sequence), list(keys), timeout=self.log_entry_ttl)
+
+        with self._lock:
+            self._evict(keys)
+
 
 class ModelManagerTriggerCondition(IntEnum):
     QUERY = auto()
@@ -65,6 +276,12 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         self.cache_fields = kwargs.pop("cache_fields", [])
         self.cache_ttl = kwargs.pop("cache_ttl", 60 * 5)
         self._cache_version: Optional[str] = kwargs.pop("cache_version", None)
+        #: If set, instances looked up through `cache_fields` are additionally
+        #: kept in process memory for this many seconds, including lookups
+        #: which did not match any row. Only used if
+        #: `SENTRY_MODEL_PROCESS_CACHE_ENABLED` is set.
+        self.process_cache_ttl: Optional[float] = kwargs.pop("process_cache_ttl", None)
+        self.process_cache_max_size: int = kwargs.pop("process_cache_max_size", 1000)
         self.__local_cache = threading.local()
 
         self._triggers: Dict[
@@ -99,6 +316,24 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
 
         return _local_cache.cache
 
+    def _get_process_cache(self) -> Optional[_ProcessModelCache]:
+        if self.process_cache_ttl is None or not settings.SENTRY_MODEL_PROCESS_CACHE_ENABLED:
+            return None
+
+        label = self.model._meta.label
+        process_cache = _process_caches.get(label)
+        if process_cache is None:
+            with _process_caches_lock:
+                process_cache = _process_caches.get(label)
+                if process_cache is None:
+                    process_cache = _process_caches[label] = _ProcessModelCache(
+                        log_key=f"modelcache-invalidations:{label}:{self.cache_version}",
+                        ttl=self.process_cache_ttl,
+                        max_size=self.process_cache_max_size,
+                        metrics_tags={"model": self.model.__name__},
+                    )
+        return process_cache
+
     def _get_cache(self) -> MutableMapping[str, Any]:
         if not hasattr(self.__local_cache, "value"):
             self.__local_cache.value = weakref.WeakKeyDictionary()
@@ -140,6 +375,12 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         if not self.cache_fields:
             return
 
+        if self.process_cache_ttl is not None:
+            # Connected before `__post_save`, which replaces the tracked values
+            # of the cache fields.
+            post_save.connect(self.__invalidate_process_cache, sender=sender, weak=False)
+            post_delete.connect(self.__invalidate_process_cache, sender=sender, weak=False)
+
         post_init.connect(self.__post_init, sender=sender, weak=False)
         post_save.connect(self.__post_save, sender=sender, weak=False)
         post_delete.connect(self.__post_delete, sender=sender, weak=False)
@@ -230,6 +471,30 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
 
         self._execute_triggers(ModelManagerTriggerCondition.DELETE)
 
+    def __invalidate_process_cache(self, instance: M, **kwargs: Any) -> None:
+        """
+        Invalidates the lookups of the instance cached in process memory, in
+        every process. This includes lookups by the previous values of its
+        cache fields, and lookups that didn't match any row before it was
+        created.
+        """
+        process_cache = self._get_process_cache()
+        if process_cache is None:
+            return
+
+        pk_name = instance._meta.pk.name
+        keys = {self.__get_lookup_cache_key(**{pk_name: instance.pk})}
+        previous_values = self.__cache.get(instance, {})
+        for field in self.cache_fields:
+            if field in ("pk", pk_name):
+                continue
+            keys.add(
+                self.__get_lookup_cache_key(**{field: self.__value_for_field(instance, field)})
+            )
+            if field in previous_values:
+                keys.add(self.__get_lookup_cache_key(**{field: previous_values[field]}))
+        process_cache.invalidate(keys)
+
     def __get_lookup_cache_key(self, **kwargs: Any) -> str:
         return make_key(self.model, "modelcache", kwargs)
 
@@ -285,15 +550,40 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 if result is not None:
                     return result
 
+            process_cache = self._get_process_cache()
+            if process_cache is not None:
+                process_cache_version = process_cache.version()
+                result = process_cache.get(cache_key)
+                if result is _DOES_NOT_EXIST:
+                    raise self.model.DoesNotExist(
+                        f"{self.model._meta.object_name} matching query does not exist."
+                    )
+                if result is not None:
+                    result._state.db = router.db_for_read(
+                        self.model, **({**kwargs, "replica": True} if use_replica else kwargs)
+                    )
+                    if local_cache is not None:
+                        local_cache[cache_key] = result
+                    return result
+
             retval = cache.get(cache_key, version=self.cache_version)
             if retval is None:
-                result = self.using_replica().get(**kwargs) if use_replica else self.get(**kwargs)
+                try:
+                    result = (
+                        self.using_replica().get(**kwargs) if use_replica else self.get(**kwargs)
+                    )
+                except self.model.DoesNotExist:
+                    if process_cache is not None:
+                        process_cache.set(cache_key, _DOES_NOT_EXIST, process_cache_version)
+                    raise
                 # need to satisfy mypy
                 assert result
                 # Ensure we're pushing it into the cache
                 self.__post_save(instance=result)
                 if local_cache is not None:
                     local_cache[cache_key] = result
+                if process_cache is not None:
+                    process_cache.set(cache_key, result, process_cache_version)
                 return result
 
             # If we didn't look up by pk we need to hit the reffed
@@ -302,6 +592,8 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 result = self.get_from_cache(**{pk_name: retval})
                 if local_cache is not None:
                     local_cache[cache_key] = result
+                if process_cache is not None:
+                    process_cache.set(cache_key, result, process_cache_version)
                 return result
 
             if not isinstance(retval, self.model):
@@ -319,6 +611,9 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
             kwargs = {**kwargs, "replica": True} if use_replica else {**kwargs}
             retval._state.db = router.db_for_read(self.model, **kwargs)
 
+            if process_cache is not None:
+                process_cache.set(cache_key, retval, process_cache_version)
+
             return retval
         else:
             raise ValueError("We cannot cache this query. Just hit the database.")
@@ -356,9 +651,20 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         cache_lookup_values = []
 
         local_cache = self._get_local_cache()
+        process_cache = self._get_process_cache()
+        if process_cache is not None:
+            process_cache_version = process_cache.version()
         for value in values:
             cache_key = self.__get_lookup_cache_key(**{key: value})
             result = local_cache and local_cache.get(cache_key)
+            if result is None and process_cache is not None:
+                result = process_cache.get(cache_key)
+                if result is _DOES_NOT_EXIST:
+                    continue
+                if result is not None:
+                    result._state.db = router.db_for_read(self.model)
+                    if local_cache is not None:
+                        local_cache[cache_key] = result
             if result is not None:
                 final_results.append(result)
             else:
@@ -406,15 +712,20 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 continue
 
             final_results.append(cache_result)
+            if process_cache is not None:
+                process_cache.set(cache_key, cache_result, process_cache_version)
 
         if nested_lookup_values:
             nested_results = self.get_many_from_cache(nested_lookup_values, key=pk_name)
             final_results.extend(nested_results)
-            if local_cache is not None:
+            if local_cache is not None or process_cache is not None:
                 for nested_result in nested_results:
                     value = getattr(nested_result, key)
                     cache_key = self.__get_lookup_cache_key(**{key: value})
-                    local_cache[cache_key] = nested_result
+                    if local_cache is not None:
+                        local_cache[cache_key] = nested_result
+                    if process_cache is not None:
+                        process_cache.set(cache_key, nested_result, process_cache_version)
 
         if not db_lookup_values:
             return final_results
@@ -422,15 +733,22 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         cache_writes = []
 
         db_results = {getattr(x, key): x for x in self.filter(**{key + "__in": db_lookup_values})}
+        found_values = {str(value) for value in db_results} if process_cache is not None else ()
         for cache_key, value in zip(db_lookup_cache_keys, db_lookup_values):
             db_result = db_results.get(value)
             if db_result is None:
-                continue  # This model ultimately does not exist
+                # This model ultimately does not exist. Values which only
+                # differ in type from a result share its cache key though.
+                if process_cache is not None and str(value) not in found_values:
+                    process_cache.set(cache_key, _DOES_NOT_EXIST, process_cache_version)
+                continue
 
             # Ensure we're pushing it into the cache
             cache_writes.append(db_result)
             if local_cache is not None:
                 local_cache[cache_key] = db_result
+            if process_cache is not None:
+                process_cache.set(cache_key, db_result, process_cache_version)
 
             final_results.append(db_result)
 
@@ -536,6 +854,8 @@ def create_silo_limited_copy(self: BaseManager[M], limit: SiloLimit) -> BaseMana
         manager_instance.cache_fields = self.cache_fields
         manager_instance.cache_ttl = self.cache_ttl
         manager_instance._cache_version = self._cache_version
+        manager_instance.process_cache_ttl = self.process_cache_ttl
+        manager_instance.process_cache_max_size = self.process_cache_max_size
         manager_instance.__local_cache = threading.local()
 
     # Dynamically extend and replace the queryset class. This will affect all
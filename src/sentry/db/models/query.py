@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import itertools
 from functools import reduce
-from typing import Any, Tuple, Type
+from typing import Any, Mapping, Sequence, Tuple, Type
 
-from django.db import IntegrityError, router, transaction
+from django.db import IntegrityError, connections, router, transaction
 from django.db.models import Model, Q
 from django.db.models.expressions import CombinedExpression
 from django.db.models.signals import post_save
@@ -12,6 +12,7 @@ from django.db.models.signals import post_save
 from .utils import resolve_combined_expression
 
 __all__ = (
+    "bulk_insert_ignore_conflicts",
     "create_or_update",
     "update",
     "update_or_create",
@@ -162,6 +163,58 @@ def create_or_update(
     return affected, False
 
 
+def bulk_insert_ignore_conflicts(
+    model: Type[Model],
+    rows: Sequence[Mapping[str, Any]],
+    conflict_fields: Sequence[str],
+    returning: Sequence[str],
+    using: str | None = None,
+) -> list[tuple[Any, ...]]:
+    """
+    Inserts all ``rows`` with a single ``INSERT ... ON CONFLICT DO NOTHING``
+    statement. Rows that conflict with existing rows on ``conflict_fields``
+    are skipped.
+
+    Returns the values of the ``returning`` fields of the rows that were
+    actually inserted. All rows must have the same fields.
+
+    >>> bulk_insert_ignore_conflicts(MyModel, [{'key': 'value'}],
+    >>>     conflict_fields=['key'], returning=['id', 'key'])
+    """
+    if not rows:
+        return []
+
+    if not using:
+        using = router.db_for_write(model)
+
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+
+    names = list(rows[0].keys())
+    fields = [model._meta.get_field(name) for name in names]
+    placeholders = "({})".format(", ".join(["%s"] * len(fields)))
+    params = [
+        field.get_db_prep_save(row[name], connection=connection)
+        for row in rows
+        for name, field in zip(names, fields)
+    ]
+
+    def columns(names: Sequence[str]) -> str:
+        return ", ".join(quote_name(model._meta.get_field(name).column) for name in names)
+
+    sql = "insert into {} ({}) values {} on conflict ({}) do nothing returning {}".format(
+        quote_name(model._meta.db_table),
+        ", ".join(quote_name(field.column) for field in fields),
+        ", ".join([placeholders] * len(rows)),
+        columns(conflict_fields),
+        columns(returning),
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [tuple(row) for row in cursor.fetchall()]
+
+
 def in_iexact(column: str, values: Any) -> Q:
     """Operator to test if any of the given values are (case-insensitive)
     matching to values in the given column."""
@@ -1,8 +1,12 @@
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
 
 from sentry import eventstore, eventstream, models, nodestore
 from sentry.eventstore.models import Event
+from sentry.utils.hashlib import md5_text
 
 from ..base import BaseDeletionTask, BaseRelation, ModelDeletionTask, ModelRelation
 
@@ -33,6 +37,9 @@ DIRECT_GROUP_RELATED_MODELS = (
     models.RuleFireHistory,
 )
 
+# Key in ``ScheduledDeletion.data`` under which event data deletion progress is stored.
+CHECKPOINTS_KEY = "event_data_checkpoints"
+
 _GROUP_RELATED_MODELS = DIRECT_GROUP_RELATED_MODELS + (
     # prioritize GroupHash
     models.UserReport,
@@ -47,21 +54,60 @@ class EventDataDeletionTask(BaseDeletionTask):
 
     # Number of events fetched from eventstore per chunk() call.
     DEFAULT_CHUNK_SIZE = 10000
+    # Number of node ids passed to a single nodestore call, and how many of
+    # those calls run concurrently in the process.
+    NODESTORE_BATCH_SIZE = 1000
+    NODESTORE_CONCURRENCY = 4
 
     def __init__(self, manager, groups, **kwargs):
         self.groups = groups
-        self.last_event = None
         super().__init__(manager, **kwargs)
+        # The (timestamp, event_id) of the last processed event. Events are
+        # processed newest first, so everything newer has already been deleted.
+        self.last_event = None
+        self.scheduled_deletion = _get_scheduled_deletion(self.transaction_id)
+        self._load_checkpoint()
+
+    def _get_checkpoint_key(self):
+        group_ids = sorted(group.id for group in self.groups)
+        return md5_text(",".join(str(group_id) for group_id in group_ids)).hexdigest()
+
+    def _load_checkpoint(self):
+        if self.scheduled_deletion is None:
+            return
+        checkpoint = self.scheduled_deletion.data.get(CHECKPOINTS_KEY, {}).get(
+            self._get_checkpoint_key()
+        )
+        if checkpoint is not None:
+            self.last_event = tuple(checkpoint)
+
+    def _save_checkpoint(self):
+        """
+        Persist how far this task got on the scheduled deletion, so that a
+        retried deletion does not need to page through already deleted events.
+        """
+        if self.scheduled_deletion is None:
+            return
+        data = dict(self.scheduled_deletion.data)
+        checkpoints = dict(data.get(CHECKPOINTS_KEY, {}))
+        key = self._get_checkpoint_key()
+        if self.last_event is None:
+            checkpoints.pop(key, None)
+        else:
+            checkpoints[key] = list(self.last_event)
+        data[CHECKPOINTS_KEY] = checkpoints
+        self.scheduled_deletion.update(data=data)
 
     def chunk(self):
         conditions = []
         if self.last_event is not None:
+            last_timestamp, last_event_id = self.last_event
             conditions.extend(
                 [
-                    ["timestamp", "<=", self.last_event.timestamp],
+                    ["timestamp", "<=", last_timestamp],
                     [
-                        ["timestamp", "<", self.last_event.timestamp],
-                        ["event_id", "<", self.last_event.event_id],
+                        ["timestamp", "<", last_timestamp],
+                        ["event_id", "<", last_event_id],
                     ],
                 ]
             )
@@ -89,27 +135,92 @@ class EventDataDeletionTask(BaseDeletionTask):
             for project_id, group_ids in project_groups.items():
                 eventstream_state = eventstream.backend.start_delete_groups(project_id, group_ids)
                 eventstream.backend.end_delete_groups(eventstream_state)
+            self.last_event = None
+            self._save_checkpoint()
             return False
 
-        self.last_event = events[-1]
-
-        # Remove from nodestore
+        # Remove from nodestore. The nodestore calls run in the background
+        # while the database rows are removed below.
         node_ids = [Event.generate_node_id(event.project_id, event.event_id) for event in events]
-        nodestore.delete_multi(node_ids)
+        node_futures = self._delete_nodes(node_ids)
 
         # Remove EventAttachment and UserReport *again* as those may not have a
         # group ID, therefore there may be dangling ones after "regular" model
         # deletion.
         event_ids = [event.event_id for event in events]
-        models.EventAttachment.objects.filter(
-            event_id__in=event_ids, project_id__in=project_ids
-        ).delete()
+        _delete_event_attachments(event_ids, project_ids)
         models.UserReport.objects.filter(
             event_id__in=event_ids, project_id__in=project_ids
         ).delete()
 
+        for future in node_futures:
+            future.result()
+
+        self.last_event = (events[-1].timestamp, events[-1].event_id)
+        self._save_checkpoint()
         return True
 
+    def _delete_nodes(self, node_ids):
+        batches = [
+            node_ids[i : i + self.NODESTORE_BATCH_SIZE]
+            for i in range(0, len(node_ids), self.NODESTORE_BATCH_SIZE)
+        ]
+        if len(batches) <= 1:
+            nodestore.delete_multi(node_ids)
+            return []
+
+        return [_nodestore_pool.submit(_delete_node_batch, batch) for batch in batches]
+
+
+# Shared by all deletion tasks of the process, so that its threads are reused.
+_nodestore_pool = ThreadPoolExecutor(
+    max_workers=EventDataDeletionTask.NODESTORE_CONCURRENCY, thread_name_prefix=__name__
+)
+
+
+def _delete_node_batch(node_ids):
+    try:
+        nodestore.delete_multi(node_ids)
+    finally:
+        # The threads of the pool outlive the task, so close the database
+        # connections that the nodestore opened in this thread.
+        connections.close_all()
+
+
+def _delete_event_attachments(event_ids, project_ids):
+    """
+    Deletes attachments of the given events with one query, then removes the
+    files that were backing them.
+    """
+    attachments = models.EventAttachment.objects.filter(
+        event_id__in=event_ids, project_id__in=project_ids
+    )
+    file_ids = list(attachments.values_list("file_id", flat=True))
+    if not file_ids:
+        return
+
+    attachments.delete()
+    # File.delete takes care of the blobs, so files are deleted one by one.
+    for file in models.File.objects.filter(id__in=file_ids):
+        file.delete()
+
+
+def _get_scheduled_deletion(transaction_id):
+    """
+    Returns the scheduled deletion this task is running for, if any. Scheduled
+    deletions use their guid as transaction id.
+    """
+    from sentry.tasks.deletion.scheduled import get_scheduled_deletion_processors
+
+    if not transaction_id:
+        return None
+
+    for deletion_orm, _ in get_scheduled_deletion_processors():
+        deletion = deletion_orm.objects.filter(guid=transaction_id).first()
+        if deletion is not None:
+            return deletion
+    return None
+
 
 class GroupDeletionTask(ModelDeletionTask):
     # Delete groups in blocks of 1000. Using 1000 aims to
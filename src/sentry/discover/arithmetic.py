@@ -1,9 +1,11 @@
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, List, Optional, Set, Tuple, Union
 
 from parsimonious.exceptions import ParseError
 from parsimonious.grammar import Grammar, NodeVisitor
+from parsimonious.nodes import Node
 
 from sentry.exceptions import InvalidSearchQuery
 from sentry.search.events.constants import TOTAL_COUNT_ALIAS, TOTAL_TRANSACTION_DURATION_ALIAS
@@ -284,6 +286,12 @@ class ArithmeticVisitor(NodeVisitor):
         return children or node
 
 
+@lru_cache(maxsize=1024)
+def parse_arithmetic_tree(equation: str) -> Node:
+    """Parse trees only depend on the equation, the visitor has to run per call"""
+    return arithmetic_grammar.parse(equation)
+
+
 def parse_arithmetic(
     equation: str,
     max_operators: Optional[int] = None,
@@ -291,7 +299,7 @@ def parse_arithmetic(
 ) -> Tuple[Operation, List[str], List[str]]:
     """Given a string equation try to parse it into a set of Operations"""
     try:
-        tree = arithmetic_grammar.parse(equation)
+        tree = parse_arithmetic_tree(equation)
     except ParseError:
         raise ArithmeticParseError(
             "Unable to parse your equation, make sure it is well formed arithmetic"
@@ -7,9 +7,9 @@ import random
 import re
 import time
 import uuid
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from io import BytesIO
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -54,6 +54,7 @@ from sentry.constants import (
 from sentry.culprit import generate_culprit
 from sentry.dynamic_sampling import LatestReleaseBias, LatestReleaseParams
 from sentry.eventstore.processing import event_processing_store
+from sentry.eventstream.base import EventStreamInsert
 from sentry.eventtypes import EventType
 from sentry.eventtypes.transaction import TransactionEvent
 from sentry.grouping.api import (
@@ -68,6 +69,11 @@ from sentry.grouping.api import (
     get_grouping_config_dict_for_project,
     load_grouping_config,
 )
+from sentry.grouping.grouphash_cache import (
+    cache_grouphashes,
+    get_cached_grouphashes,
+    invalidate_grouphash_cache,
+)
 from sentry.grouping.result import CalculatedHashes
 from sentry.ingest.inbound_filters import FilterStatKeys
 from sentry.issues.grouptype import GroupCategory
@@ -117,6 +123,8 @@ from sentry.signals import (
     first_transaction_received,
     issue_unresolved,
 )
+from sentry.spans.grouping.api import load_span_grouping_config
+from sentry.spans.grouping.result import SpanGroupingResults
 from sentry.tasks.commits import fetch_commits
 from sentry.tasks.integrations import kick_off_status_syncs
 from sentry.tasks.process_buffer import buffer_incr
@@ -145,6 +153,17 @@ SECURITY_REPORT_INTERFACES = ("csp", "hpkp", "expectct", "expectstaple")
 # Timeout for cached group crash report counts
 CRASH_REPORT_TIMEOUT = 24 * 3600  # one day
 
+# Groups whose hashes are about to be moved or deleted. Cached grouphash
+# resolutions pointing at them are not trusted.
+GROUPHASH_CACHE_STALE_GROUP_STATUSES = frozenset(
+    (
+        GroupStatus.PENDING_DELETION,
+        GroupStatus.DELETION_IN_PROGRESS,
+        GroupStatus.PENDING_MERGE,
+        GroupStatus.REPROCESSING,
+    )
+)
+
 
 @dataclass
 class GroupInfo:
@@ -1097,8 +1116,26 @@ def _get_or_create_environment_many(jobs: Sequence[Job], projects: ProjectsMappi
 
 @metrics.wraps("save_event.get_or_create_group_environment_many")
 def _get_or_create_group_environment_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    first_release_ids: dict[tuple[int, int], Optional[int]] = {}
+    for job in jobs:
+        for group_info in job["groups"]:
+            first_release_ids.setdefault(
+                (group_info.group.id, job["environment"].id),
+                job["release"].id if job["release"] else None,
+            )
+
+    if not first_release_ids:
+        return
+
+    group_environments = GroupEnvironment.get_or_create_many(first_release_ids)
+
+    # Only the first event of a batch sees a group environment as new.
+    seen = set()
     for job in jobs:
-        _get_or_create_group_environment(job["environment"], job["release"], job["groups"])
+        for group_info in job["groups"]:
+            key = (group_info.group.id, job["environment"].id)
+            group_info.is_new_group_environment = group_environments[key][1] and key not in seen
+            seen.add(key)
 
 
 def _get_or_create_group_environment(
@@ -1119,30 +1156,79 @@ def _get_or_create_release_associated_models(
     # XXX: This is possibly unnecessarily detached from
     # _get_or_create_release_many, but we do not want to destroy order of
     # execution right now
+    # Events of a batch mostly share their release and environment, so every
+    # combination is only upserted once with the batch's earliest and latest
+    # event timestamps.
+    dates: dict[tuple[Project, Release, Environment], tuple[datetime, datetime]] = {}
     for job in jobs:
         release = job["release"]
         if not release:
             continue
 
-        project = projects[job["project_id"]]
-        environment = job["environment"]
-        date = job["event"].datetime
+        key = (projects[job["project_id"]], release, job["environment"])
+        _extend_date_range(dates, key, job["event"].datetime)
 
+    for (project, release, environment), (first_seen, last_seen) in dates.items():
         ReleaseEnvironment.get_or_create(
-            project=project, release=release, environment=environment, datetime=date
+            project=project,
+            release=release,
+            environment=environment,
+            datetime=last_seen,
+            first_seen=first_seen,
         )
 
         ReleaseProjectEnvironment.get_or_create(
-            project=project, release=release, environment=environment, datetime=date
+            project=project,
+            release=release,
+            environment=environment,
+            datetime=last_seen,
+            first_seen=first_seen,
         )
 
 
+def _extend_date_range(
+    dates: MutableMapping[Any, tuple[datetime, datetime]], key: Any, date: datetime
+) -> None:
+    if key not in dates:
+        dates[key] = (date, date)
+    else:
+        first_seen, last_seen = dates[key]
+        dates[key] = (min(first_seen, date), max(last_seen, date))
+
+
 def _increment_release_associated_counts_many(
     jobs: Sequence[Job], projects: ProjectsMapping
 ) -> None:
+    rp_new_groups: dict[tuple[int, int], int] = defaultdict(int)
+    rpe_new_groups: dict[tuple[int, int, int], int] = defaultdict(int)
     for job in jobs:
-        _increment_release_associated_counts(
-            projects[job["project_id"]], job["environment"], job["release"], job["groups"]
+        release = job["release"]
+        if not release:
+            continue
+
+        project_id = job["project_id"]
+        environment_id = job["environment"].id
+        for group_info in job["groups"]:
+            if group_info.is_new:
+                rp_new_groups[(release.id, project_id)] += 1
+            if group_info.is_new_group_environment:
+                rpe_new_groups[(project_id, release.id, environment_id)] += 1
+
+    for (release_id, project_id), count in rp_new_groups.items():
+        buffer_incr(
+            ReleaseProject,
+            {"new_groups": count},
+            {"release_id": release_id, "project_id": project_id},
+        )
+    for (project_id, release_id, environment_id), count in rpe_new_groups.items():
+        buffer_incr(
+            ReleaseProjectEnvironment,
+            {"new_issues_count": count},
+            {
+                "project_id": project_id,
+                "release_id": release_id,
+                "environment_id": environment_id,
+            },
         )
 
 
@@ -1182,10 +1268,26 @@ def _increment_release_associated_counts(
 
 @metrics.wraps("save_event.get_or_create_group_release_many")
 def _get_or_create_group_release_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    dates: dict[tuple[Group, Release, Environment], tuple[datetime, datetime]] = {}
     for job in jobs:
-        _get_or_create_group_release(
-            job["environment"], job["release"], job["event"], job["groups"]
-        )
+        release = job["release"]
+        if not release:
+            continue
+
+        date = job["event"].datetime
+        for group_info in job["groups"]:
+            _extend_date_range(dates, (group_info.group, release, job["environment"]), date)
+
+    if not dates:
+        return
+
+    group_releases = GroupRelease.get_or_create_many(dates)
+    for job in jobs:
+        if job["release"]:
+            for group_info in job["groups"]:
+                group_info.group_release = group_releases[
+                    (group_info.group, job["release"], job["environment"])
+                ]
 
 
 def _get_or_create_group_release(
@@ -1286,6 +1388,7 @@ def _nodestore_save_many(jobs: Sequence[Job]) -> None:
 
 @metrics.wraps("save_event.eventstream_insert_many")
 def _eventstream_insert_many(jobs: Sequence[Job]) -> None:
+    inserts: list[EventStreamInsert] = []
     for job in jobs:
         if job["event"].project_id == settings.SENTRY_PROJECT:
             metrics.incr(
@@ -1319,22 +1422,26 @@ def _eventstream_insert_many(jobs: Sequence[Job]) -> None:
                 if gi is not None
             ]
 
-        eventstream.backend.insert(
-            event=job["event"],
-            is_new=is_new,
-            is_regression=is_regression,
-            is_new_group_environment=is_new_group_environment,
-            primary_hash=job["event"].get_primary_hash(),
-            received_timestamp=job["received_timestamp"],
-            # We are choosing to skip consuming the event back
-            # in the eventstream if it's flagged as raw.
-            # This means that we want to publish the event
-            # through the event stream, but we don't care
-            # about post processing and handling the commit.
-            skip_consume=job.get("raw", False),
-            group_states=group_states,
+        inserts.append(
+            {
+                "event": job["event"],
+                "is_new": is_new,
+                "is_regression": is_regression,
+                "is_new_group_environment": is_new_group_environment,
+                "primary_hash": job["event"].get_primary_hash(),
+                "received_timestamp": job["received_timestamp"],
+                # We are choosing to skip consuming the event back
+                # in the eventstream if it's flagged as raw.
+                # This means that we want to publish the event
+                # through the event stream, but we don't care
+                # about post processing and handling the commit.
+                "skip_consume": job.get("raw", False),
+                "group_states": group_states,
+            }
         )
 
+    eventstream.backend.insert_many(inserts)
+
 
 @metrics.wraps("save_event.track_outcome_accepted_many")
 def _track_outcome_accepted_many(jobs: Sequence[Job]) -> None:
@@ -1473,13 +1580,28 @@ def _save_aggregate(
     metadata: dict[str, Any],
     received_timestamp: Union[int, float],
     migrate_off_hierarchical: Optional[bool] = False,
+    use_grouphash_cache: bool = True,
     **kwargs: Any,
 ) -> Optional[GroupInfo]:
     project = event.project
 
-    flat_grouphashes = [
-        GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
-    ]
+    # Hierarchical grouping always needs to look at the state of the
+    # hierarchical hashes, so cached resolutions would not save any queries.
+    use_grouphash_cache = (
+        use_grouphash_cache
+        and not hashes.hierarchical_hashes
+        and options.get("grouping.grouphash-cache.enabled")
+    )
+    cached_grouphashes, grouphash_cache_version = (
+        get_cached_grouphashes(project, hashes.hashes) if use_grouphash_cache else (None, None)
+    )
+
+    if cached_grouphashes is not None:
+        flat_grouphashes = cached_grouphashes
+    else:
+        flat_grouphashes = [
+            GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
+        ]
 
     # The root_hierarchical_hash is the least specific hash within the tree, so
     # typically hierarchical_hashes[0], unless a hash `n` has been split in
@@ -1586,7 +1708,30 @@ def _save_aggregate(
 
                 return GroupInfo(group, is_new, is_regression)
 
-    group = Group.objects.get(id=existing_grouphash.group_id)
+    if cached_grouphashes is not None:
+        group = Group.objects.filter(id=existing_grouphash.group_id).first()
+        if group is None or group.status in GROUPHASH_CACHE_STALE_GROUP_STATUSES:
+            # The group was deleted, merged or is being reprocessed after the
+            # resolution was cached. Resolve the hashes from the database.
+            invalidate_grouphash_cache(project.id)
+            return _save_aggregate(
+                event=event,
+                hashes=hashes,
+                release=release,
+                metadata=metadata,
+                received_timestamp=received_timestamp,
+                migrate_off_hierarchical=migrate_off_hierarchical,
+                use_grouphash_cache=False,
+                **kwargs,
+            )
+    else:
+        group = Group.objects.get(id=existing_grouphash.group_id)
+        if (
+            grouphash_cache_version is not None
+            and group.status not in GROUPHASH_CACHE_STALE_GROUP_STATUSES
+        ):
+            cache_grouphashes(project, flat_grouphashes, grouphash_cache_version)
+
     if group.issue_category != GroupCategory.ERROR:
         logger.info(
             "event_manager.category_mismatch",
@@ -2129,9 +2274,17 @@ def save_attachment(
     else:
         timestamp = datetime.utcnow().replace(tzinfo=UTC)
 
+    file = File.objects.create(
+        name=attachment.name,
+        type=attachment.type,
+        headers={"Content-Type": attachment.content_type},
+    )
+
     try:
-        data = attachment.data
+        with attachment.open() as fp:
+            file.putfile(fp, blob_size=settings.SENTRY_ATTACHMENT_BLOB_SIZE)
     except MissingAttachmentChunks:
+        file.delete()
         track_outcome(
             org_id=project.organization_id,
             project_id=project.id,
@@ -2145,13 +2298,10 @@ def save_attachment(
 
         logger.exception("Missing chunks for cache_key=%s", cache_key)
         return
-
-    file = File.objects.create(
-        name=attachment.name,
-        type=attachment.type,
-        headers={"Content-Type": attachment.content_type},
-    )
-    file.putfile(BytesIO(data), blob_size=settings.SENTRY_ATTACHMENT_BLOB_SIZE)
+    except Exception:
+        # Don't leave an orphaned file behind if streaming fails otherwise.
+        file.delete()
+        raise
 
     EventAttachment.objects.create(
         event_id=event_id,
@@ -2268,13 +2418,25 @@ def _calculate_event_grouping(
 
 @metrics.wraps("save_event.calculate_span_grouping")
 def _calculate_span_grouping(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
-    for job in jobs:
+    # Group the spans of all events in one pass, so that they share the
+    # memoized fingerprints. Should any event be malformed, fall back to
+    # grouping the events one by one.
+    all_groupings: Sequence[Optional[SpanGroupingResults]]
+    try:
+        with metrics.timer("event_manager.save.get_span_groupings.default"):
+            config = load_span_grouping_config()
+            all_groupings = config.execute_strategy_many([job["event"].data for job in jobs])
+    except Exception:
+        all_groupings = [None] * len(jobs)
+
+    for job, groupings in zip(jobs, all_groupings):
         # Make sure this snippet doesn't crash ingestion
         # as the feature is under development.
         try:
             event = job["event"]
-            with metrics.timer("event_manager.save.get_span_groupings.default"):
-                groupings = event.get_span_groupings()
+            if groupings is None:
+                with metrics.timer("event_manager.save.get_span_groupings.default"):
+                    groupings = event.get_span_groupings()
             groupings.write_to_event(event.data)
 
             metrics.timing("save_event.transaction.span_count", len(groupings.results))
@@ -47,6 +47,22 @@ class GroupState(TypedDict):
 GroupStates = Sequence[GroupState]
 
 
+class EventStreamInsert(TypedDict):
+    """
+    The arguments of a single ``EventStream.insert`` call, as passed to
+    ``EventStream.insert_many``.
+    """
+
+    event: Event | GroupEvent
+    is_new: bool
+    is_regression: bool
+    is_new_group_environment: bool
+    primary_hash: Optional[str]
+    received_timestamp: float
+    skip_consume: bool
+    group_states: Optional[GroupStates]
+
+
 class EventStreamEventType(Enum):
     """
     We have 3 broad categories of event types that we care about in eventstream.
@@ -60,6 +76,7 @@ class EventStreamEventType(Enum):
 class EventStream(Service):
     __all__ = (
         "insert",
+        "insert_many",
         "start_delete_groups",
         "end_delete_groups",
         "start_merge",
@@ -153,6 +170,15 @@ class EventStream(Service):
             occurrence_id=event.occurrence_id if isinstance(event, GroupEvent) else None,
         )
 
+    def insert_many(self, inserts: Sequence[EventStreamInsert]) -> None:
+        """
+        Inserts the events of a save batch. Backends that can publish several
+        events at once override this; by default each event is inserted on
+        its own.
+        """
+        for insert in inserts:
+            self.insert(**insert)
+
     def start_delete_groups(
         self, project_id: int, group_ids: Sequence[int]
     ) -> Optional[Mapping[str, Any]]:
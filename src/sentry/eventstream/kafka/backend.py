@@ -9,6 +9,7 @@ from typing import (
     MutableMapping,
     Optional,
     Sequence,
+    Set,
     Tuple,
     Union,
 )
@@ -19,8 +20,12 @@ from confluent_kafka import Producer
 from django.conf import settings
 
 from sentry import options
-from sentry.eventstream.base import EventStreamEventType, GroupStates
-from sentry.eventstream.snuba import KW_SKIP_SEMANTIC_PARTITIONING, SnubaProtocolEventStream
+from sentry.eventstream.base import EventStreamEventType, EventStreamInsert, GroupStates
+from sentry.eventstream.snuba import (
+    KW_SKIP_SEMANTIC_PARTITIONING,
+    EventStreamMessage,
+    SnubaProtocolEventStream,
+)
 from sentry.killswitches import killswitch_matches_context
 from sentry.post_process_forwarder import PostProcessForwarder, PostProcessForwarderType
 from sentry.utils import json
@@ -37,18 +42,35 @@ class KafkaEventStream(SnubaProtocolEventStream):
         self.topic = settings.KAFKA_EVENTS
         self.transactions_topic = settings.KAFKA_TRANSACTIONS
         self.issue_platform_topic = settings.KAFKA_EVENTSTREAM_GENERIC
+        # Producers are shared by all topics of a cluster.
         self.__producers: MutableMapping[str, Producer] = {}
 
     def get_transactions_topic(self, project_id: int) -> str:
         return self.transactions_topic
 
     def get_producer(self, topic: str) -> Producer:
-        if topic not in self.__producers:
-            cluster_name = get_topic_definition(topic)["cluster"]
+        cluster_name = get_topic_definition(topic)["cluster"]
+        if cluster_name not in self.__producers:
             cluster_options = get_kafka_producer_cluster_options(cluster_name)
-            self.__producers[topic] = Producer(cluster_options)
+            # Batching is tuned through options rather than the cluster
+            # configuration, which is shared with every other producer.
+            linger_ms = options.get("eventstream:kafka-producer.linger-ms")
+            if linger_ms:
+                cluster_options["linger.ms"] = linger_ms
+            batch_num_messages = options.get("eventstream:kafka-producer.batch-num-messages")
+            if batch_num_messages:
+                cluster_options["batch.num.messages"] = batch_num_messages
+            self.__producers[cluster_name] = Producer(cluster_options)
+
+        return self.__producers[cluster_name]
 
-        return self.__producers[topic]
+    def _get_topic(self, project_id: int, event_type: EventStreamEventType) -> str:
+        if event_type == EventStreamEventType.Transaction:
+            return self.get_transactions_topic(project_id)
+        elif event_type == EventStreamEventType.Generic:
+            return self.issue_platform_topic
+        else:
+            return self.topic
 
     def delivery_callback(self, error: Optional[KafkaError], message: KafkaMessage) -> None:
         if error is not None:
@@ -116,21 +138,9 @@ class KafkaEventStream(SnubaProtocolEventStream):
                 ),
             }
 
-    def insert(
-        self,
-        event: Union[Event, GroupEvent],
-        is_new: bool,
-        is_regression: bool,
-        is_new_group_environment: bool,
-        primary_hash: Optional[str],
-        received_timestamp: float,
-        skip_consume: bool = False,
-        group_states: Optional[GroupStates] = None,
-        **kwargs: Any,
-    ) -> None:
+    def _assign_partitions_randomly(self, event: Event | GroupEvent) -> bool:
         event_type = self._get_event_type(event)
-
-        assign_partitions_randomly = (
+        return (
             (event_type == EventStreamEventType.Generic)
             or (event_type == EventStreamEventType.Transaction)
             or killswitch_matches_context(
@@ -139,10 +149,22 @@ class KafkaEventStream(SnubaProtocolEventStream):
             )
         )
 
-        if assign_partitions_randomly:
+    def _get_insert_message(
+        self,
+        event: Event | GroupEvent,
+        is_new: bool,
+        is_regression: bool,
+        is_new_group_environment: bool,
+        primary_hash: Optional[str],
+        received_timestamp: float,
+        skip_consume: bool = False,
+        group_states: Optional[GroupStates] = None,
+        **kwargs: Any,
+    ) -> Optional[EventStreamMessage]:
+        if self._assign_partitions_randomly(event):
             kwargs[KW_SKIP_SEMANTIC_PARTITIONING] = True
 
-        super().insert(
+        return super()._get_insert_message(
             event,
             is_new,
             is_regression,
@@ -154,6 +176,19 @@ class KafkaEventStream(SnubaProtocolEventStream):
             **kwargs,
         )
 
+    def insert_many(self, inserts: Sequence[EventStreamInsert]) -> None:
+        """
+        Encodes the messages of all events before producing any of them, and
+        polls each producer once per batch instead of once per event.
+        """
+        messages = []
+        for insert in inserts:
+            message = self._get_insert_message(**insert)
+            if message is not None:
+                messages.append(message)
+
+        self._send_many(messages)
+
     def _send(
         self,
         project_id: int,
@@ -164,19 +199,60 @@ class KafkaEventStream(SnubaProtocolEventStream):
         skip_semantic_partitioning: bool = False,
         event_type: EventStreamEventType = EventStreamEventType.Error,
     ) -> None:
-        if headers is None:
-            headers = {}
-        headers["operation"] = _type
-        headers["version"] = str(self.EVENT_PROTOCOL_VERSION)
+        self._send_many(
+            [
+                EventStreamMessage(
+                    project_id=project_id,
+                    type=_type,
+                    extra_data=extra_data,
+                    headers=headers if headers is not None else {},
+                    skip_semantic_partitioning=skip_semantic_partitioning,
+                    event_type=event_type,
+                )
+            ],
+            asynchronous=asynchronous,
+        )
 
-        if event_type == EventStreamEventType.Transaction:
-            topic = self.get_transactions_topic(project_id)
-        elif event_type == EventStreamEventType.Generic:
-            topic = self.issue_platform_topic
-        else:
-            topic = self.topic
+    def _send_many(
+        self,
+        messages: Sequence[EventStreamMessage],
+        asynchronous: bool = True,
+    ) -> None:
+        """
+        Produces a batch of messages. All messages are encoded before the
+        first one is produced, and when ``asynchronous`` is false delivery is
+        only waited for once, after the last message was produced.
+        """
+        encoded = []
+        for message in messages:
+            assert isinstance(message.extra_data, tuple)
+
+            headers = message.headers
+            headers["operation"] = message.type
+            headers["version"] = str(self.EVENT_PROTOCOL_VERSION)
 
-        producer = self.get_producer(topic)
+            try:
+                value = json.dumps_bytes(
+                    (self.EVENT_PROTOCOL_VERSION, message.type) + message.extra_data
+                )
+            except Exception as error:
+                logger.error("Could not publish message: %s", error, exc_info=True)
+                continue
+
+            topic = self._get_topic(message.project_id, message.event_type)
+            encoded.append(
+                (
+                    self.get_producer(topic),
+                    topic,
+                    str(message.project_id).encode("utf-8")
+                    if not message.skip_semantic_partitioning
+                    else None,
+                    value,
+                    [(k, v.encode("utf-8")) for k, v in headers.items()],
+                )
+            )
+
+        producers: Set[Producer] = {producer for producer, *_ in encoded}
 
         # Polling the producer is required to ensure callbacks are fired. This
         # means that the latency between a message being delivered (or failing
@@ -188,25 +264,25 @@ class KafkaEventStream(SnubaProtocolEventStream):
         # a heartbeat for the purposes of any sort of session expiration.)
         # Note that this call to poll() is *only* dealing with earlier
         # asynchronous produce() calls from the same process.
-        producer.poll(0.0)
+        for producer in producers:
+            producer.poll(0.0)
 
-        assert isinstance(extra_data, tuple)
-
-        try:
-            producer.produce(
-                topic=topic,
-                key=str(project_id).encode("utf-8") if not skip_semantic_partitioning else None,
-                value=json.dumps((self.EVENT_PROTOCOL_VERSION, _type) + extra_data),
-                on_delivery=self.delivery_callback,
-                headers=[(k, v.encode("utf-8")) for k, v in headers.items()],
-            )
-        except Exception as error:
-            logger.error("Could not publish message: %s", error, exc_info=True)
-            return
+        for producer, topic, key, value, encoded_headers in encoded:
+            try:
+                producer.produce(
+                    topic=topic,
+                    key=key,
+                    value=value,
+                    on_delivery=self.delivery_callback,
+                    headers=encoded_headers,
+                )
+            except Exception as error:
+                logger.error("Could not publish message: %s", error, exc_info=True)
 
         if not asynchronous:
             # flush() is a convenience method that calls poll() until len() is zero
-            producer.flush()
+            for producer in producers:
+                producer.flush()
 
     def requires_post_process_forwarder(self) -> bool:
         return True
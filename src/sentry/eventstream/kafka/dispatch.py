@@ -1,7 +1,7 @@
 import logging
 import random
 from contextlib import contextmanager
-from typing import Any, Generator, Mapping, Optional
+from typing import Any, Generator, Hashable, Mapping, Optional
 
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.types import Message
@@ -90,6 +90,23 @@ def _get_task_kwargs_and_dispatch(message: Message[KafkaPayload]) -> None:
     dispatch_post_process_group_task(**task_kwargs)
 
 
+def _get_ordering_key(message: Message[KafkaPayload]) -> Hashable:
+    """
+    Messages of the same group are dispatched in order. Messages without a
+    group have nothing to be ordered against and are spread by event.
+    """
+    headers = dict(message.payload.headers)
+    if headers.get("group_id") is not None:
+        return (headers.get("project_id"), headers["group_id"])
+    if headers.get("event_id") is not None:
+        return headers["event_id"]
+    # Messages produced without headers are keyed by project.
+    return message.payload.key
+
+
 class EventPostProcessForwarderStrategyFactory(PostProcessForwarderStrategyFactory):
     def _dispatch_function(self, message: Message[KafkaPayload]) -> None:
         return _get_task_kwargs_and_dispatch(message)
+
+    def _get_ordering_key(self, message: Message[KafkaPayload]) -> Hashable:
+        return _get_ordering_key(message)
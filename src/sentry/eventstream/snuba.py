@@ -8,6 +8,7 @@ from typing import (
     Collection,
     Mapping,
     MutableMapping,
+    NamedTuple,
     Optional,
     Sequence,
     Tuple,
@@ -80,6 +81,19 @@ if TYPE_CHECKING:
 #   })
 
 
+class EventStreamMessage(NamedTuple):
+    """
+    The arguments of a single ``_send`` call.
+    """
+
+    project_id: int
+    type: str
+    extra_data: Tuple[Any, ...]
+    headers: MutableMapping[str, str]
+    skip_semantic_partitioning: bool
+    event_type: EventStreamEventType
+
+
 class SnubaProtocolEventStream(EventStream):
 
     # Beware! Changing this protocol (introducing a new version, or the message
@@ -120,13 +134,48 @@ class SnubaProtocolEventStream(EventStream):
         group_states: Optional[GroupStates] = None,
         **kwargs: Any,
     ) -> None:
+        message = self._get_insert_message(
+            event,
+            is_new,
+            is_regression,
+            is_new_group_environment,
+            primary_hash,
+            received_timestamp,
+            skip_consume,
+            group_states,
+            **kwargs,
+        )
+        if message is None:
+            return
+
+        self._send(
+            message.project_id,
+            message.type,
+            extra_data=message.extra_data,
+            headers=message.headers,
+            skip_semantic_partitioning=message.skip_semantic_partitioning,
+            event_type=message.event_type,
+        )
+
+    def _get_insert_message(
+        self,
+        event: Event | GroupEvent,
+        is_new: bool,
+        is_regression: bool,
+        is_new_group_environment: bool,
+        primary_hash: Optional[str],
+        received_timestamp: float,
+        skip_consume: bool = False,
+        group_states: Optional[GroupStates] = None,
+        **kwargs: Any,
+    ) -> Optional[EventStreamMessage]:
         if isinstance(event, GroupEvent) and not event.occurrence:
             logger.error(
                 "`GroupEvent` passed to `EventStream.insert`. `GroupEvent` may only be passed when "
                 "associated with an `IssueOccurrence`",
                 exc_info=True,
             )
-            return
+            return None
         project = event.project
         set_current_event_project(project.id)
         retention_days = quotas.backend.get_event_retention(organization=project.organization)
@@ -176,9 +225,9 @@ class SnubaProtocolEventStream(EventStream):
             # transactions processing has a configurable 'skipped contexts' to skip writing specific contexts maps
             # to the row. for now, we're ignoring that until we have a need for it
 
-        self._send(
-            project.id,
-            "insert",
+        return EventStreamMessage(
+            project_id=project.id,
+            type="insert",
             extra_data=(
                 {
                     "group_id": event.group_id,
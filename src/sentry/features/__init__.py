@@ -301,6 +301,7 @@ entity_features = default_manager.entity_features
 get = default_manager.get
 has = default_manager.has
 batch_has = default_manager.batch_has
+evaluate = default_manager.evaluate
 all = default_manager.all
 add_handler = default_manager.add_handler
 add_entity_handler = default_manager.add_entity_handler
@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import logging
 
-__all__ = ["FeatureManager"]
+__all__ = ["FeatureManager", "FeatureSnapshot"]
 
 import abc
+import threading
 from collections import defaultdict
 from typing import (
     TYPE_CHECKING,
     Any,
+    Dict,
     Iterable,
     List,
     Mapping,
@@ -16,19 +18,116 @@ from typing import (
     MutableSet,
     Optional,
     Sequence,
+    Set,
+    Tuple,
     Type,
 )
 
 import sentry_sdk
+from celery import current_task
+from celery.signals import task_postrun, task_prerun
 from django.conf import settings
+from django.core.signals import request_finished
 
-from .base import Feature, FeatureHandlerStrategy
+from .base import Feature, FeatureHandlerStrategy, OrganizationFeature, ProjectFeature
 from .exceptions import FeatureNotRegistered
 
 if TYPE_CHECKING:
     from sentry.features.handler import FeatureHandler
     from sentry.models import Organization, Project, User
 
+_snapshot_cache = threading.local()
+
+
+def _get_snapshot_cache() -> Optional[MutableMapping[Tuple[Any, ...], FeatureSnapshot]]:
+    """
+    Snapshots are cached for the duration of the current request or task.
+    Outside of both there is no point at which flags could be refreshed, so
+    nothing is cached.
+    """
+    from sentry.app import env
+
+    if env.request is None and not current_task:
+        return None
+    if not hasattr(_snapshot_cache, "items"):
+        _snapshot_cache.items = {}
+    return _snapshot_cache.items
+
+
+def clear_snapshot_cache(**kwargs: Any) -> None:
+    _snapshot_cache.items = {}
+
+
+request_finished.connect(clear_snapshot_cache)
+task_prerun.connect(clear_snapshot_cache)
+task_postrun.connect(clear_snapshot_cache)
+
+
+class FeatureSnapshot:
+    """
+    The evaluated feature flags of an organization and a set of its projects
+    for one actor, as returned by ``FeatureManager.evaluate``.
+
+    Flags are stored as one bitmask for the organization and one per project,
+    where bit ``n`` is the flag of ``feature_names[n]``.
+    """
+
+    __slots__ = ("feature_names", "_index", "_organization_flags", "_project_flags")
+
+    def __init__(
+        self,
+        feature_names: Sequence[str],
+        organization_flags: int,
+        project_flags: Mapping[int, int],
+    ) -> None:
+        self.feature_names = tuple(feature_names)
+        self._index = {name: i for i, name in enumerate(self.feature_names)}
+        self._organization_flags = organization_flags
+        self._project_flags = project_flags
+
+    def _get_flags(self, project: Optional[Project]) -> int:
+        if project is None:
+            return self._organization_flags
+        return self._project_flags[project.id]
+
+    def has(self, name: str, project: Optional[Project] = None) -> bool:
+        """
+        Whether the feature is enabled for the organization, or for
+        ``project`` if it is a project feature.
+        """
+        return bool(self._get_flags(project) >> self._index[name] & 1)
+
+    def get_enabled(self, project: Optional[Project] = None) -> List[str]:
+        """
+        The names of all features that are enabled for the organization, or
+        for ``project``.
+        """
+        flags = self._get_flags(project)
+        return [name for i, name in enumerate(self.feature_names) if flags >> i & 1]
+
+    def override(self, flags: Mapping[str, bool]) -> FeatureSnapshot:
+        """
+        Return a copy of the snapshot with the given features set for the
+        organization and all projects. Features which were not evaluated are
+        ignored.
+        """
+        set_mask = clear_mask = 0
+        for name, flag in flags.items():
+            if name in self._index:
+                if flag:
+                    set_mask |= 1 << self._index[name]
+                else:
+                    clear_mask |= 1 << self._index[name]
+
+        def apply(value: int) -> int:
+            return (value | set_mask) & ~clear_mask
+
+        return FeatureSnapshot(
+            self.feature_names,
+            apply(self._organization_flags),
+            {project_id: apply(value) for project_id, value in self._project_flags.items()},
+        )
+
 
 class RegisteredFeatureManager:
     """
@@ -97,6 +196,25 @@ class RegisteredFeatureManager:
         >>> FeatureManager.has_for_batch('projects:feature', organization, [project1, project2], actor=request.user)
         """
 
+        result, remaining = self._has_for_batch_from_handlers(name, organization, objects, actor)
+
+        default_flag = settings.SENTRY_FEATURES.get(name, False)
+        for obj in remaining:
+            result[obj] = default_flag
+
+        return result
+
+    def _has_for_batch_from_handlers(
+        self,
+        name: str,
+        organization: Organization,
+        objects: Sequence[Project],
+        actor: Optional[User] = None,
+    ) -> Tuple[Dict[Project, bool], Set[Project]]:
+        """
+        Run the registered handlers of a feature for a batch of objects.
+        Returns the flags found by the handlers and the remaining objects.
+        """
         result = dict()
         remaining = set(objects)
 
@@ -122,11 +240,7 @@ class RegisteredFeatureManager:
                         result[obj] = flag
                 span.set_data("Flags Found", batch_size - len(remaining))
 
-        default_flag = settings.SENTRY_FEATURES.get(name, False)
-        for obj in remaining:
-            result[obj] = default_flag
-
-        return result
+        return result, remaining
 
 
 # TODO: Change RegisteredFeatureManager back to object once it can be removed
@@ -292,6 +406,142 @@ class FeatureManager(RegisteredFeatureManager):
                 return {"unscoped": unscoped_results}
             return None
 
+    def evaluate(
+        self,
+        organization: Organization,
+        projects: Sequence[Project] = (),
+        actor: Optional[User] = None,
+        feature_names: Optional[Sequence[str]] = None,
+    ) -> FeatureSnapshot:
+        """
+        Evaluate many organization and project features at once.
+
+        Every flag in the returned snapshot has the value ``has`` would return
+        for it. Instead of running each handler for every feature and project
+        separately, the registered handlers run once per feature for the whole
+        batch of projects, the entity handler runs once for all features, and
+        features without a handler resolve to their default once.
+
+        ``feature_names`` defaults to all registered organization and project
+        features. Snapshots are cached for the duration of the current request
+        or task.
+
+        >>> snapshot = FeatureManager.evaluate(organization, projects, actor=request.user)
+        >>> snapshot.has('projects:feature', project)
+        """
+        if feature_names is None:
+            feature_names = [
+                name
+                for name, cls in self._feature_registry.items()
+                if cls in (OrganizationFeature, ProjectFeature)
+            ]
+
+        cache_key = (
+            id(self),
+            organization.id,
+            tuple(sorted(project.id for project in projects)),
+            getattr(actor, "id", None),
+            tuple(feature_names),
+        )
+        snapshots = _get_snapshot_cache()
+        if snapshots is not None:
+            snapshot = snapshots.get(cache_key)
+            if snapshot is not None:
+                return snapshot
+
+        with sentry_sdk.start_span(op="feature.evaluate") as span:
+            span.set_data("Feature Count", len(feature_names))
+            span.set_data("Project Count", len(projects))
+            snapshot = self._evaluate(organization, projects, actor, feature_names)
+
+        if snapshots is not None:
+            snapshots[cache_key] = snapshot
+        return snapshot
+
+    def _evaluate(
+        self,
+        organization: Organization,
+        projects: Sequence[Project],
+        actor: Optional[User],
+        feature_names: Sequence[str],
+    ) -> FeatureSnapshot:
+        project_names = []
+        organization_names = []
+        for name in feature_names:
+            cls = self._get_feature_class(name)
+            if issubclass(cls, ProjectFeature):
+                project_names.append(name)
+            elif issubclass(cls, OrganizationFeature):
+                organization_names.append(name)
+            else:
+                raise ValueError(f"Cannot evaluate {name} for an organization")
+
+        organization_results: Dict[str, bool] = {}
+        project_results: Dict[str, Dict[Project, bool]] = {}
+
+        # 1. Registered feature handlers
+        for name in organization_names:
+            if self._handler_registry.get(name):
+                try:
+                    rv = self._get_handler(self.get(name, organization), actor)
+                except Exception:
+                    logging.exception("Failed to run feature check")
+                    rv = False
+                if rv is not None:
+                    organization_results[name] = rv
+        if projects:
+            for name in project_names:
+                if self._handler_registry.get(name):
+                    project_results[name], _ = self._has_for_batch_from_handlers(
+                        name, organization, projects, actor
+                    )
+
+        # 2. The entity handler, for everything the registered handlers left open
+        if self._entity_handler:
+            remaining = [name for name in organization_names if name not in organization_results]
+            if remaining:
+                try:
+                    rv = self._entity_handler.batch_has(remaining, actor, organization=organization)
+                except Exception:
+                    logging.exception("Failed to run feature check")
+                    rv = None
+                for name, flag in (rv or {}).get(f"organization:{organization.id}", {}).items():
+                    if flag is not None and name in remaining:
+                        organization_results[name] = flag
+
+            remaining = [
+                name for name in project_names if len(project_results.get(name, ())) < len(projects)
+            ]
+            if remaining and projects:
+                try:
+                    rv = self._entity_handler.batch_has(
+                        remaining, actor, projects=projects, organization=organization
+                    )
+                except Exception:
+                    logging.exception("Failed to run feature check")
+                    rv = None
+                remaining_set = set(remaining)
+                for project in projects:
+                    for name, flag in (rv or {}).get(f"project:{project.id}", {}).items():
+                        if flag is not None and name in remaining_set:
+                            project_results.setdefault(name, {}).setdefault(project, flag)
+
+        # 3. Defaults
+        project_set = set(project_names)
+        organization_flags = 0
+        project_flags = dict.fromkeys((project.id for project in projects), 0)
+        for i, name in enumerate(feature_names):
+            default = settings.SENTRY_FEATURES.get(name, False)
+            if name in project_set:
+                results = project_results.get(name, {})
+                for project in projects:
+                    if results.get(project, default):
+                        project_flags[project.id] |= 1 << i
+            elif organization_results.get(name, default):
+                organization_flags |= 1 << i
+
+        return FeatureSnapshot(feature_names, organization_flags, project_flags)
+
     @staticmethod
     def _shim_feature_strategy(
         entity_feature_strategy: bool | FeatureHandlerStrategy,
@@ -0,0 +1,220 @@
+"""
+Read-through cache of ``GroupHash`` resolutions for the event save path.
+
+Almost every event maps to hashes that already exist and point at a stable
+group, yet saving an event looks up or creates every one of its hashes in
+Postgres. This module caches the resolution of a hash, ``(project_id, hash) ->
+(grouphash_id, group_id)``, in a short-lived, bounded in-process cache and in
+Redis.
+
+Only hashes that are associated with a group, are not tombstoned and are not
+locked or split are cached, as those are the only ones ``_save_aggregate`` can
+use without further work. Every entry is stamped with the project's cache
+version, which is rotated whenever hashes of the project are moved between
+groups, tombstoned, split or deleted. Entries with another version are treated
+as misses. The in-process cache is not versioned: its entries are trusted for
+``LOCAL_CACHE_TTL`` seconds.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import router, transaction
+from redis.exceptions import RedisError
+
+from sentry.models import GroupHash, Project
+from sentry.utils import metrics, redis
+
+logger = logging.getLogger(__name__)
+
+#: How long versions and entries live in Redis.
+CACHE_TTL = 60 * 60
+
+#: How long an entry may be served from process memory.
+LOCAL_CACHE_TTL = 5
+LOCAL_CACHE_MAX_SIZE = 50000
+
+# (grouphash_id, group_id)
+CachedResolution = Tuple[int, int]
+
+
+class _LocalResolutionCache:
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._items: OrderedDict[Tuple[int, str], Tuple[float, CachedResolution]] = OrderedDict()
+
+    def get(self, project_id: int, hash: str) -> Optional[CachedResolution]:
+        key = (project_id, hash)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, resolution = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return resolution
+
+    def set(self, project_id: int, hash: str, resolution: CachedResolution) -> None:
+        key = (project_id, hash)
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, resolution)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear_project(self, project_id: int) -> None:
+        with self._lock:
+            for key in [k for k in self._items if k[0] == project_id]:
+                del self._items[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_local_cache = _LocalResolutionCache(ttl=LOCAL_CACHE_TTL, max_size=LOCAL_CACHE_MAX_SIZE)
+
+
+def get_redis_client():
+    return redis.redis_clusters.get(settings.SENTRY_GROUPHASH_CACHE_REDIS_CLUSTER)
+
+
+def _get_version_key(project_id: int) -> str:
+    return f"grouphash-cache:version:{project_id}"
+
+
+def _get_entry_key(project_id: int, hash: str) -> str:
+    return f"grouphash-cache:{project_id}:{hash}"
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def _make_grouphash(project: Project, hash: str, resolution: CachedResolution) -> GroupHash:
+    grouphash_id, group_id = resolution
+    grouphash = GroupHash(
+        id=grouphash_id,
+        project=project,
+        hash=hash,
+        group_id=group_id,
+        group_tombstone_id=None,
+        state=GroupHash.State.UNLOCKED,
+    )
+    grouphash._state.adding = False
+    grouphash._state.db = router.db_for_read(GroupHash)
+    return grouphash
+
+
+def _is_cacheable(grouphash: GroupHash) -> bool:
+    return (
+        grouphash.group_id is not None
+        and grouphash.group_tombstone_id is None
+        and grouphash.state == GroupHash.State.UNLOCKED
+    )
+
+
+def get_cached_grouphashes(
+    project: Project, hashes: Sequence[str]
+) -> Tuple[Optional[List[GroupHash]], Optional[str]]:
+    """
+    Return ``GroupHash`` instances for ``hashes`` if all of them are cached.
+
+    The second element is the project's cache version as of this lookup. If
+    the lookup missed, the hashes should be resolved from the database and
+    passed to ``cache_grouphashes`` along with that version, so that an
+    invalidation that happens in between is not overwritten.
+    """
+    resolutions = {}
+    missing = []
+    for hash in hashes:
+        resolution = _local_cache.get(project.id, hash)
+        if resolution is None:
+            missing.append(hash)
+        else:
+            resolutions[hash] = resolution
+
+    version = None
+    if missing:
+        try:
+            with get_redis_client().pipeline() as pipe:
+                pipe.set(_get_version_key(project.id), _new_version(), ex=CACHE_TTL, nx=True)
+                pipe.get(_get_version_key(project.id))
+                for hash in missing:
+                    pipe.get(_get_entry_key(project.id, hash))
+                _, version, *values = pipe.execute()
+        except RedisError:
+            logger.warning("grouphash_cache.lookup_failed", exc_info=True)
+            metrics.incr("grouping.grouphash_cache.lookup", tags={"result": "error"})
+            return None, None
+
+        for hash, value in zip(missing, values):
+            entry_version, _, resolution_str = (value or "").partition(":")
+            if not value or entry_version != version:
+                metrics.incr("grouping.grouphash_cache.lookup", tags={"result": "miss"})
+                return None, version
+            grouphash_id, _, group_id = resolution_str.partition(":")
+            resolutions[hash] = (int(grouphash_id), int(group_id))
+            _local_cache.set(project.id, hash, resolutions[hash])
+
+    metrics.incr(
+        "grouping.grouphash_cache.lookup",
+        tags={"result": "remote" if missing else "local"},
+        sample_rate=0.1,
+    )
+    return [_make_grouphash(project, hash, resolutions[hash]) for hash in hashes], version
+
+
+def cache_grouphashes(project: Project, grouphashes: Sequence[GroupHash], version: str) -> None:
+    """
+    Cache the resolution of all grouphashes that can be served from the cache,
+    under the cache version returned by ``get_cached_grouphashes``.
+    """
+    cacheable = [grouphash for grouphash in grouphashes if _is_cacheable(grouphash)]
+    if not cacheable:
+        return
+
+    try:
+        with get_redis_client().pipeline() as pipe:
+            for grouphash in cacheable:
+                pipe.set(
+                    _get_entry_key(project.id, grouphash.hash),
+                    f"{version}:{grouphash.id}:{grouphash.group_id}",
+                    ex=CACHE_TTL,
+                )
+            pipe.execute()
+    except RedisError:
+        logger.warning("grouphash_cache.store_failed", exc_info=True)
+
+
+def invalidate_grouphash_cache(project_id: int) -> None:
+    """
+    Rotate the project's cache version, invalidating all of its cached
+    grouphash resolutions.
+    """
+    _local_cache.clear_project(project_id)
+    try:
+        get_redis_client().set(_get_version_key(project_id), _new_version(), ex=CACHE_TTL)
+    except RedisError:
+        logger.warning("grouphash_cache.invalidate_failed", exc_info=True)
+    metrics.incr("grouping.grouphash_cache.invalidate")
+
+
+def schedule_invalidate_grouphash_cache(project_id: int) -> None:
+    """
+    Invalidate the project's cached grouphash resolutions once the current
+    transaction commits, so that the cache is not refilled from the old state.
+    """
+    transaction.on_commit(
+        lambda: invalidate_grouphash_cache(project_id), router.db_for_write(GroupHash)
+    )
@@ -1,7 +1,11 @@
 """ Write transactions into redis sets """
+import atexit
 import logging
+import os
 import random
-from typing import Any, Iterator, Mapping, Optional
+import threading
+import time
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
 import sentry_sdk
@@ -15,7 +19,7 @@ from sentry.ingest.transaction_clusterer.datasource import (
     TRANSACTION_SOURCE_URL,
 )
 from sentry.models import Project
-from sentry.utils import redis
+from sentry.utils import metrics, redis
 from sentry.utils.safe import safe_execute
 
 #: Maximum number of transaction names per project that we want
@@ -26,9 +30,12 @@ MAX_SET_SIZE = 4000
 #: Remove the set if it has not received any updates for 24 hours.
 SET_TTL = 24 * 60 * 60
 
+#: Number of buffered samples after which the sample buffer is flushed.
+SAMPLE_BUFFER_SIZE = 1000
+
+#: Maximum time in seconds samples are kept in the sample buffer.
+SAMPLE_BUFFER_FLUSH_INTERVAL = 10
 
-# TODO(iker): accept multiple values to add to the set. Right now, multiple
-# calls for each individual value are required, producing too many Redis calls.
 add_to_set = redis.load_script("utils/sadd_capped.lua")
 logger = logging.getLogger(__name__)
 
@@ -71,17 +78,124 @@ def get_active_projects(namespace: ClustererNamespace) -> Iterator[Project]:
             logger.debug("Could not find project %s in db", project_id)
 
 
-def _record_sample(namespace: ClustererNamespace, project: Project, sample: str) -> None:
-    with sentry_sdk.start_span(op="cluster.{namespace.value.name}.record_sample"):
+def _record_samples(
+    namespace: ClustererNamespace, project: Project, samples: Sequence[str]
+) -> None:
+    with sentry_sdk.start_span(op=f"cluster.{namespace.value.name}.record_samples"):
         client = get_redis_client()
         redis_key = _get_redis_key(namespace, project)
-        created = add_to_set(client, [redis_key], [sample, MAX_SET_SIZE, SET_TTL])
+        created = add_to_set(client, [redis_key], [MAX_SET_SIZE, SET_TTL, *samples])
         if created:
             projects_key = _get_projects_key(namespace)
             client.sadd(projects_key, project.id)
             client.expire(projects_key, SET_TTL)
 
 
+def _record_sample(namespace: ClustererNamespace, project: Project, sample: str) -> None:
+    _record_samples(namespace, project, [sample])
+
+
+class SampleBuffer:
+    """
+    Per-process accumulator for clusterer samples.
+
+    Recording every transaction name and span description as it is saved costs
+    a script call per sample. Instead, samples are collected per namespace and
+    project, deduplicated, and written with one script call per set once
+    ``max_samples`` were recorded or ``flush_interval`` seconds have passed.
+    A background thread flushes samples that are left in the buffer when no
+    more are added, so samples are written within about two flush intervals.
+    The script caps the set after every inserted value, so ``MAX_SET_SIZE`` is
+    applied just like with individual writes.
+    """
+
+    def __init__(self, max_samples: int, flush_interval: float) -> None:
+        self.max_samples = max_samples
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        # Samples are kept in insertion order, so that newer ones are written
+        # last and are more likely to survive the cap.
+        self._samples: Dict[Tuple[ClustererNamespace, int], Tuple[Project, Dict[str, None]]] = {}
+        self._recorded = 0
+        self._last_flush = time.monotonic()
+        self._flusher_pid: Optional[int] = None
+
+    def add(self, namespace: ClustererNamespace, project: Project, sample: str) -> None:
+        self._ensure_flusher()
+        with self._lock:
+            key = (namespace, project.id)
+            if key not in self._samples:
+                self._samples[key] = (project, {})
+            self._samples[key][1][sample] = None
+            self._recorded += 1
+            should_flush = (
+                self._recorded >= self.max_samples
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._samples = self._samples, {}
+            recorded, self._recorded = self._recorded, 0
+            self._last_flush = time.monotonic()
+
+        if not batch:
+            return
+
+        for (namespace, _), (project, samples) in batch.items():
+            safe_execute(
+                _record_samples, namespace, project, list(samples), _with_transaction=False
+            )
+
+        # The ratio of these is the number of script calls saved by buffering.
+        metrics.incr("txcluster.sample_buffer.recorded", amount=recorded, sample_rate=1.0)
+        metrics.incr("txcluster.sample_buffer.writes", amount=len(batch), sample_rate=1.0)
+
+    def flush_idle(self) -> None:
+        """Flushes the buffer if it was not flushed within the flush interval."""
+        with self._lock:
+            idle = time.monotonic() - self._last_flush >= self.flush_interval
+
+        if idle:
+            self.flush()
+
+    def _ensure_flusher(self) -> None:
+        # Threads don't survive a fork, so every process starts its own flusher.
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+
+        t = threading.Thread(target=self._run_flusher, name=f"{__name__}.flusher")
+        t.daemon = True
+        t.start()
+
+    def _run_flusher(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush_idle()
+            except Exception:
+                logger.exception("Unable to flush clusterer samples")
+
+
+_sample_buffer = SampleBuffer(SAMPLE_BUFFER_SIZE, SAMPLE_BUFFER_FLUSH_INTERVAL)
+atexit.register(_sample_buffer.flush)
+
+
+def _store_sample(namespace: ClustererNamespace, project: Project, sample: str) -> None:
+    if options.get("txnames.sample-buffer.enabled"):
+        _sample_buffer.add(namespace, project, sample)
+    else:
+        safe_execute(_record_sample, namespace, project, sample, _with_transaction=False)
+
+
 def get_transaction_names(project: Project) -> Iterator[str]:
     """Return all transaction names stored for the given project"""
     client = get_redis_client()
@@ -102,13 +216,7 @@ def clear_samples(namespace: ClustererNamespace, project: Project) -> None:
 
 def record_transaction_name(project: Project, event_data: Mapping[str, Any], **kwargs: Any) -> None:
     if transaction_name := _should_store_transaction_name(event_data):
-        safe_execute(
-            _record_sample,
-            ClustererNamespace.TRANSACTIONS,
-            project,
-            transaction_name,
-            _with_transaction=False,
-        )
+        _store_sample(ClustererNamespace.TRANSACTIONS, project, transaction_name)
         sample_rate = options.get("txnames.bump-lifetime-sample-rate")
         if sample_rate and random.random() <= sample_rate:
             safe_execute(_bump_rule_lifetime, project, event_data, _with_transaction=False)
@@ -191,7 +299,7 @@ def record_span_descriptions(
             continue
         url_path = _get_url_path_from_description(description)
         if url_path:
-            safe_execute(_record_sample, ClustererNamespace.SPANS, project, url_path)
+            _store_sample(ClustererNamespace.SPANS, project, url_path)
 
         update_rule_rate = options.get("span_descs.bump-lifetime-sample-rate")
         if update_rule_rate and random.random() < update_rule_rate:
@@ -51,6 +51,23 @@ class MetricsBackend(local):
     ) -> None:
         raise NotImplementedError
 
+    def presampled_timing(
+        self,
+        key: str,
+        value: float,
+        instance: Optional[str] = None,
+        tags: Optional[Tags] = None,
+        sample_rate: float = 1,
+    ) -> None:
+        """
+        Record a timing that the caller already sampled at ``sample_rate``. The
+        backend reports the sample rate, but must not sample the value again.
+
+        Backends that sample in `timing` override this. The default records the
+        value with a sample rate of 1.
+        """
+        self.timing(key, value, instance, tags)
+
     def gauge(
         self,
         key: str,
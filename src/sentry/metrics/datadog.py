@@ -74,6 +74,17 @@ class DatadogMetricsBackend(MetricsBackend):
             self._get_key(key), value, sample_rate=sample_rate, tags=tags_list, host=self.host
         )
 
+    def presampled_timing(
+        self,
+        key: str,
+        value: float,
+        instance: Optional[str] = None,
+        tags: Optional[Tags] = None,
+        sample_rate: float = 1,
+    ) -> None:
+        # `ThreadStats` doesn't sample, so the sample rate is only passed on.
+        self.timing(key, value, instance, tags, sample_rate)
+
     def gauge(
         self,
         key: str,
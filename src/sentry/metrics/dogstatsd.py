@@ -50,6 +50,29 @@ class DogStatsdMetricsBackend(MetricsBackend):
         tags_list = [f"{k}:{v}" for k, v in tags.items()]
         statsd.timing(self._get_key(key), value, sample_rate=sample_rate, tags=tags_list)
 
+    def presampled_timing(
+        self,
+        key: str,
+        value: float,
+        instance: Optional[str] = None,
+        tags: Optional[Tags] = None,
+        sample_rate: float = 1,
+    ) -> None:
+        if sample_rate >= 1:
+            return self.timing(key, value, instance, tags)
+
+        tags = dict(tags or ())
+
+        if self.tags:
+            tags.update(self.tags)
+        if instance:
+            tags["instance"] = instance
+
+        tags_list = [f"{k}:{v}" for k, v in tags.items()]
+        # `statsd.timing` samples before it appends the sample rate, so append
+        # it to the metric type here and send the packet unsampled.
+        statsd._report(self._get_key(key), f"ms|@{sample_rate}", value, tags_list, 1)
+
     def gauge(
         self,
         key: str,
@@ -147,6 +147,21 @@ class MiddlewareWrapper(MetricsBackend):
 
         return self.inner.timing(key, value, instance, current_tags, sample_rate)
 
+    def presampled_timing(
+        self,
+        key: str,
+        value: float,
+        instance: Optional[str] = None,
+        tags: Optional[Tags] = None,
+        sample_rate: float = 1,
+    ) -> None:
+        current_tags = get_current_global_tags()
+        if tags is not None:
+            current_tags.update(tags)
+        current_tags = _filter_tags(key, current_tags)
+
+        return self.inner.presampled_timing(key, value, instance, current_tags, sample_rate)
+
     def gauge(
         self,
         key: str,
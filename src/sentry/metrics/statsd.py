@@ -37,6 +37,22 @@ class StatsdMetricsBackend(MetricsBackend):
     ) -> None:
         self.client.timing(self._full_key(self._get_key(key)), value, sample_rate)
 
+    def presampled_timing(
+        self,
+        key: str,
+        value: float,
+        instance: Optional[str] = None,
+        tags: Optional[Tags] = None,
+        sample_rate: float = 1,
+    ) -> None:
+        if sample_rate >= 1:
+            return self.timing(key, value, instance, tags)
+        # `StatsClient.timing` samples before it appends the sample rate, so
+        # append it here and send the stat unsampled.
+        self.client._send_stat(
+            self._full_key(self._get_key(key)), f"{value:0.6f}|ms|@{sample_rate}", 1
+        )
+
     def gauge(
         self,
         key: str,
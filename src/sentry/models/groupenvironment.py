@@ -1,8 +1,17 @@
-from django.db.models import DO_NOTHING, DateTimeField
+from functools import reduce
+from operator import or_
+
+from django.db.models import DO_NOTHING, DateTimeField, Q
 from django.db.models.signals import post_delete
 from django.utils import timezone
 
-from sentry.db.models import FlexibleForeignKey, Model, region_silo_only_model, sane_repr
+from sentry.db.models import (
+    FlexibleForeignKey,
+    Model,
+    bulk_insert_ignore_conflicts,
+    region_silo_only_model,
+    sane_repr,
+)
 from sentry.utils.cache import cache
 
 
@@ -48,6 +57,73 @@ class GroupEnvironment(Model):
 
         return instance, created
 
+    @classmethod
+    def get_or_create_many(cls, first_release_ids):
+        """
+        Batched ``get_or_create`` for many ``(group_id, environment_id)``
+        pairs. ``first_release_ids`` maps every pair to the release that is
+        recorded as its first release if the pair is created.
+
+        Returns a dictionary of pair to ``(instance, created)``.
+        """
+        cache_keys = {key: cls._get_cache_key(*key) for key in first_release_ids}
+        cached = cache.get_many(list(cache_keys.values()))
+        results = {
+            key: (cached[cache_key], False)
+            for key, cache_key in cache_keys.items()
+            if cached.get(cache_key) is not None
+        }
+
+        missing = [key for key in first_release_ids if key not in results]
+        if not missing:
+            return results
+
+        now = timezone.now()
+        inserted = set(
+            bulk_insert_ignore_conflicts(
+                cls,
+                [
+                    {
+                        "group_id": group_id,
+                        "environment_id": environment_id,
+                        "first_release_id": first_release_ids[(group_id, environment_id)],
+                        "first_seen": now,
+                    }
+                    for group_id, environment_id in missing
+                ],
+                conflict_fields=["group", "environment"],
+                returning=["group", "environment"],
+            )
+        )
+
+        instances = cls.objects.filter(
+            reduce(
+                or_,
+                (
+                    Q(group_id=group_id, environment_id=environment_id)
+                    for group_id, environment_id in missing
+                ),
+            )
+        )
+        for instance in instances:
+            key = (instance.group_id, instance.environment_id)
+            results[key] = (instance, key in inserted)
+
+        cache.set_many(
+            {cache_keys[key]: results[key][0] for key in missing if key in results}, 3600
+        )
+
+        # Rows deleted between the insert and the select are created again.
+        for group_id, environment_id in missing:
+            if (group_id, environment_id) not in results:
+                results[(group_id, environment_id)] = cls.get_or_create(
+                    group_id=group_id,
+                    environment_id=environment_id,
+                    defaults={"first_release_id": first_release_ids[(group_id, environment_id)]},
+                )
+
+        return results
+
 
 post_delete.connect(
     lambda instance, **kwargs: cache.delete(
@@ -1,12 +1,16 @@
 from datetime import timedelta
+from functools import reduce
+from operator import or_
 
 from django.db import IntegrityError, models, router, transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from sentry.db.models import (
     BoundedBigIntegerField,
     BoundedPositiveIntegerField,
     Model,
+    bulk_insert_ignore_conflicts,
     region_silo_only_model,
     sane_repr,
 )
@@ -45,7 +49,7 @@ class GroupRelease(Model):
         )
 
     @classmethod
-    def get_or_create(cls, group, release, environment, datetime, **kwargs):
+    def get_or_create(cls, group, release, environment, datetime, first_seen=None, **kwargs):
         cache_key = cls.get_cache_key(group.id, release.id, environment.name)
 
         instance = cache.get(cache_key)
@@ -58,7 +62,7 @@ class GroupRelease(Model):
                             group_id=group.id,
                             environment=environment.name,
                             project_id=group.project_id,
-                            first_seen=datetime,
+                            first_seen=first_seen or datetime,
                             last_seen=datetime,
                         ),
                         True,
@@ -84,3 +88,80 @@ class GroupRelease(Model):
 
         cache.set(cache_key, instance, 3600)
         return instance
+
+    @classmethod
+    def get_or_create_many(cls, datetimes):
+        """
+        Batched ``get_or_create`` for many ``(group, release, environment)``
+        triples. ``datetimes`` maps every triple to the ``(first_seen, last_seen)``
+        range of times it was seen at.
+
+        Returns a dictionary of triple to instance.
+        """
+        keys = {
+            (group, release, environment): (group.id, release.id, environment.name)
+            for group, release, environment in datetimes
+        }
+        cache_keys = {key: cls.get_cache_key(*keys[key]) for key in keys}
+        cached = cache.get_many(list(cache_keys.values()))
+        instances = {
+            key: cached[cache_key]
+            for key, cache_key in cache_keys.items()
+            if cached.get(cache_key) is not None
+        }
+        created = set()
+
+        missing = [key for key in keys if key not in instances]
+        if missing:
+            inserted = bulk_insert_ignore_conflicts(
+                cls,
+                [
+                    {
+                        "release_id": release.id,
+                        "group_id": group.id,
+                        "environment": environment.name,
+                        "project_id": group.project_id,
+                        "first_seen": datetimes[(group, release, environment)][0],
+                        "last_seen": datetimes[(group, release, environment)][1],
+                    }
+                    for group, release, environment in missing
+                ],
+                conflict_fields=["group_id", "release_id", "environment"],
+                returning=["group_id", "release_id", "environment"],
+            )
+            created.update(inserted)
+
+            missing_by_values = {keys[key]: key for key in missing}
+            for instance in cls.objects.filter(
+                reduce(
+                    or_,
+                    (
+                        Q(group_id=group_id, release_id=release_id, environment=environment)
+                        for group_id, release_id, environment in missing_by_values
+                    ),
+                )
+            ):
+                key = missing_by_values.get(
+                    (instance.group_id, instance.release_id, instance.environment)
+                )
+                if key is not None:
+                    instances[key] = instance
+
+        for key, (first_seen, datetime) in datetimes.items():
+            instance = instances.get(key)
+            if instance is None:
+                # The row was deleted between the insert and the select.
+                instances[key] = cls.get_or_create(*key, datetime, first_seen=first_seen)
+                continue
+
+            if keys[key] not in created and instance.last_seen < datetime - timedelta(seconds=60):
+                buffer_incr(
+                    model=cls,
+                    columns={},
+                    filters={"id": instance.id},
+                    extra={"last_seen": datetime},
+                )
+                instance.last_seen = datetime
+
+        cache.set_many({cache_keys[key]: instance for key, instance in instances.items()}, 3600)
+        return instances
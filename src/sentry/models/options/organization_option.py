@@ -43,10 +43,16 @@ class OrganizationOptionManager(OptionManager["OrganizationOption"]):
         self.reload_cache(organization.id, "organizationoption.unset_value")
 
     def set_value(self, organization: Organization, key: str, value: Value) -> bool:
+        from sentry.auth.access_snapshot import schedule_invalidate_organization_access
+
         inst, created = self.create_or_update(
             organization=organization, key=key, values={"value": value}
         )
         self.reload_cache(organization.id, "organizationoption.set_value")
+        # Updates of existing options don't send `post_save`, so member access
+        # snapshots (which depend on options such as `sentry:events_member_admin`)
+        # are invalidated here.
+        schedule_invalidate_organization_access(self.model, organization.id)
         return bool(created) or inst > 0
 
     def get_all_values(self, organization: Organization | int) -> Mapping[str, Value]:
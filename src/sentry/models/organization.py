@@ -203,7 +203,7 @@ class Organization(Model, OptionMixin, OrganizationAbsoluteUrlMixin, SnowflakeId
 
         bitfield_default = 1
 
-    objects = OrganizationManager(cache_fields=("pk", "slug"))
+    objects = OrganizationManager(cache_fields=("pk", "slug"), process_cache_ttl=5)
 
     # Not persisted. Getsentry fills this in in post-save hooks and we use it for synchronizing data across silos.
     customer_id: Optional[str] = None
@@ -180,7 +180,7 @@ class Project(Model, PendingDeletionMixin, OptionMixin, SnowflakeIdMixin):
         bitfield_default = 10
         bitfield_null = True
 
-    objects = ProjectManager(cache_fields=["pk"])
+    objects = ProjectManager(cache_fields=["pk"], process_cache_ttl=5)
     platform = models.CharField(max_length=64, null=True)
 
     class Meta:
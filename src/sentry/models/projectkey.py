@@ -79,6 +79,7 @@ class ProjectKey(Model):
         # store projectkeys in memcached for longer than other models,
         # specifically to make the relay_projectconfig endpoint faster.
         cache_ttl=60 * 30,
+        process_cache_ttl=5,
     )
 
     data = JSONField()
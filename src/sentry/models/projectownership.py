@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import enum
 import logging
+import threading
 from typing import TYPE_CHECKING, Any, Mapping, Optional, Sequence, Tuple, Union
 
+from cachetools import LRUCache
 from django.db import models
 from django.db.models.signals import post_delete, post_save
 from django.utils import timezone
@@ -14,7 +16,7 @@ from sentry.db.models.fields import FlexibleForeignKey, JSONField
 from sentry.models import Activity, ActorTuple
 from sentry.models.groupowner import OwnerRuleType
 from sentry.models.project import Project
-from sentry.ownership.grammar import Rule, load_schema, resolve_actors
+from sentry.ownership.grammar import OwnershipIndex, Rule, resolve_actors
 from sentry.types.activity import ActivityType
 from sentry.utils import metrics
 from sentry.utils.cache import cache
@@ -25,6 +27,31 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 READ_CACHE_DURATION = 3600
+# How many compiled ownership schemas are kept in process memory.
+OWNERSHIP_INDEX_CACHE_SIZE = 500
+
+# Compiled schemas are keyed by project, schema version and the matchers of the
+# rules, so an updated schema is compiled again the first time it's evaluated.
+_ownership_indexes: LRUCache[Tuple[Any, ...], OwnershipIndex] = LRUCache(
+    maxsize=OWNERSHIP_INDEX_CACHE_SIZE
+)
+_ownership_indexes_lock = threading.Lock()
+
+
+def get_ownership_index(project_id: int, schema: Mapping[str, Any]) -> OwnershipIndex:
+    key = (
+        project_id,
+        schema["$version"],
+        tuple((r["matcher"]["type"], r["matcher"]["pattern"]) for r in schema["rules"]),
+    )
+    with _ownership_indexes_lock:
+        index = _ownership_indexes.get(key)
+    if index is None:
+        metrics.incr("projectownership.compile_schema", sample_rate=1.0)
+        index = OwnershipIndex.from_schema(schema)
+        with _ownership_indexes_lock:
+            _ownership_indexes[key] = index
+    return index
 
 
 _Everyone = enum.Enum("_Everyone", "EVERYONE")
@@ -129,7 +156,7 @@ class ProjectOwnership(Model):
         rules = cls._matching_ownership_rules(ownership, data)
 
         if not rules:
-            project = Project.objects.get(id=project_id)
+            project = Project.objects.get_from_cache(id=project_id)
             if features.has(
                 "organizations:issue-alert-fallback-targeting", project.organization, actor=None
             ):
@@ -343,14 +370,14 @@ class ProjectOwnership(Model):
         ownership: Union[ProjectOwnership, ProjectCodeOwners],
         data: Mapping[str, Any],
     ) -> Sequence[Rule]:
-        rules = []
-
-        if ownership.schema is not None:
-            for rule in load_schema(ownership.schema):
-                if rule.test(data):
-                    rules.append(rule)
+        if ownership.schema is None:
+            return []
 
-        return rules
+        index = get_ownership_index(ownership.project_id, ownership.schema)
+        return [
+            Rule.load(ownership.schema["rules"][rule_index])
+            for rule_index in index.matching_rule_indexes(data)
+        ]
 
 
 def process_resource_change(instance, change, **kwargs):
@@ -38,12 +38,14 @@ class ReleaseEnvironment(Model):
         return f"releaseenv:2:{organization_id}:{release_id}:{environment_id}"
 
     @classmethod
-    def get_or_create(cls, project, release, environment, datetime, **kwargs):
+    def get_or_create(cls, project, release, environment, datetime, first_seen=None, **kwargs):
         with metrics.timer("models.releaseenvironment.get_or_create") as metric_tags:
-            return cls._get_or_create_impl(project, release, environment, datetime, metric_tags)
+            return cls._get_or_create_impl(
+                project, release, environment, datetime, first_seen, metric_tags
+            )
 
     @classmethod
-    def _get_or_create_impl(cls, project, release, environment, datetime, metric_tags):
+    def _get_or_create_impl(cls, project, release, environment, datetime, first_seen, metric_tags):
         cache_key = cls.get_cache_key(project.id, release.id, environment.id)
 
         instance = cache.get(cache_key)
@@ -53,7 +55,7 @@ class ReleaseEnvironment(Model):
                 release_id=release.id,
                 organization_id=project.organization_id,
                 environment_id=environment.id,
-                defaults={"first_seen": datetime, "last_seen": datetime},
+                defaults={"first_seen": first_seen or datetime, "last_seen": datetime},
             )
             cache.set(cache_key, instance, 3600)
         else:
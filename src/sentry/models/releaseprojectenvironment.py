@@ -52,14 +52,16 @@ class ReleaseProjectEnvironment(Model):
         return f"releaseprojectenv:{release_id}:{project_id}:{environment_id}"
 
     @classmethod
-    def get_or_create(cls, release, project, environment, datetime, **kwargs):
+    def get_or_create(cls, release, project, environment, datetime, first_seen=None, **kwargs):
         with metrics.timer("models.releaseprojectenvironment.get_or_create") as metrics_tags:
             return cls._get_or_create_impl(
-                release, project, environment, datetime, metrics_tags, **kwargs
+                release, project, environment, datetime, first_seen, metrics_tags, **kwargs
             )
 
     @classmethod
-    def _get_or_create_impl(cls, release, project, environment, datetime, metrics_tags, **kwargs):
+    def _get_or_create_impl(
+        cls, release, project, environment, datetime, first_seen, metrics_tags, **kwargs
+    ):
         cache_key = cls.get_cache_key(project.id, release.id, environment.id)
 
         instance = cache.get(cache_key)
@@ -69,7 +71,7 @@ class ReleaseProjectEnvironment(Model):
                 release=release,
                 project=project,
                 environment=environment,
-                defaults={"first_seen": datetime, "last_seen": datetime},
+                defaults={"first_seen": first_seen or datetime, "last_seen": datetime},
             )
             cache.set(cache_key, instance, 3600)
         else:
@@ -226,6 +226,7 @@ class Team(Model, SnowflakeIdMixin):
         """
         Transfers a team and all projects under it to the given organization.
         """
+        from sentry.auth.access_snapshot import schedule_invalidate_organization_access
         from sentry.models import (
             OrganizationAccessRequest,
             OrganizationMember,
@@ -236,6 +237,8 @@ class Team(Model, SnowflakeIdMixin):
         )
         from sentry.models.projectteam import ProjectTeam
 
+        old_organization_id = self.organization_id
+
         try:
             with transaction.atomic(router.db_for_write(Team)):
                 self.update(organization=organization)
@@ -260,6 +263,11 @@ class Team(Model, SnowflakeIdMixin):
 
         ProjectTeam.objects.filter(project_id__in=project_ids).update(team=new_team)
 
+        # The queryset updates above don't send `post_save`, so the access
+        # snapshots of both organizations are invalidated explicitly.
+        for organization_id in {old_organization_id, organization.id}:
+            schedule_invalidate_organization_access(ProjectTeam, organization_id)
+
         # remove any pending access requests from the old organization
         if self != new_team:
             OrganizationAccessRequest.objects.filter(team=self).delete()
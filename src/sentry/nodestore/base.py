@@ -8,7 +8,7 @@ from sentry.utils.cache import memoize
 from sentry.utils.services import Service
 
 # Cache an instance of the encoder we want to use
-json_dumps = json.JSONEncoder(
+_json_encoder = json.JSONEncoder(
     separators=(",", ":"),
     sort_keys=True,
     skipkeys=False,
@@ -18,7 +18,10 @@ json_dumps = json.JSONEncoder(
     indent=None,
     encoding="utf-8",
     default=None,
-).encode
+)
+json_dumps = _json_encoder.encode
+# Produces the same output as `json_dumps`, but faster and as bytes
+json_dumps_bytes = json.RapidJSONEncoder(_json_encoder).encode_bytes
 
 json_loads = json.loads
 
@@ -201,10 +204,10 @@ class NodeStorage(local, Service):
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
         """
-        lines = [json_dumps(data.pop(None)).encode("utf8")]
+        lines = [json_dumps_bytes(data.pop(None))]
         for key, value in data.items():
             lines.append(key.encode("ascii"))
-            lines.append(json_dumps(value).encode("utf8"))
+            lines.append(json_dumps_bytes(value))
 
         return b"\n".join(lines)
 
@@ -11,6 +11,7 @@ from typing import (
     MutableMapping,
     Sequence,
     Tuple,
+    TypeVar,
     Union,
 )
 
@@ -71,6 +72,8 @@ AVAILABLE_PROVIDERS = {
 
 FALLTHROUGH_NOTIFICATION_LIMIT = 20
 
+K = TypeVar("K")
+
 
 class ParticipantMap:
     _dict: MutableMapping[ExternalProviders, MutableMapping[RpcActor, int]]
@@ -243,32 +246,72 @@ def get_owners(
     If when checking owners, there is a rule match we only notify the last owner
     (would-be auto-assignee) unless the organization passes the feature-flag
     """
+    return get_owners_many(project, [event])[event]
 
-    if event:
-        owners, _ = ProjectOwnership.get_owners(project.id, event.data)
-    else:
-        owners = ProjectOwnership.Everyone
 
-    if not owners:
-        outcome = "empty"
-        recipients: List[RpcActor] = list()
+def get_owners_many(
+    project: Project, events: Sequence[Event | None]
+) -> Mapping[Event | None, Tuple[List[RpcActor], str]]:
+    """
+    Like `get_owners` for many events of the same project. The owners matched
+    for all the events are resolved together, and the project members are only
+    fetched once.
+    """
+    owners_by_event = {
+        event: ProjectOwnership.get_owners(project.id, event.data)[0]
+        if event
+        else ProjectOwnership.Everyone
+        for event in events
+    }
 
-    elif owners == ProjectOwnership.Everyone:
-        outcome = "everyone"
-        users = user_service.get_many(
-            filter=dict(user_ids=project.member_set.values_list("user_id", flat=True))
+    # Each owner is only resolved once, even when it's matched for many events.
+    matched_owners = list(
+        {
+            owner: None
+            for owners in owners_by_event.values()
+            if owners and owners != ProjectOwnership.Everyone
+            for owner in owners
+        }
+    )
+    actors_by_key: Mapping[Tuple[ActorType, int], RpcActor] = {}
+    notify_all_matched = False
+    if matched_owners:
+        actors_by_key = {
+            (actor.actor_type, actor.id): actor
+            for actor in RpcActor.many_from_object(ActorTuple.resolve_many(matched_owners))
+        }
+        notify_all_matched = features.has(
+            "organizations:notification-all-recipients", project.organization
         )
-        recipients = RpcActor.many_from_object(users)
 
-    else:
-        outcome = "match"
-        resolved_owners = ActorTuple.resolve_many(owners)
-        recipients = RpcActor.many_from_object(resolved_owners)
-        # Used to suppress extra notifications to all matched owners, only notify the would-be auto-assignee
-        if not features.has("organizations:notification-all-recipients", project.organization):
-            recipients = recipients[-1:]
+    members: List[RpcActor] | None = None
+    result: MutableMapping[Event | None, Tuple[List[RpcActor], str]] = {}
+    for event, owners in owners_by_event.items():
+        if not owners:
+            result[event] = ([], "empty")
 
-    return (recipients, outcome)
+        elif owners == ProjectOwnership.Everyone:
+            if members is None:
+                users = user_service.get_many(
+                    filter=dict(user_ids=project.member_set.values_list("user_id", flat=True))
+                )
+                members = RpcActor.many_from_object(users)
+            result[event] = (list(members), "everyone")
+
+        else:
+            # Keeps the order of the owners of the matched rules, the last one is
+            # the would-be auto-assignee.
+            owner_keys = [
+                (ActorType.TEAM if owner.type == Team else ActorType.USER, owner.id)
+                for owner in owners
+            ]
+            recipients = [actors_by_key[key] for key in owner_keys if key in actors_by_key]
+            # Used to suppress extra notifications to all matched owners, only notify the would-be auto-assignee
+            if not notify_all_matched:
+                recipients = recipients[-1:]
+            result[event] = (recipients, "match")
+
+    return result
 
 
 def get_owner_reason(
@@ -369,49 +412,80 @@ def determine_eligible_recipients(
     Either get the individual recipient from the target type/id or the
     owners as determined by rules for this project and event.
     """
+    return determine_eligible_recipients_many(
+        project, target_type, [event], target_identifier, fallthrough_choice
+    )[event]
+
+
+def determine_eligible_recipients_many(
+    project: Project,
+    target_type: ActionTargetType,
+    events: Sequence[Event | None],
+    target_identifier: int | None = None,
+    fallthrough_choice: FallthroughChoiceType | None = None,
+) -> Mapping[Event | None, Iterable[RpcActor]]:
+    """
+    Like `determine_eligible_recipients` for many events of the same project.
+    Only the owners and suspect committers are determined per event.
+    """
     if not (project and project.teams.exists()):
         logger.debug(f"Tried to send notification to invalid project: {project}")
 
     elif target_type == ActionTargetType.MEMBER:
         user = get_user_from_identifier(project, target_identifier)
         if user:
-            return [RpcActor.from_orm_user(user)]
+            return {event: [RpcActor.from_orm_user(user)] for event in events}
 
     elif target_type == ActionTargetType.TEAM:
         team = get_team_from_identifier(project, target_identifier)
         if team:
-            return [RpcActor.from_orm_team(team)]
+            return {event: [RpcActor.from_orm_team(team)] for event in events}
 
     elif target_type == ActionTargetType.ISSUE_OWNERS:
-        suggested_assignees, outcome = get_owners(project, event, fallthrough_choice)
-        suspect_commit_users = None
-        if features.has("organizations:streamline-targeting-context", project.organization):
-            try:
-                suspect_commit_users = RpcActor.many_from_object(
-                    get_suspect_commit_users(project, event)
-                )
-                suggested_assignees.extend(suspect_commit_users)
-            except (Release.DoesNotExist, Commit.DoesNotExist):
-                logger.info("Skipping suspect committers because release does not exist.")
-            except Exception:
-                logger.exception("Could not get suspect committers. Continuing execution.")
-
-        metrics.incr(
-            "features.owners.send_to",
-            tags={
-                "outcome": outcome
-                if outcome == "match" or fallthrough_choice is None
-                else fallthrough_choice.value,
-                "hasSuspectCommitters": str(bool(suspect_commit_users)),
-            },
+        owners_by_event = get_owners_many(project, events)
+        has_suspect_commits = features.has(
+            "organizations:streamline-targeting-context", project.organization
         )
+        fallthrough_recipients: List[RpcActor] | None = None
+
+        recipients_by_event: MutableMapping[Event | None, Iterable[RpcActor]] = {}
+        for event in events:
+            suggested_assignees, outcome = owners_by_event[event]
+            suspect_commit_users = None
+            if has_suspect_commits:
+                try:
+                    suspect_commit_users = RpcActor.many_from_object(
+                        get_suspect_commit_users(project, event)
+                    )
+                    suggested_assignees.extend(suspect_commit_users)
+                except (Release.DoesNotExist, Commit.DoesNotExist):
+                    logger.info("Skipping suspect committers because release does not exist.")
+                except Exception:
+                    logger.exception("Could not get suspect committers. Continuing execution.")
+
+            metrics.incr(
+                "features.owners.send_to",
+                tags={
+                    "outcome": outcome
+                    if outcome == "match" or fallthrough_choice is None
+                    else fallthrough_choice.value,
+                    "hasSuspectCommitters": str(bool(suspect_commit_users)),
+                },
+            )
 
-        if suggested_assignees:
-            return dedupe_suggested_assignees(suggested_assignees)
+            if suggested_assignees:
+                recipients_by_event[event] = dedupe_suggested_assignees(suggested_assignees)
+                continue
 
-        return RpcActor.many_from_object(get_fallthrough_recipients(project, fallthrough_choice))
+            if fallthrough_recipients is None:
+                fallthrough_recipients = RpcActor.many_from_object(
+                    get_fallthrough_recipients(project, fallthrough_choice)
+                )
+            recipients_by_event[event] = fallthrough_recipients
 
-    return set()
+        return recipients_by_event
+
+    return {event: set() for event in events}
 
 
 def get_send_to(
@@ -423,24 +497,54 @@ def get_send_to(
     fallthrough_choice: FallthroughChoiceType | None = None,
     rules: Iterable[Rule] | None = None,
 ) -> Mapping[ExternalProviders, set[RpcActor]]:
-    recipients = determine_eligible_recipients(
-        project, target_type, target_identifier, event, fallthrough_choice
+    return get_send_to_many(
+        project,
+        target_type,
+        [event],
+        target_identifier=target_identifier,
+        notification_type=notification_type,
+        fallthrough_choice=fallthrough_choice,
+        rules=rules,
+    )[event]
+
+
+def get_send_to_many(
+    project: Project,
+    target_type: ActionTargetType,
+    events: Sequence[Event | None],
+    target_identifier: int | None = None,
+    notification_type: NotificationSettingTypes = NotificationSettingTypes.ISSUE_ALERTS,
+    fallthrough_choice: FallthroughChoiceType | None = None,
+    rules: Iterable[Rule] | None = None,
+) -> Mapping[Event | None, Mapping[ExternalProviders, set[RpcActor]]]:
+    """
+    Like `get_send_to` for many events of the same project and target, e.g. all
+    the events of a digest. Snoozes, notification settings, team members and
+    users are looked up once for the recipients of all the events.
+    """
+    recipients_by_event = determine_eligible_recipients_many(
+        project, target_type, events, target_identifier, fallthrough_choice
     )
 
     if rules:
         rule_snoozes = RuleSnooze.objects.filter(Q(rule__in=rules))
-        muted_user_ids = []
+        muted_user_ids = set()
         for rule_snooze in rule_snoozes:
             if rule_snooze.user_id is None:
-                return {}
+                return {event: {} for event in events}
             else:
-                muted_user_ids.append(rule_snooze.user_id)
+                muted_user_ids.add(rule_snooze.user_id)
 
         if muted_user_ids:
-            recipients = filter(
-                lambda x: x.actor_type != ActorType.USER or x.id not in muted_user_ids, recipients
-            )
-    return get_recipients_by_provider(project, recipients, notification_type)
+            recipients_by_event = {
+                event: [
+                    recipient
+                    for recipient in recipients
+                    if recipient.actor_type != ActorType.USER or recipient.id not in muted_user_ids
+                ]
+                for event, recipients in recipients_by_event.items()
+            }
+    return get_recipients_by_provider_many(project, recipients_by_event, notification_type)
 
 
 def get_fallthrough_recipients(
@@ -525,21 +629,27 @@ def partition_recipients(
 
 def get_users_from_team_fall_back(
     teams: Iterable[RpcActor],
-    recipients_by_provider: Mapping[ExternalProviders, Iterable[RpcActor]],
-) -> Iterable[RpcUser]:
+) -> Mapping[RpcActor, set[RpcActor]]:
+    """Get the users to notify in place of each team, which are the team's members."""
     assert all(team.actor_type == ActorType.TEAM for team in teams)
 
-    teams_to_fall_back = set(teams)
-    for recipients in recipients_by_provider.values():
-        for recipient in recipients:
-            teams_to_fall_back.remove(recipient)
-
-    user_ids: set[int] = set()
-    for team in teams_to_fall_back:
+    user_ids_by_team: MutableMapping[RpcActor, set[int]] = {}
+    for team in teams:
         # Fall back to notifying each subscribed user if there aren't team notification settings
         members = organization_service.get_team_members(team_id=team.id)
-        user_ids |= {member.user_id for member in members if member.user_id is not None}
-    return user_service.get_many(filter={"user_ids": list(user_ids)})
+        user_ids_by_team[team] = {
+            member.user_id for member in members if member.user_id is not None
+        }
+
+    user_ids = set().union(*user_ids_by_team.values())
+    if not user_ids:
+        return {team: set() for team in user_ids_by_team}
+
+    users = RpcActor.many_from_object(user_service.get_many(filter={"user_ids": list(user_ids)}))
+    return {
+        team: {user for user in users if user.id in team_user_ids}
+        for team, team_user_ids in user_ids_by_team.items()
+    }
 
 
 def combine_recipients_by_provider(
@@ -563,7 +673,21 @@ def get_recipients_by_provider(
     notification_type: NotificationSettingTypes = NotificationSettingTypes.ISSUE_ALERTS,
 ) -> Mapping[ExternalProviders, set[RpcActor]]:
     """Get the lists of recipients that should receive an Issue Alert by ExternalProvider."""
-    recipients_by_type = partition_recipients(recipients)
+    return get_recipients_by_provider_many(project, {None: recipients}, notification_type)[None]
+
+
+def get_recipients_by_provider_many(
+    project: Project,
+    recipients_by_key: Mapping[K, Iterable[RpcActor]],
+    notification_type: NotificationSettingTypes = NotificationSettingTypes.ISSUE_ALERTS,
+) -> Mapping[K, Mapping[ExternalProviders, set[RpcActor]]]:
+    """
+    Like `get_recipients_by_provider` for many sets of recipients, keyed by e.g.
+    the event they're notified of. The settings of every team and user are
+    looked up once, no matter how many of the sets they're part of.
+    """
+    recipient_sets = {key: set(recipients) for key, recipients in recipients_by_key.items()}
+    recipients_by_type = partition_recipients(set().union(*recipient_sets.values()))
     teams = recipients_by_type[ActorType.TEAM]
     users = recipients_by_type[ActorType.USER]
 
@@ -574,17 +698,31 @@ def get_recipients_by_provider(
 
     # Teams cannot receive emails so omit EMAIL settings.
     teams_by_provider = {
-        provider: teams
+        provider: set(teams)
         for provider, teams in teams_by_provider.items()
         if provider != ExternalProviders.EMAIL
     }
 
     # If there are any teams that didn't get added, fall back and add all users.
-    users |= set(RpcActor.many_from_object(get_users_from_team_fall_back(teams, teams_by_provider)))
+    users_by_team = get_users_from_team_fall_back(teams.difference(*teams_by_provider.values()))
+    for team_users in users_by_team.values():
+        users |= team_users
 
     # Repeat for users.
     users_by_provider = NotificationSetting.objects.filter_to_accepting_recipients(
         project, users, notification_type
     )
 
-    return combine_recipients_by_provider(teams_by_provider, users_by_provider)
+    result = {}
+    for key, recipients in recipient_sets.items():
+        key_users = {
+            recipient for recipient in recipients if recipient.actor_type == ActorType.USER
+        }
+        for recipient in recipients:
+            key_users |= users_by_team.get(recipient, set())
+
+        result[key] = combine_recipients_by_provider(
+            {provider: teams & recipients for provider, teams in teams_by_provider.items()},
+            {provider: set(users) & key_users for provider, users in users_by_provider.items()},
+        )
+    return result
@@ -368,6 +368,14 @@ register(
     default=0,
     flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# The number of bytes of decompressed recording segments each web process keeps in memory for
+# recently viewed replays. 0 disables the cache.
+register(
+    "replay.reader.segment-cache-size",
+    type=Int,
+    default=0,
+    flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # Analytics
 register("analytics.backend", default="noop", flags=FLAG_NOSTORE)
@@ -740,6 +748,9 @@ register("store.background-grouping-sample-rate", default=0.0, flags=FLAG_AUTOMA
 # True if background grouping should run before secondary and primary grouping
 register("store.background-grouping-before", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Resolve the grouphashes of saved events from a cache instead of Postgres where possible
+register("grouping.grouphash-cache.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Store release files bundled as zip files
 register(
     "processing.save-release-archives", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE
@@ -767,6 +778,21 @@ register("relay.transaction-metrics-org-sample-rate", default=0.0, flags=FLAG_AU
 # Write new kafka headers in eventstream
 register("eventstream:kafka-headers", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Batching of the eventstream Kafka producers. They are read when a producer
+# is created, and 0 keeps the value of the cluster configuration.
+register(
+    "eventstream:kafka-producer.linger-ms",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "eventstream:kafka-producer.batch-num-messages",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Post process forwarder options
 # Gets data from Kafka headers
 register("post-process-forwarder:kafka-headers", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE)
@@ -1337,6 +1363,8 @@ register("hybrid_cloud.outbox_rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABL
 register("txnames.bump-lifetime-sample-rate", default=0.1, flags=FLAG_AUTOMATOR_MODIFIABLE)
 # Decides whether an incoming span triggers an update of the clustering rule applied to it.
 register("span_descs.bump-lifetime-sample-rate", default=0.25, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Buffer transaction names and span descriptions for the clusterer and write them in batches.
+register("txnames.sample-buffer.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # === Backpressure related runtime options ===
 
@@ -1395,3 +1423,6 @@ register("crons.organization.disable-check-in", type=Sequence, default=[])
 
 # Turns on and off the running for dynamic sampling collect_orgs.
 register("dynamic-sampling.tasks.collect_orgs", default=False, flags=FLAG_MODIFIABLE_BOOL)
+
+# Use cached, precomputed membership snapshots when building `Access` for organization members.
+register("auth.access-snapshots.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
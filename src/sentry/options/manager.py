@@ -306,7 +306,8 @@ class OptionsManager:
                     optval = opt.default()
         # options already present in store are cached by store
         # caching here to avoid database queries
-        self.store.set_cache(opt, optval)
+        if not self.store.subscribed:
+            self.store.set_cache(opt, optval)
         return optval
 
     def delete(self, key: str):
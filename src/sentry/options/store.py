@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import dataclasses
 import logging
+import os
+import threading
+import uuid
 from random import random
 from time import time
-from typing import Any, Optional, Set
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Set
 
 from django.db.utils import OperationalError, ProgrammingError
 from django.utils import timezone
@@ -14,6 +18,9 @@ from sentry.options.manager import UpdateChannel
 CACHE_FETCH_ERR = "Unable to fetch option cache for %s"
 CACHE_UPDATE_ERR = "Unable to update option cache for %s"
 
+# Rotated whenever an option is changed, see ``OptionsStore.subscribe``.
+VERSION_CACHE_KEY = "o:__version__"
+
 logger = logging.getLogger("sentry")
 
 
@@ -71,6 +78,15 @@ class OptionsStore:
         self.ttl = ttl
         self.flush_local_cache()
 
+        # Values of all stored options by name, when subscribed.
+        self._snapshot: Optional[Mapping[str, Any]] = None
+        self._snapshot_version: Optional[str] = None
+        self._snapshot_refreshed_at = 0.0
+        self._poll_interval: Optional[float] = None
+        self._refresh_interval = 60.0
+        self._subscribed = False
+        self._subscription_stop = threading.Event()
+
     @property
     def model(self):
         return self.model_cls()
@@ -84,10 +100,21 @@ class OptionsStore:
             return ControlOption
         return Option
 
+    @property
+    def subscribed(self) -> bool:
+        """
+        Whether options are served from a snapshot rather than the caches.
+        """
+        return self._snapshot is not None
+
     def get(self, key, silent=False):
         """
         Fetches a value from the options store.
         """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot.get(key.name)
+
         result = self.get_cache(key, silent=silent)
         if result is not None:
             return result
@@ -225,6 +252,10 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.set_store(key, value, channel)
+        snapshot = self._snapshot
+        if snapshot is not None:
+            self._snapshot = MappingProxyType({**snapshot, key.name: value})
+        self.publish_change()
         return self.set_cache(key, value)
 
     def set_store(self, key, value, channel: UpdateChannel):
@@ -266,6 +297,12 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.delete_store(key)
+        snapshot = self._snapshot
+        if snapshot is not None:
+            self._snapshot = MappingProxyType(
+                {name: value for name, value in snapshot.items() if name != key.name}
+            )
+        self.publish_change()
         return self.delete_cache(key)
 
     def delete_store(self, key):
@@ -334,5 +371,105 @@ class OptionsStore:
     def close(self) -> None:
         self.clean_local_cache()
 
+    def subscribe(self, poll_interval: Optional[float] = 1.0, refresh_interval: float = 60.0):
+        """
+        Serve all options from an in-process snapshot of the options table.
+
+        Instead of expiring every option separately, the store keeps a snapshot
+        of all stored options which is replaced as a whole whenever the
+        options version in the shared cache changes. ``set`` and ``delete``
+        rotate that version, so changes reach every subscribed process within
+        ``poll_interval`` seconds. The snapshot is also reloaded every
+        ``refresh_interval`` seconds, which picks up changes that were made
+        while the shared cache was unavailable.
+
+        The version is polled by a background thread, which is restarted in
+        forked processes. With ``poll_interval=None`` no thread is started
+        and the caller is responsible for calling ``refresh_snapshot``.
+
+        Until the first snapshot has been loaded, options are read from the
+        caches as usual.
+        """
+        assert self.cache is not None, "cache must be configured before subscribing"
+
+        self._poll_interval = poll_interval
+        self._refresh_interval = refresh_interval
+        try:
+            self.refresh_snapshot(force=True)
+        except (ProgrammingError, OperationalError):
+            # Most likely the database is not migrated yet, the poller will retry.
+            logger.warning("options.snapshot.failed", exc_info=True)
+
+        if not self._subscribed:
+            self._subscribed = True
+            if poll_interval is not None:
+                os.register_at_fork(after_in_child=self._start_poller)
+                self._start_poller()
+
+    def unsubscribe(self) -> None:
+        """
+        Stop serving options from a snapshot.
+        """
+        self._subscription_stop.set()
+        self._subscribed = False
+        self._snapshot = None
+        self._snapshot_version = None
+
+    def refresh_snapshot(self, force: bool = False) -> bool:
+        """
+        Reload the snapshot if the options version changed, the refresh
+        interval passed or ``force`` is set. Returns whether it was reloaded.
+        """
+        version = self.cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            # ``add`` so that concurrent processes agree on a single version.
+            self.cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+            version = self.cache.get(VERSION_CACHE_KEY)
+
+        now = time()
+        if (
+            not force
+            and self._snapshot is not None
+            and version is not None
+            and version == self._snapshot_version
+            and now - self._snapshot_refreshed_at < self._refresh_interval
+        ):
+            return False
+
+        # The version is read before loading so that a change which happens
+        # while loading causes another reload.
+        snapshot = dict(self.model.objects.values_list("key", "value"))
+        self._snapshot = MappingProxyType(snapshot)
+        self._snapshot_version = version
+        self._snapshot_refreshed_at = now
+        return True
+
+    def publish_change(self) -> None:
+        """
+        Rotate the options version, causing all subscribed processes to reload
+        their snapshot.
+        """
+        try:
+            self.cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+        except Exception:
+            logger.warning("options.publish-failed", exc_info=True)
+
+    def _start_poller(self) -> None:
+        if not self._subscribed or self._poll_interval is None:
+            return
+
+        self._subscription_stop = threading.Event()
+        thread = threading.Thread(
+            target=self._poll, args=(self._subscription_stop,), name="options-poller", daemon=True
+        )
+        thread.start()
+
+    def _poll(self, stop: threading.Event) -> None:
+        while not stop.wait(self._poll_interval):
+            try:
+                self.refresh_snapshot()
+            except Exception:
+                logger.warning("options.snapshot.failed", exc_info=True)
+
     def set_cache_impl(self, cache) -> None:
         self.cache = cache
@@ -7,11 +7,13 @@ from typing import (
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     Mapping,
     Optional,
     Pattern,
     Sequence,
+    Set,
     Tuple,
     Union,
 )
@@ -29,7 +31,7 @@ from sentry.utils.event_frames import find_stack_frames, get_sdk_name, munged_fi
 from sentry.utils.glob import glob_match
 from sentry.utils.safe import PathSearchable, get_path
 
-__all__ = ("parse_rules", "dump_schema", "load_schema")
+__all__ = ("parse_rules", "dump_schema", "load_schema", "OwnershipIndex")
 
 VERSION = 1
 
@@ -100,6 +102,14 @@ class Rule(namedtuple("Rule", "matcher owners")):
         return self.matcher.test(data)
 
 
+def _glob_frame_value_match(value: Optional[str], pattern: str) -> bool:
+    return bool(glob_match(value, pattern, ignorecase=True, path_normalize=True))
+
+
+def _codeowners_frame_value_match(value: Optional[str], pattern: str) -> bool:
+    return bool(codeowners_match(value, pattern))
+
+
 class Matcher(namedtuple("Matcher", "type pattern")):
     """
     A Matcher represents a type:pattern pairing for use in
@@ -155,7 +165,7 @@ class Matcher(namedtuple("Matcher", "type pattern")):
                 # As such we need to match it using gitignore logic.
                 # See syntax documentation here:
                 # https://docs.github.com/en/github/creating-cloning-and-archiving-repositories/creating-a-repository-on-github/about-code-owners
-                match_frame_value_func=lambda val, pattern: bool(codeowners_match(val, pattern)),
+                match_frame_value_func=_codeowners_frame_value_match,
             )
         return False
 
@@ -170,9 +180,7 @@ class Matcher(namedtuple("Matcher", "type pattern")):
         self,
         frames: Sequence[Mapping[str, Any]],
         keys: Sequence[str],
-        match_frame_value_func: Callable[[Optional[str], str], bool] = lambda val, pattern: bool(
-            glob_match(val, pattern, ignorecase=True, path_normalize=True)
-        ),
+        match_frame_value_func: Callable[[Optional[str], str], bool] = _glob_frame_value_match,
     ) -> bool:
         for frame in (f for f in frames if isinstance(f, Mapping)):
             for key in keys:
@@ -215,6 +223,203 @@ class Matcher(namedtuple("Matcher", "type pattern")):
         return False
 
 
+# Characters with a special meaning in glob or codeowners patterns. The literal
+# prefix and suffix of a pattern stop at the first and last of them.
+PATTERN_SPECIAL_CHARS = frozenset("*?[]{}!\\")
+
+
+def _literal_prefix(pattern: str) -> str:
+    for i, ch in enumerate(pattern):
+        if ch in PATTERN_SPECIAL_CHARS:
+            return pattern[:i]
+    return pattern
+
+
+def _literal_suffix(pattern: str) -> str:
+    for i in range(len(pattern) - 1, -1, -1):
+        if pattern[i] in PATTERN_SPECIAL_CHARS:
+            return pattern[i + 1 :]
+    return pattern
+
+
+def _glob_pattern_literals(pattern: str) -> Tuple[Optional[str], str]:
+    # Case insensitive matching of non-ASCII characters isn't a plain `lower()`.
+    if not pattern.isascii():
+        return None, ""
+    prefix = _literal_prefix(pattern).lower()
+    # The slashes around a `**` wildcard are optional.
+    suffix = _literal_suffix(pattern).strip("/").lower()
+    return prefix or None, suffix
+
+
+def _glob_normalize_value(value: str) -> Optional[str]:
+    if not value.isascii():
+        return None
+    return value.replace("\\", "/").lower()
+
+
+def _codeowners_pattern_literals(pattern: str) -> Tuple[Optional[str], str]:
+    # Backslashes can match a backslash file or directory.
+    if "\\" in pattern:
+        return None, ""
+    suffix = _literal_suffix(pattern).strip("/")
+    pattern = pattern.rstrip("/")
+    # Patterns without a slash (other than a trailing one) match at any depth.
+    if "/" not in pattern:
+        return None, suffix
+    # Anchored patterns and paths may or may not start with a slash.
+    if pattern.startswith("/"):
+        pattern = pattern[1:]
+    prefix = _literal_prefix(pattern)
+    if not prefix or prefix.startswith("/"):
+        return None, suffix
+    return prefix, suffix
+
+
+def _codeowners_normalize_value(value: str) -> Optional[str]:
+    return value[1:] if value.startswith("/") else value
+
+
+class _FramePatternIndex:
+    """
+    Indexes frame patterns by their literal prefix, so that a frame value is only
+    matched against the patterns starting like the value does and containing their
+    literal suffix.
+
+    `get_pattern_literals` returns the normalized literal prefix of a pattern, or
+    `None` if its matches can't be narrowed down by prefix, and a literal that all
+    the values it matches contain. `normalize_value` normalizes values the same
+    way, or returns `None` for values that need to be matched against every pattern.
+    """
+
+    def __init__(
+        self,
+        match: Callable[[Optional[str], str], bool],
+        get_pattern_literals: Callable[[str], Tuple[Optional[str], str]],
+        normalize_value: Callable[[str], Optional[str]],
+    ) -> None:
+        self.match = match
+        self.get_pattern_literals = get_pattern_literals
+        self.normalize_value = normalize_value
+        self.patterns: List[Tuple[int, str, str]] = []
+        self.unindexed: List[Tuple[int, str, str]] = []
+        self.by_prefix: Dict[str, List[Tuple[int, str, str]]] = {}
+        self.prefix_lengths: List[int] = []
+
+    def add(self, rule_index: int, pattern: str) -> None:
+        prefix, suffix = self.get_pattern_literals(pattern)
+        entry = (rule_index, pattern, suffix)
+        self.patterns.append(entry)
+        if prefix is None:
+            self.unindexed.append(entry)
+            return
+        if prefix not in self.by_prefix:
+            self.by_prefix[prefix] = []
+            if len(prefix) not in self.prefix_lengths:
+                self.prefix_lengths.append(len(prefix))
+                self.prefix_lengths.sort()
+        self.by_prefix[prefix].append(entry)
+
+    def candidates(self, value: Any) -> Iterator[Tuple[int, str, str]]:
+        normalized = self.normalize_value(value) if isinstance(value, str) else None
+        if normalized is None:
+            yield from self.patterns
+            return
+
+        for entry in self.unindexed:
+            if entry[2] in normalized:
+                yield entry
+        for length in self.prefix_lengths:
+            if length > len(normalized):
+                break
+            for entry in self.by_prefix.get(normalized[:length], ()):
+                if entry[2] in normalized:
+                    yield entry
+
+    def collect_matches(self, values: Iterable[Any], matches: Set[int]) -> None:
+        for value in values:
+            for rule_index, pattern, _ in self.candidates(value):
+                if rule_index not in matches and self.match(value, pattern):
+                    matches.add(rule_index)
+
+
+def _frame_values(frames: Sequence[Mapping[str, Any]], keys: Sequence[str]) -> List[Any]:
+    values: List[Any] = []
+    seen: Set[str] = set()
+    for frame in (f for f in frames if isinstance(f, Mapping)):
+        for key in keys:
+            value = frame.get(key)
+            if not value:
+                continue
+            if isinstance(value, str):
+                if value in seen:
+                    continue
+                seen.add(value)
+            values.append(value)
+    return values
+
+
+class OwnershipIndex:
+    """
+    The rules of an ownership schema, compiled to find all the rules matching an
+    event at once. This is equivalent to calling `Rule.test` for every rule, but an
+    event's frames are only collected once, and each distinct frame value is only
+    globbed against the path, module and codeowners patterns it can match.
+    """
+
+    def __init__(self, matchers: Sequence[Matcher]) -> None:
+        self.matchers = matchers
+        self.paths = _FramePatternIndex(
+            _glob_frame_value_match, _glob_pattern_literals, _glob_normalize_value
+        )
+        self.modules = _FramePatternIndex(
+            _glob_frame_value_match, _glob_pattern_literals, _glob_normalize_value
+        )
+        self.codeowners = _FramePatternIndex(
+            _codeowners_frame_value_match,
+            _codeowners_pattern_literals,
+            _codeowners_normalize_value,
+        )
+        # url and tag matchers are tested against the event directly.
+        self.other: List[int] = []
+
+        for rule_index, matcher in enumerate(matchers):
+            if matcher.type == PATH:
+                self.paths.add(rule_index, matcher.pattern)
+            elif matcher.type == MODULE:
+                self.modules.add(rule_index, matcher.pattern)
+            elif matcher.type == CODEOWNERS:
+                self.codeowners.add(rule_index, matcher.pattern)
+            else:
+                self.other.append(rule_index)
+
+    @classmethod
+    def from_schema(cls, schema: Mapping[str, Any]) -> OwnershipIndex:
+        if schema["$version"] != VERSION:
+            raise RuntimeError("Invalid schema $version: %r" % schema["$version"])
+        return cls([Matcher.load(r["matcher"]) for r in schema["rules"]])
+
+    def matching_rule_indexes(self, data: PathSearchable) -> Sequence[int]:
+        """Returns the indexes of the rules matching `data`, in the order of the schema."""
+        matches: Set[int] = set()
+
+        if self.paths.patterns or self.codeowners.patterns:
+            munged_values = _frame_values(*Matcher.munge_if_needed(data))
+            self.paths.collect_matches(munged_values, matches)
+            self.codeowners.collect_matches(munged_values, matches)
+
+        if self.modules.patterns:
+            self.modules.collect_matches(
+                _frame_values(find_stack_frames(data), ["module"]), matches
+            )
+
+        for rule_index in self.other:
+            if self.matchers[rule_index].test(data):
+                matches.add(rule_index)
+
+        return sorted(matches)
+
+
 class Owner(namedtuple("Owner", "type identifier")):
     """
     An Owner represents a User or Team who owns this Rule.
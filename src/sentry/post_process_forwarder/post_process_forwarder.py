@@ -1,9 +1,25 @@
 import logging
 import signal
+import time
 import uuid
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from enum import Enum
-from typing import Any, Literal, Mapping, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Hashable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from arroyo import configure_metrics
 from arroyo.backends.kafka import KafkaConsumer, KafkaPayload
@@ -12,9 +28,9 @@ from arroyo.commit import ONCE_PER_SECOND
 from arroyo.processing import StreamProcessor
 from arroyo.processing.strategies import (
     CommitOffsets,
+    MessageRejected,
     ProcessingStrategy,
     ProcessingStrategyFactory,
-    RunTaskInThreads,
 )
 from arroyo.types import Commit, Message, Partition, Topic
 from django.conf import settings
@@ -137,11 +153,151 @@ class PostProcessForwarder:
         )
 
 
+class RunTaskInLanes(ProcessingStrategy[KafkaPayload]):
+    """
+    Runs ``function`` on every message in one of ``lanes`` worker threads.
+    The lane of a message is picked by hashing the key ``get_key`` returns
+    for it, so messages with the same key are processed one at a time and in
+    the order they were submitted, while different lanes run concurrently.
+
+    Messages are forwarded to ``next_step`` in submission order once they
+    were processed, which means offsets are only ever committed up to the
+    oldest message that is still pending in any lane.
+    """
+
+    # How often the pending count and lag of every lane is reported.
+    metrics_interval = 1.0
+
+    def __init__(
+        self,
+        function: Callable[[Message[KafkaPayload]], Any],
+        get_key: Callable[[Message[KafkaPayload]], Hashable],
+        lanes: int,
+        max_pending_futures: int,
+        next_step: ProcessingStrategy[Any],
+    ) -> None:
+        self.__function = function
+        self.__get_key = get_key
+        self.__executors: Sequence[ThreadPoolExecutor] = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"post-process-lane-{lane}")
+            for lane in range(lanes)
+        ]
+        self.__max_pending_futures = max_pending_futures
+        self.__next_step = next_step
+        self.__queue: Deque[Tuple[int, float, Message[KafkaPayload], Future[Any]]] = deque()
+        self.__metrics_reported_at = 0.0
+        self.__closed = False
+
+    def submit(self, message: Message[KafkaPayload]) -> None:
+        assert not self.__closed
+        if len(self.__queue) >= self.__max_pending_futures:
+            raise MessageRejected
+
+        lane = hash(self.__get_key(message)) % len(self.__executors)
+        future = self.__executors[lane].submit(self.__function, message)
+        self.__queue.append((lane, time.time(), message, future))
+
+    def __forward_completed(self, block: bool = False, timeout: Optional[float] = None) -> None:
+        """
+        Forwards the processed messages at the head of the queue. Unless
+        ``block`` is set, this stops at the first message that is still
+        pending. Otherwise it waits for pending messages, for at most
+        ``timeout`` seconds in total, or without a deadline if it is ``None``.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while self.__queue:
+            _, _, message, future = self.__queue[0]
+            if not block:
+                if not future.done():
+                    break
+                result = future.result()
+            else:
+                try:
+                    result = future.result(
+                        max(deadline - time.time(), 0) if deadline is not None else None
+                    )
+                except FutureTimeoutError:
+                    break
+
+            try:
+                self.__next_step.submit(Message(message.value.replace(result)))
+            except MessageRejected:
+                break
+
+            self.__queue.popleft()
+
+    def __report_lanes(self) -> None:
+        now = time.time()
+        if now - self.__metrics_reported_at < self.metrics_interval:
+            return
+        self.__metrics_reported_at = now
+
+        pending = [0] * len(self.__executors)
+        oldest: List[Optional[float]] = [None] * len(self.__executors)
+        for lane, submitted_at, _, future in self.__queue:
+            if not future.done():
+                pending[lane] += 1
+                if oldest[lane] is None:
+                    oldest[lane] = submitted_at
+
+        for lane, (count, submitted_at) in enumerate(zip(pending, oldest)):
+            tags = {"lane": str(lane)}
+            metrics.gauge("post_process_forwarder.lane.pending", count, tags=tags)
+            metrics.gauge(
+                "post_process_forwarder.lane.lag",
+                now - submitted_at if submitted_at is not None else 0,
+                tags=tags,
+            )
+
+    def poll(self) -> None:
+        self.__forward_completed()
+        self.__report_lanes()
+        self.__next_step.poll()
+
+    def close(self) -> None:
+        self.__closed = True
+
+    def __shutdown_lanes(self) -> None:
+        # Messages that didn't start yet must not be dispatched anymore, the
+        # next owner of the partition will dispatch them again. This is what
+        # `shutdown(cancel_futures=True)` does on Python 3.9+.
+        for _, _, _, future in self.__queue:
+            future.cancel()
+        for executor in self.__executors:
+            executor.shutdown(wait=False)
+
+    def terminate(self) -> None:
+        self.__closed = True
+
+        self.__shutdown_lanes()
+        self.__next_step.terminate()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        start = time.time()
+        self.__forward_completed(block=True, timeout=timeout)
+        if self.__queue:
+            logger.warning("Timed out with %s messages pending in lanes", len(self.__queue))
+
+        self.__shutdown_lanes()
+
+        self.__next_step.close()
+        remaining = timeout - (time.time() - start) if timeout is not None else None
+        self.__next_step.join(max(remaining, 0) if remaining is not None else None)
+
+
 class PostProcessForwarderStrategyFactory(ProcessingStrategyFactory[KafkaPayload], ABC):
+    """
+    Dispatches messages in ``concurrency`` lanes. Messages that
+    ``_get_ordering_key`` returns the same key for are dispatched in order.
+    """
+
     @abstractmethod
     def _dispatch_function(self, message: Message[KafkaPayload]) -> None:
         raise NotImplementedError()
 
+    def _get_ordering_key(self, message: Message[KafkaPayload]) -> Hashable:
+        return message.payload.key
+
     def __init__(self, concurrency: int):
         self.__concurrency = concurrency
         self.__max_pending_futures = concurrency + 1000
@@ -151,8 +307,9 @@ class PostProcessForwarderStrategyFactory(ProcessingStrategyFactory[KafkaPayload
         commit: Commit,
         partitions: Mapping[Partition, int],
     ) -> ProcessingStrategy[KafkaPayload]:
-        return RunTaskInThreads(
+        return RunTaskInLanes(
             self._dispatch_function,
+            self._get_ordering_key,
             self.__concurrency,
             self.__max_pending_futures,
             CommitOffsets(commit),
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+from array import array
 from copy import deepcopy
 from datetime import datetime
 from time import sleep, time
-from typing import Any, List, Mapping, MutableMapping, Optional, Tuple
+from typing import Any, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 import msgpack
 import sentry_sdk
@@ -268,6 +269,7 @@ def _normalize(profile: Profile, organization: Organization) -> None:
             profile["device_classification"] = classification
 
 
+@metrics.wraps("process_profile.symbolicate.prepare")
 def _prepare_frames_from_profile(profile: Profile) -> Tuple[List[Any], List[Any], set[int]]:
     with sentry_sdk.start_span(op="task.profiling.symbolicate.prepare_frames"):
         modules = profile["debug_meta"]["images"]
@@ -288,17 +290,23 @@ def _prepare_frames_from_profile(profile: Profile) -> Tuple[List[Any], List[Any]
                 frames = [profile["profile"]["frames"][idx] for idx in frames_sent]
             else:
                 frames = profile["profile"]["frames"]
+                leaf_frames: dict[int, int] = {}
 
                 for stack in profile["profile"]["stacks"]:
                     if len(stack) > 0:
                         # Make a deep copy of the leaf frame with adjust_instruction_addr = False
                         # and append it to the list. This ensures correct behavior
                         # if the leaf frame also shows up in the middle of another stack.
+                        # Stacks with the same leaf frame share its copy so it's only
+                        # symbolicated once.
                         first_frame_idx = stack[0]
-                        frame = deepcopy(frames[first_frame_idx])
-                        frame["adjust_instruction_addr"] = False
-                        frames.append(frame)
-                        stack[0] = len(frames) - 1
+                        leaf_frame_idx = leaf_frames.get(first_frame_idx)
+                        if leaf_frame_idx is None:
+                            frame = deepcopy(frames[first_frame_idx])
+                            frame["adjust_instruction_addr"] = False
+                            frames.append(frame)
+                            leaf_frame_idx = leaf_frames[first_frame_idx] = len(frames) - 1
+                        stack[0] = leaf_frame_idx
 
             stacktraces = [{"frames": frames}]
         # in the original format, we need to gather frames from all samples
@@ -459,7 +467,8 @@ def _process_symbolicator_results_for_sample(
             return stack
 
     symbolicated_frames = stacktraces[0]["frames"]
-    symbolicated_frames_dict = get_frame_index_map(symbolicated_frames)
+    frame_offsets = get_frame_index_map(symbolicated_frames)
+    original_frames_count = len(frame_offsets) - 1
 
     if len(frames_sent) > 0:
         raw_frames = profile["profile"]["frames"]
@@ -476,17 +485,14 @@ def _process_symbolicator_results_for_sample(
             # to new_frames.
             # This works since symbolicated_frames are in the same order
             # as raw_frames (except some frames are not sent).
-            for frame_idx in symbolicated_frames_dict[symbolicated_frame_idx]:
-                new_frames.append(symbolicated_frames[frame_idx])
+            start = frame_offsets[symbolicated_frame_idx]
+            end = frame_offsets[symbolicated_frame_idx + 1]
+            new_frames.extend(symbolicated_frames[start:end])
 
             # go to the next symbolicated frame result
             symbolicated_frame_idx += 1
 
-        new_frames_count = (
-            len(raw_frames)
-            + sum([len(frames) for frames in symbolicated_frames_dict.values()])
-            - len(symbolicated_frames_dict)
-        )
+        new_frames_count = len(raw_frames) - len(frames_sent) + len(symbolicated_frames)
 
         assert len(new_frames) == new_frames_count
 
@@ -494,20 +500,29 @@ def _process_symbolicator_results_for_sample(
     elif symbolicated_frames:
         profile["profile"]["frames"] = symbolicated_frames
 
-    if profile["platform"] in SHOULD_SYMBOLICATE:
+    # When every frame maps to exactly one symbolicated frame at the same index,
+    # there's nothing to remap in the stacks.
+    if profile["platform"] in SHOULD_SYMBOLICATE and frame_offsets != array(
+        "l", range(original_frames_count + 1)
+    ):
+
+        # the new stack extends the older by replacing
+        # a specific frame index with the indices of
+        # the frames originated from the original frame
+        # should inlines be present
+        new_indices: List[Sequence[int]] = [
+            range(frame_offsets[index], frame_offsets[index + 1])
+            if frame_offsets[index] < frame_offsets[index + 1]
+            else (index,)
+            for index in range(original_frames_count)
+        ]
 
         def get_stack(stack: List[int]) -> List[int]:
-            new_stack: List[int] = []
-            for index in stack:
-                if index in symbolicated_frames_dict:
-                    # the new stack extends the older by replacing
-                    # a specific frame index with the indices of
-                    # the frames originated from the original frame
-                    # should inlines be present                    # should inlines be present
-                    new_stack.extend(symbolicated_frames_dict[index])
-                else:
-                    new_stack.append(index)
-            return new_stack
+            return [
+                new_index
+                for index in stack
+                for new_index in (new_indices[index] if index < original_frames_count else (index,))
+            ]
 
     else:
 
@@ -558,8 +573,10 @@ def _process_symbolicator_results_for_rust(profile: Profile, stacktraces: List[A
 
 
 """
-This function returns a map {index: [indexes]} that will let us replace a specific
-frame index with (potentially) a list of frames indices that originated from that frame.
+This function returns an array of offsets that will let us replace a specific
+frame index with (potentially) a list of frames indices that originated from that frame:
+the frames originated from the frame at `index` are the ones from `offsets[index]`
+up to (excluding) `offsets[index + 1]`.
 
 The reason for this is that the frame from the SDK exists "physically",
 and symbolicator then synthesizes other frames for calls that have been inlined
@@ -584,17 +601,23 @@ after symbolication you would have:
 c_inlined -> b -> a
 
 The sorting order is callee to caller (child to parent)
+
+This relies on symbolicator returning the frames in the order they were sent in,
+with the inlined frames right before the frame they were inlined into.
 """
 
 
-def get_frame_index_map(frames: List[dict[str, Any]]) -> dict[int, List[int]]:
-    index_map: dict[int, List[int]] = {}
+def get_frame_index_map(frames: List[dict[str, Any]]) -> array[int]:
+    offsets = array("l")
     for i, frame in enumerate(frames):
         # In case we don't have an `original_index` field, we default to using
         # the index of the frame in order to still produce a data structure
         # with the right shape.
-        index_map.setdefault(frame.get("original_index", i), []).append(i)
-    return index_map
+        original_index = frame.get("original_index", i)
+        while len(offsets) <= original_index:
+            offsets.append(i)
+    offsets.append(len(frames))
+    return offsets
 
 
 @metrics.wraps("process_profile.deobfuscate")
@@ -603,7 +626,9 @@ def _deobfuscate(profile: Profile, project: Project) -> None:
     if debug_file_id is None or debug_file_id == "":
         return
 
-    with sentry_sdk.start_span(op="proguard.fetch_debug_files"):
+    with sentry_sdk.start_span(op="proguard.fetch_debug_files"), metrics.timer(
+        "process_profile.deobfuscate.fetch_debug_files"
+    ):
         dif_paths = ProjectDebugFile.difcache.fetch_difs(
             project, [debug_file_id], features=["mapping"]
         )
@@ -611,16 +636,26 @@ def _deobfuscate(profile: Profile, project: Project) -> None:
         if debug_file_path is None:
             return
 
-    with sentry_sdk.start_span(op="proguard.open"):
+    with sentry_sdk.start_span(op="proguard.open"), metrics.timer(
+        "process_profile.deobfuscate.open"
+    ):
         mapper = ProguardMapper.open(debug_file_path)
         if not mapper.has_line_info:
             return
 
-    with sentry_sdk.start_span(op="proguard.remap"):
+    with sentry_sdk.start_span(op="proguard.remap"), metrics.timer(
+        "process_profile.deobfuscate.remap"
+    ):
+        # Methods often repeat (e.g. the same method showing up on several lines
+        # or threads), remap each of them once.
+        remapped_frames: dict[Tuple[str, str, int], Any] = {}
+        remapped_classes: dict[str, Optional[str]] = {}
+
         for method in profile["profile"]["methods"]:
-            mapped = mapper.remap_frame(
-                method["class_name"], method["name"], method["source_line"] or 0
-            )
+            frame_key = (method["class_name"], method["name"], method["source_line"] or 0)
+            mapped = remapped_frames.get(frame_key)
+            if mapped is None:
+                mapped = remapped_frames[frame_key] = mapper.remap_frame(*frame_key)
             method.setdefault("data", {})
             if len(mapped) == 1:
                 new_frame = mapped[0]
@@ -648,7 +683,11 @@ def _deobfuscate(profile: Profile, project: Project) -> None:
                     for new_frame in mapped
                 ]
             else:
-                mapped_class = mapper.remap_class(method["class_name"])
+                if method["class_name"] not in remapped_classes:
+                    remapped_classes[method["class_name"]] = mapper.remap_class(
+                        method["class_name"]
+                    )
+                mapped_class = remapped_classes[method["class_name"]]
                 if mapped_class:
                     method["class_name"] = mapped_class
                     method["data"]["deobfuscation_status"] = "partial"
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from time import time
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+from redis.exceptions import RedisError
+
+from sentry.ratelimits.redis import RedisRateLimiter, _bucket_start_time, _time_bucket
+from sentry.utils import metrics
+
+if TYPE_CHECKING:
+    from sentry.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _LocalCounter:
+    # The last value read back from redis, including increments this process
+    # has already written.
+    remote: int
+    # Increments counted by this process that were not yet written to redis.
+    pending: int
+    # End of the time bucket this counter belongs to.
+    expires_at: int
+
+
+class HybridRateLimiter(RedisRateLimiter):
+    """
+    A rate limiter which avoids a redis roundtrip for most checks.
+
+    It uses the same fixed-window keys as :class:`RedisRateLimiter`, but every
+    process keeps a local approximation of the counters of hot keys. As long as
+    a key is far enough from its limit, checks are decided locally and the
+    increments are written to redis in batches, at most every ``sync_interval``
+    seconds. Once a key's estimate gets close to its limit, every check goes to
+    redis, so the limit itself is enforced exactly.
+
+    Options (passed through ``SENTRY_RATELIMITER_OPTIONS``):
+
+    - ``local_threshold``: fraction of the limit below which a check may be
+      decided locally.
+    - ``max_local_pending``: the maximum number of unsynced increments per key
+      and process. Redis undercounts a key by at most this number times the
+      number of processes, which bounds the error of decisions made by other
+      processes.
+    - ``sync_interval``: how often, in seconds, pending increments are written.
+    - ``max_local_keys``: the maximum number of keys tracked per process.
+    """
+
+    def __init__(
+        self,
+        local_threshold: float = 0.5,
+        max_local_pending: int = 10,
+        sync_interval: float = 0.25,
+        max_local_keys: int = 10000,
+        **options: Any,
+    ) -> None:
+        super().__init__(**options)
+        self.local_threshold = local_threshold
+        self.max_local_pending = max_local_pending
+        self.sync_interval = sync_interval
+        self.max_local_keys = max_local_keys
+
+        self._lock = threading.Lock()
+        self._counters: Dict[str, _LocalCounter] = {}
+        self._last_sync = time()
+
+    def current_value(
+        self, key: str, project: Project | None = None, window: int | None = None
+    ) -> int:
+        redis_key = self._construct_redis_key(key, project=project, window=window)
+        with self._lock:
+            counter = self._counters.get(redis_key)
+            pending = counter.pending if counter is not None else 0
+        return super().current_value(key, project=project, window=window) + pending
+
+    def is_limited_with_value(
+        self, key: str, limit: int, project: Project | None = None, window: int | None = None
+    ) -> tuple[bool, int, int]:
+        request_time = time()
+        if window is None or window == 0:
+            window = self.window
+        redis_key = self._construct_redis_key(
+            key, project=project, window=window, request_time=request_time
+        )
+        reset_time = _bucket_start_time(_time_bucket(request_time, window) + 1, window)
+
+        if request_time - self._last_sync >= self.sync_interval:
+            self.sync(request_time)
+
+        with self._lock:
+            counter = self._counters.get(redis_key)
+            if counter is not None:
+                estimate = counter.remote + counter.pending + 1
+                if (
+                    counter.pending < self.max_local_pending
+                    and estimate <= limit * self.local_threshold
+                ):
+                    counter.pending += 1
+                    metrics.incr(
+                        "ratelimits.hybrid.decision", tags={"source": "local"}, sample_rate=0.01
+                    )
+                    return False, estimate, reset_time
+
+                # Flush this key's pending increments along with the exact check.
+                amount = counter.pending + 1
+                counter.pending = 0
+            else:
+                amount = 1
+
+        metrics.incr("ratelimits.hybrid.decision", tags={"source": "remote"}, sample_rate=0.01)
+        try:
+            with self.client.pipeline() as pipe:
+                pipe.incrby(redis_key, amount)
+                pipe.expire(redis_key, window - int(request_time % window))
+                result = pipe.execute()[0]
+        except RedisError:
+            # We don't want rate limited endpoints to fail when ratelimits
+            # can't be updated. We do want to know when that happens.
+            logger.exception("Failed to retrieve current value from redis")
+            return False, 0, reset_time
+
+        with self._lock:
+            counter = self._counters.get(redis_key)
+            if counter is not None:
+                counter.remote = max(counter.remote, result)
+            elif len(self._counters) < self.max_local_keys:
+                self._counters[redis_key] = _LocalCounter(
+                    remote=result, pending=0, expires_at=reset_time
+                )
+
+        return result > limit, result, reset_time
+
+    def sync(self, now: float | None = None) -> None:
+        """
+        Write all pending increments to redis in one pipeline, refresh the
+        local counters and forget counters of windows that are over.
+        """
+        if now is None:
+            now = time()
+
+        to_write: List[Tuple[str, int, int]] = []
+        with self._lock:
+            self._last_sync = now
+            for redis_key, counter in list(self._counters.items()):
+                if counter.pending:
+                    to_write.append((redis_key, counter.pending, counter.expires_at))
+                    counter.pending = 0
+                if counter.expires_at <= now:
+                    del self._counters[redis_key]
+
+        if not to_write:
+            return
+
+        metrics.incr("ratelimits.hybrid.sync", amount=len(to_write), sample_rate=0.1)
+        try:
+            with self.client.pipeline() as pipe:
+                for redis_key, pending, expires_at in to_write:
+                    pipe.incrby(redis_key, pending)
+                    pipe.expire(redis_key, max(int(expires_at - now), 1))
+                results = pipe.execute()
+        except RedisError:
+            # Losing a batch of increments undercounts by at most
+            # `max_local_pending` per key, which is within our error bounds.
+            logger.exception("Failed to sync rate limit counters to redis")
+            return
+
+        with self._lock:
+            for (redis_key, _, _), result in zip(to_write, results[::2]):
+                counter = self._counters.get(redis_key)
+                if counter is not None:
+                    counter.remote = max(counter.remote, result)
@@ -1,3 +1,4 @@
+from .access import *  # noqa: F401,F403
 from .analytics import *  # noqa: F401,F403
 from .auth import *  # noqa: F401,F403
 from .core import *  # noqa: F401,F403
@@ -0,0 +1,63 @@
+from django.db.models.signals import post_delete, post_save
+
+from sentry.auth.access_snapshot import schedule_invalidate_organization_access
+from sentry.models import (
+    Organization,
+    OrganizationMember,
+    OrganizationMemberTeam,
+    OrganizationOption,
+    Project,
+    ProjectTeam,
+    Team,
+)
+
+
+def invalidate_access_for_organization(instance: Organization, **kwargs):
+    schedule_invalidate_organization_access(Organization, instance.id)
+
+
+def invalidate_access_for_organization_member(instance: OrganizationMember, **kwargs):
+    schedule_invalidate_organization_access(OrganizationMember, instance.organization_id)
+
+
+def invalidate_access_for_organization_member_team(instance: OrganizationMemberTeam, **kwargs):
+    try:
+        organization_id = instance.team.organization_id
+    except Team.DoesNotExist:
+        return
+    schedule_invalidate_organization_access(OrganizationMemberTeam, organization_id)
+
+
+def invalidate_access_for_organization_option(instance: OrganizationOption, **kwargs):
+    schedule_invalidate_organization_access(OrganizationOption, instance.organization_id)
+
+
+def invalidate_access_for_team(instance: Team, **kwargs):
+    schedule_invalidate_organization_access(Team, instance.organization_id)
+
+
+def invalidate_access_for_project(instance: Project, **kwargs):
+    schedule_invalidate_organization_access(Project, instance.organization_id)
+
+
+def invalidate_access_for_project_team(instance: ProjectTeam, **kwargs):
+    try:
+        organization_id = instance.team.organization_id
+    except Team.DoesNotExist:
+        return
+    schedule_invalidate_organization_access(ProjectTeam, organization_id)
+
+
+for model, receiver in (
+    (Organization, invalidate_access_for_organization),
+    (OrganizationMember, invalidate_access_for_organization_member),
+    (OrganizationMemberTeam, invalidate_access_for_organization_member_team),
+    (OrganizationOption, invalidate_access_for_organization_option),
+    (Team, invalidate_access_for_team),
+    (Project, invalidate_access_for_project),
+    (ProjectTeam, invalidate_access_for_project_team),
+):
+    post_save.connect(receiver, sender=model, dispatch_uid=f"{receiver.__name__}_save", weak=False)
+    post_delete.connect(
+        receiver, sender=model, dispatch_uid=f"{receiver.__name__}_delete", weak=False
+    )
@@ -38,7 +38,7 @@ from sentry.ingest.transaction_clusterer.rules import (
     get_sorted_rules,
 )
 from sentry.interfaces.security import DEFAULT_DISALLOWED_SOURCES
-from sentry.models import Project, ProjectKey
+from sentry.models import Organization, Project, ProjectKey
 from sentry.relay.config.metric_extraction import (
     get_metric_conditional_tagging_rules,
     get_metric_extraction_config,
@@ -196,6 +196,41 @@ def get_project_config(
             return _get_project_config(project, full_config=full_config, project_keys=project_keys)
 
 
+def get_project_configs_for_keys(
+    project: Project,
+    project_keys: Sequence[ProjectKey],
+    full_config: bool = True,
+    org_sections: Optional[MutableMapping[str, Any]] = None,
+) -> Mapping[str, "ProjectConfig"]:
+    """Constructs one ProjectConfig per project key.
+
+    This produces the same configs as calling :func:`get_project_config` once
+    per key, but computes all sections which do not depend on the key only once
+    for the project.
+
+    :param project: The project to load configuration for.
+    :param project_keys: The keys to build configs for.
+    :param full_config: See :func:`get_project_config`.
+    :param org_sections: An optional mapping used to memoize sections that only
+        depend on the organization. Pass the same mapping when building configs
+        for several projects of one organization.
+    :return: A mapping of public key to its ProjectConfig.
+    """
+    with sentry_sdk.push_scope() as scope:
+        scope.set_tag("project", project.id)
+        with metrics.timer("relay.config.get_project_configs_for_keys.duration"):
+            if project.status != ObjectStatus.ACTIVE:
+                return {
+                    key.public_key: ProjectConfig(project, disabled=True) for key in project_keys
+                }
+
+            base_cfg = _get_base_project_config(project, full_config, org_sections)
+            return {
+                key.public_key: _with_key_sections(project, base_cfg, full_config, [key])
+                for key in project_keys
+            }
+
+
 def get_dynamic_sampling_config(project: Project) -> Optional[Mapping[str, Any]]:
     if features.has("organizations:dynamic-sampling", project.organization):
         # For compatibility reasons we want to return an empty list of old rules. This has been done in order to make
@@ -311,14 +346,63 @@ def _should_extract_abnormal_mechanism(project: Project) -> bool:
     )
 
 
+def _get_org_section(
+    org_sections: Optional[MutableMapping[str, Any]],
+    name: str,
+    function: Callable[..., Any],
+    *args: Any,
+) -> Any:
+    """Computes a config section that only depends on the organization, reusing
+    a previously computed value from ``org_sections`` if there is one."""
+    if org_sections is None:
+        return function(*args)
+    if name not in org_sections:
+        org_sections[name] = function(*args)
+    return org_sections[name]
+
+
+def _get_trusted_relays(organization: Organization) -> List[str]:
+    return [r["public_key"] for r in organization.get_option("sentry:trusted-relays", []) if r]
+
+
 def _get_project_config(
     project: Project, full_config: bool = True, project_keys: Optional[Sequence[ProjectKey]] = None
 ) -> "ProjectConfig":
     if project.status != ObjectStatus.ACTIVE:
         return ProjectConfig(project, disabled=True)
 
-    public_keys = get_public_key_configs(project, full_config, project_keys=project_keys)
+    base_cfg = _get_base_project_config(project, full_config)
+    return _with_key_sections(project, base_cfg, full_config, project_keys)
+
+
+def _with_key_sections(
+    project: Project,
+    base_cfg: Mapping[str, Any],
+    full_config: bool,
+    project_keys: Optional[Sequence[ProjectKey]],
+) -> "ProjectConfig":
+    """Completes a config built by :func:`_get_base_project_config` with the
+    sections that depend on the project keys."""
+    cfg = dict(base_cfg)
+    cfg["publicKeys"] = get_public_key_configs(project, full_config, project_keys=project_keys)
+
+    if full_config:
+        config = dict(base_cfg["config"])
+        with Hub.current.start_span(op="get_all_quotas"):
+            if quotas_config := get_quotas(project, keys=project_keys):
+                config["quotas"] = quotas_config
+        cfg["config"] = config
+
+    return ProjectConfig(project, **cfg)
+
 
+def _get_base_project_config(
+    project: Project,
+    full_config: bool = True,
+    org_sections: Optional[MutableMapping[str, Any]] = None,
+) -> MutableMapping[str, Any]:
+    """Computes all sections of the project config that do not depend on the
+    project keys."""
     with Hub.current.start_span(op="get_public_config"):
         now = datetime.utcnow().replace(tzinfo=utc)
         cfg = {
@@ -327,14 +411,13 @@ def _get_project_config(
             "lastFetch": now,
             "lastChange": project.get_option("sentry:relay-rev-lastchange", now),
             "rev": project.get_option("sentry:relay-rev", uuid.uuid4().hex),
-            "publicKeys": public_keys,
+            # Filled in by `_with_key_sections`, kept here to preserve the key order.
+            "publicKeys": [],
             "config": {
                 "allowedDomains": list(get_origins(project)),
-                "trustedRelays": [
-                    r["public_key"]
-                    for r in project.organization.get_option("sentry:trusted-relays", [])
-                    if r
-                ],
+                "trustedRelays": _get_org_section(
+                    org_sections, "trustedRelays", _get_trusted_relays, project.organization
+                ),
                 "piiConfig": get_pii_config(project),
                 "datascrubbingSettings": get_datascrubbing_settings(project),
             },
@@ -368,7 +451,7 @@ def _get_project_config(
 
     if not full_config:
         # This is all we need for external Relay processors
-        return ProjectConfig(project, **cfg)
+        return cfg
 
     config["breakdownsV2"] = project.get_option("sentry:breakdowns")
 
@@ -409,14 +492,16 @@ def _get_project_config(
         if grouping_config is not None:
             config["groupingConfig"] = grouping_config
     with Hub.current.start_span(op="get_event_retention"):
-        event_retention = quotas.backend.get_event_retention(project.organization)
+        event_retention = _get_org_section(
+            org_sections,
+            "eventRetention",
+            quotas.backend.get_event_retention,
+            project.organization,
+        )
         if event_retention is not None:
             config["eventRetention"] = event_retention
-    with Hub.current.start_span(op="get_all_quotas"):
-        if quotas_config := get_quotas(project, keys=project_keys):
-            config["quotas"] = quotas_config
 
-    return ProjectConfig(project, **cfg)
+    return cfg
 
 
 class _ConfigBase:
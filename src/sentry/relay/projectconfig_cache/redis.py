@@ -1,9 +1,11 @@
 import logging
 
 import zstandard
+from django.utils.encoding import force_str
 
 from sentry.relay.projectconfig_cache.base import ProjectConfigCache
 from sentry.utils import json, metrics, redis
+from sentry.utils.hashlib import md5_text
 from sentry.utils.redis import validate_dynamic_cluster
 
 REDIS_CACHE_TIMEOUT = 3600  # 1 hr
@@ -12,6 +14,24 @@ COMPRESSION_LEVEL = 3  # 3 is the default level of compression
 logger = logging.getLogger(__name__)
 
 
+# Metadata that describes when a config was computed or changed rather than
+# its content. ``rev`` and ``lastChange`` default to a random revision and the
+# current time for projects that were never changed, so they differ on every
+# computation.
+_CONFIG_HASH_EXCLUDED_KEYS = frozenset(["lastFetch", "lastChange", "rev"])
+
+
+def get_config_hash(config):
+    """Returns a hash of the config's content.
+
+    ``lastFetch``, ``lastChange`` and ``rev`` are left out as they can change
+    on every computation without changing the behavior of Relay.
+    """
+    if isinstance(config, dict) and not _CONFIG_HASH_EXCLUDED_KEYS.isdisjoint(config):
+        config = {k: v for k, v in config.items() if k not in _CONFIG_HASH_EXCLUDED_KEYS}
+    return md5_text(json.dumps(config, sort_keys=True)).hexdigest()
+
+
 class RedisProjectConfigCache(ProjectConfigCache):
     def __init__(self, **options):
         cluster_key = options.get("cluster", "default")
@@ -28,18 +48,53 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_key(self, public_key):
         return f"relayconfig:{public_key}"
 
+    def __get_hash_redis_key(self, public_key):
+        return f"relayconfig-hash:{public_key}"
+
     def set_many(self, configs):
+        """Writes all configs whose content changed since they were last written.
+
+        Alongside every config a content hash is stored.  For configs whose hash
+        did not change, only the TTLs of the cached entries are refreshed instead
+        of writing the whole config again.
+        """
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
 
+        public_keys = list(configs.keys())
+        hashes = {public_key: get_config_hash(configs[public_key]) for public_key in public_keys}
+
         # Note: Those are multiple pipelines, one per cluster node
         p = self.cluster.pipeline()
-        for public_key, config in configs.items():
-            serialized = json.dumps(config).encode()
+        for public_key in public_keys:
+            p.get(self.__get_hash_redis_key(public_key))
+            p.expire(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT)
+            p.expire(self.__get_hash_redis_key(public_key), REDIS_CACHE_TIMEOUT)
+        results = p.execute()
+
+        changed = []
+        for i, public_key in enumerate(public_keys):
+            cached_hash, config_exists = results[i * 3], results[i * 3 + 1]
+            if config_exists and force_str(cached_hash) == hashes[public_key]:
+                continue
+            changed.append(public_key)
+
+        metrics.incr(
+            "relay.projectconfig_cache.write",
+            amount=len(public_keys) - len(changed),
+            tags={"action": "unchanged"},
+        )
+        if not changed:
+            return
+
+        p = self.cluster.pipeline()
+        for public_key in changed:
+            serialized = json.dumps(configs[public_key]).encode()
             compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
             metrics.timing("relay.projectconfig_cache.uncompressed_size", len(serialized))
             metrics.timing("relay.projectconfig_cache.size", len(compressed))
 
             p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
+            p.setex(self.__get_hash_redis_key(public_key), REDIS_CACHE_TIMEOUT, hashes[public_key])
 
         p.execute()
 
@@ -48,10 +103,13 @@ class RedisProjectConfigCache(ProjectConfigCache):
         with self.cluster.pipeline() as p:
             for public_key in public_keys:
                 p.delete(self.__get_redis_key(public_key))
+                p.delete(self.__get_hash_redis_key(public_key))
             return_values = p.execute()
 
         metrics.incr(
-            "relay.projectconfig_cache.write", amount=sum(return_values), tags={"action": "delete"}
+            "relay.projectconfig_cache.write",
+            amount=sum(return_values[::2]),
+            tags={"action": "delete"},
         )
 
     def get(self, public_key):
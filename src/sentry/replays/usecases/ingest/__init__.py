@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import codecs
 import dataclasses
 import logging
 import zlib
 from datetime import datetime, timezone
-from typing import Optional, TypedDict, cast
+from typing import Any, Iterable, Iterator, Optional, TypedDict, cast
 
 from django.conf import settings
 from sentry_kafka_schemas.schema_types.ingest_replay_recordings_v1 import ReplayRecording
@@ -26,6 +27,13 @@ logger = logging.getLogger("sentry.replays")
 CACHE_TIMEOUT = 3600
 COMMIT_FREQUENCY_SEC = 1
 
+# Recording segments are decompressed and parsed this many bytes at a time.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Characters starting a JSON number, and the ones that can follow an array item.
+NUMBER_START = frozenset("-0123456789")
+NUMBER_END = frozenset(" \t\n\r,]")
+
 
 class ReplayRecordingSegment(TypedDict):
     id: str  # a uuid that individualy identifies a recording segment
@@ -159,6 +167,131 @@ def decompress(data: bytes) -> bytes:
         return zlib.decompress(data, zlib.MAX_WBITS | 32)
 
 
+def iter_decompressed(data: bytes, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the decompressed bytes in chunks of at most `chunk_size` bytes."""
+    if data.startswith(b"["):
+        for start in range(0, len(data), chunk_size):
+            yield data[start : start + chunk_size]
+        return
+
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    pending = data
+    while not decompressor.eof:
+        chunk = decompressor.decompress(pending, chunk_size)
+        pending = decompressor.unconsumed_tail
+        if chunk:
+            yield chunk
+        elif not pending:
+            break
+
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Yield the items of the JSON array encoded by the chunks one at a time.
+
+    Only the item being parsed is kept in memory, which bounds the memory used by multi-megabyte
+    recording segments to the size of their largest event.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    remaining_chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    exhausted = False
+
+    def read(size: int) -> None:
+        # Drops the consumed part of the buffer and reads until it holds at least `size`
+        # characters.
+        nonlocal buffer, position, exhausted
+        parts = [buffer[position:]]
+        length = len(parts[0])
+        while length < size and not exhausted:
+            chunk = next(remaining_chunks, None)
+            if chunk is None:
+                parts.append(decoder.decode(b"", final=True))
+                exhausted = True
+            else:
+                parts.append(decoder.decode(chunk))
+                length += len(parts[-1])
+        buffer = "".join(parts)
+        position = 0
+
+    def next_token() -> str:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\n\r":
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if exhausted:
+                raise json.JSONDecodeError("Unexpected end of recording segment", buffer, position)
+            read(1)
+
+    if next_token() != "[":
+        raise json.JSONDecodeError("Expected a recording segment array", buffer, position)
+    position += 1
+
+    if next_token() == "]":
+        return
+
+    while True:
+        next_token()
+        while True:
+            try:
+                item, end = json.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            else:
+                # Numbers are only complete when followed by a delimiter: a chunk can end
+                # right after a float's `.` or an exponent's `e`, `e+` or `e-`.
+                if exhausted or (
+                    end < len(buffer)
+                    and (buffer[position] not in NUMBER_START or buffer[end] in NUMBER_END)
+                ):
+                    break
+            # Read at least twice the size of the incomplete item so that large items are not
+            # re-parsed once for every chunk.
+            read(max(2 * (len(buffer) - position), STREAM_CHUNK_SIZE))
+
+        yield item
+        position = end
+
+        token = next_token()
+        if token == "]":
+            return
+        elif token != ",":
+            raise json.JSONDecodeError("Expected ',' or ']'", buffer, position)
+        position += 1
+
+
+class RecordingSegmentEvents:
+    """The RRWeb events of a recording segment.
+
+    Iterating decompresses and parses the events incrementally. `size_uncompressed` counts the
+    decompressed bytes read so far, `consume` reads the remainder of the segment without parsing
+    it.
+    """
+
+    def __init__(self, segment_bytes: bytes, chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        self.size_uncompressed = 0
+        self._chunks = self._count(iter_decompressed(segment_bytes, chunk_size))
+
+    def _count(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        for chunk in chunks:
+            self.size_uncompressed += len(chunk)
+            yield chunk
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter_json_array(self._chunks)
+
+    def consume(self) -> None:
+        for _ in self._chunks:
+            pass
+
+
 def _report_size_metrics(
     size_compressed: Optional[int] = None, size_uncompressed: Optional[int] = None
 ) -> None:
@@ -183,22 +316,25 @@ def replay_click_post_processor(
         return None
 
     try:
-        with metrics.timer("replays.usecases.ingest.decompress_and_parse"):
-            decompressed_segment = decompress(segment_bytes)
-            parsed_segment_data = json.loads(decompressed_segment, use_rapid_json=True)
-            _report_size_metrics(len(segment_bytes), len(decompressed_segment))
+        # The segment is decompressed and parsed while the DOM search metadata is extracted,
+        # in a single pass over its events.
+        segment_events = RecordingSegmentEvents(segment_bytes)
 
         # Emit DOM search metadata to Clickhouse.
         with transaction.start_child(
             op="replays.usecases.ingest.parse_and_emit_replay_actions",
             description="parse_and_emit_replay_actions",
-        ):
+        ), metrics.timer("replays.usecases.ingest.decompress_and_parse"):
             parse_and_emit_replay_actions(
                 retention_days=message.retention_days,
                 project_id=message.project_id,
                 replay_id=message.replay_id,
-                segment_data=parsed_segment_data,
+                segment_data=segment_events,
             )
+
+        # Extraction stops early once enough actions were found.
+        segment_events.consume()
+        _report_size_metrics(len(segment_bytes), segment_events.size_uncompressed)
     except Exception:
         logging.exception(
             "Failed to parse recording org={}, project={}, replay={}, segment={}".format(
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import functools
+import itertools
+import threading
 import uuid
 import zlib
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Iterator, List, Optional
+from typing import Deque, Iterator, List, Optional, Tuple
 
 import sentry_sdk
+from cachetools import TTLCache
 from django.db.models import Prefetch
 from sentry_sdk.tracing import Span
 from snuba_sdk import (
@@ -24,11 +28,26 @@ from snuba_sdk import (
     Request,
 )
 
+from sentry import options
 from sentry.models.files.file import File, FileBlobIndex
 from sentry.replays.lib.storage import RecordingSegmentStorageMeta, filestore, storage
 from sentry.replays.models import ReplayRecordingSegment
 from sentry.utils.snuba import raw_snql_query
 
+# Segments are downloaded by this many threads, and at most this many segments are downloaded
+# ahead of the one being streamed to the client.
+DOWNLOAD_WORKERS = 10
+DOWNLOAD_LOOKAHEAD = 20
+
+# Decompressed segments of recently viewed replays can be kept in memory. Deleted segments may be
+# served from the cache for this many seconds.
+SEGMENT_CACHE_TTL = 300
+
+SegmentCacheKey = Tuple[int, str, int]
+
+_segment_cache: Optional[TTLCache[SegmentCacheKey, bytes]] = None
+_segment_cache_lock = threading.Lock()
+
 # METADATA QUERY BEHAVIOR.
 
 
@@ -256,17 +275,28 @@ def download_segments(segments: List[RecordingSegmentStorageMeta]) -> Iterator[b
     )
 
     yield b"["
-    # Map all of the segments to a worker process for download.
-    with ThreadPoolExecutor(max_workers=10) as exe:
-        results = exe.map(download_segment_with_fixed_args, segments)
+    # Segments are yielded in order as soon as they are downloaded. Downloads are only started
+    # a bounded number of segments ahead so slow clients do not buffer the whole replay.
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as exe:
+        remaining = iter(segments)
+        pending: Deque[Future[Optional[bytes]]] = deque(
+            exe.submit(download_segment_with_fixed_args, segment)
+            for segment in itertools.islice(remaining, DOWNLOAD_LOOKAHEAD)
+        )
+
+        while pending:
+            result = pending.popleft().result()
+
+            next_segment = next(remaining, None)
+            if next_segment is not None:
+                pending.append(exe.submit(download_segment_with_fixed_args, next_segment))
 
-        for i, result in enumerate(results):
             if result is None:
                 yield b"[]"
             else:
                 yield result
 
-            if i < len(segments) - 1:
+            if pending:
                 yield b","
     yield b"]"
     transaction.finish()
@@ -283,6 +313,14 @@ def download_segment(
             op="download_segment",
             description="thread_task",
         ):
+            cache = _get_segment_cache()
+            cache_key = (segment.project_id, segment.replay_id, segment.segment_id)
+            if cache is not None:
+                with _segment_cache_lock:
+                    cached = cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
             driver = filestore if segment.file_id else storage
             with sentry_sdk.start_span(
                 op="download_segment",
@@ -296,7 +334,30 @@ def download_segment(
                 op="download_segment",
                 description="decompress",
             ):
-                return decompress(result)
+                result = decompress(result)
+
+            if cache is not None:
+                with _segment_cache_lock:
+                    try:
+                        cache[cache_key] = result
+                    except ValueError:
+                        # The segment is larger than the whole cache.
+                        pass
+            return result
+
+
+def _get_segment_cache() -> Optional[TTLCache[SegmentCacheKey, bytes]]:
+    """Return the cache of recently downloaded segments, or None if it is disabled."""
+    global _segment_cache
+
+    size = options.get("replay.reader.segment-cache-size")
+    if not size:
+        return None
+
+    with _segment_cache_lock:
+        if _segment_cache is None or _segment_cache.maxsize != size:
+            _segment_cache = TTLCache(maxsize=size, ttl=SEGMENT_CACHE_TTL, getsizeof=len)
+        return _segment_cache
 
 
 def decompress(buffer: bytes) -> bytes:
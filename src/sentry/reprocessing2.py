@@ -79,6 +79,7 @@ instead of group deletion is:
 * All reprocessed events are "just" inserted over the old ones.
 """
 
+import functools
 import hashlib
 import logging
 import uuid
@@ -96,6 +97,7 @@ from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.deletions.defaults.group import DIRECT_GROUP_RELATED_MODELS
 from sentry.eventstore.models import Event
 from sentry.eventstore.processing import event_processing_store
+from sentry.grouping.grouphash_cache import schedule_invalidate_grouphash_cache
 from sentry.utils import json, metrics, snuba
 from sentry.utils.cache import cache_key_for_event
 from sentry.utils.dates import to_datetime, to_timestamp
@@ -423,23 +425,14 @@ def buffered_delete_old_primary_hash(
 
 def _copy_attachment_into_cache(attachment_id, attachment, file, cache_key, cache_timeout):
     fp = file.getfile()
-    chunk_index = 0
-    size = 0
-    while True:
-        chunk = fp.read(settings.SENTRY_REPROCESSING_ATTACHMENT_CHUNK_SIZE)
-        if not chunk:
-            break
-
-        size += len(chunk)
-
-        attachment_cache.set_chunk(
-            key=cache_key,
-            id=attachment_id,
-            chunk_index=chunk_index,
-            chunk_data=chunk,
-            timeout=cache_timeout,
-        )
-        chunk_index += 1
+    chunks, size = attachment_cache.set_chunks(
+        key=cache_key,
+        id=attachment_id,
+        chunks=iter(
+            functools.partial(fp.read, settings.SENTRY_REPROCESSING_ATTACHMENT_CHUNK_SIZE), b""
+        ),
+        timeout=cache_timeout,
+    )
 
     assert size == file.size
 
@@ -451,7 +444,7 @@ def _copy_attachment_into_cache(attachment_id, attachment, file, cache_key, cach
         # necessary for processing
         content_type=None,
         type=file.type,
-        chunks=chunk_index,
+        chunks=chunks,
         size=size,
     )
 
@@ -639,6 +632,8 @@ def start_group_reprocessing(
         for model in GROUP_MODELS_TO_MIGRATE:
             model.objects.filter(group_id=group_id).update(group_id=new_group.id)
 
+        schedule_invalidate_grouphash_cache(project_id)
+
     # Get event counts of issue (for all environments etc). This was copypasted
     # and simplified from groupserializer.
     event_count = sync_count = snuba.aliased_query(
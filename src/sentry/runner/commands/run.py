@@ -410,7 +410,7 @@ def cron(**options):
     "--concurrency",
     default=5,
     type=int,
-    help="Thread pool size for post process worker.",
+    help="Number of post process worker lanes. Messages of a group always use the same lane.",
 )
 @click.option(
     "--entity",
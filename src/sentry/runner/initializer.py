@@ -554,6 +554,9 @@ def bind_cache_to_option_store() -> None:
 
     default_store.set_cache_impl(default_cache)
 
+    if settings.SENTRY_OPTIONS_SUBSCRIBE:
+        default_store.subscribe()
+
 
 def apply_legacy_settings(settings: Any) -> None:
     from sentry import options
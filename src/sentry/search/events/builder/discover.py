@@ -77,7 +77,9 @@ from sentry.search.events.types import (
 from sentry.services.hybrid_cloud.user.service import user_service
 from sentry.snuba.dataset import Dataset
 from sentry.snuba.metrics.utils import MetricMeta
+from sentry.utils.cache import cache
 from sentry.utils.dates import outside_retention_with_modified_start, to_timestamp
+from sentry.utils.hashlib import hash_values
 from sentry.utils.snuba import (
     QueryOutsideRetentionError,
     is_duration_measurement,
@@ -90,6 +92,9 @@ from sentry.utils.snuba import (
 )
 from sentry.utils.validators import INVALID_ID_DETAILS, INVALID_SPAN_ID, WILDCARD_NOT_ALLOWED
 
+# How long custom measurements are shared between builders of the same org
+CUSTOM_MEASUREMENT_CACHE_TIMEOUT = 60 * 5
+
 
 class BaseQueryBuilder:
     requires_organization_condition: bool = False
@@ -1019,17 +1024,29 @@ class QueryBuilder(BaseQueryBuilder):
 
         from sentry.snuba.metrics.datasource import get_custom_measurements
 
+        # Custom measurements change rarely, but every builder for the org would
+        # otherwise query for them, so they're shared between builders for a while
+        cache_key = "querybuilder:custom-measurements:{}:{}".format(
+            self.organization_id, hash_values(self.params.project_ids)
+        )
+        result: Optional[List[MetricMeta]] = cache.get(cache_key)
+        if result is not None:
+            return result
+
         try:
-            result: List[MetricMeta] = get_custom_measurements(
-                project_ids=self.params.project_ids,
-                organization_id=self.organization_id,
-                start=datetime.today() - timedelta(days=90),
-                end=datetime.today(),
+            result = list(
+                get_custom_measurements(
+                    project_ids=self.params.project_ids,
+                    organization_id=self.organization_id,
+                    start=datetime.today() - timedelta(days=90),
+                    end=datetime.today(),
+                )
             )
         # Don't fully fail if we can't get the CM, but still capture the exception
         except Exception as error:
             sentry_sdk.capture_exception(error)
             return []
+        cache.set(cache_key, result, CUSTOM_MEASUREMENT_CACHE_TIMEOUT)
         return result
 
     def get_custom_measurement_names_set(self) -> Set[str]:
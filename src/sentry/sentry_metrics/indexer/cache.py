@@ -25,6 +25,15 @@ _INDEXER_CACHE_METRIC = "sentry_metrics.indexer.memcache"
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
 
+# `resolve` is called for every string of every metrics bucket, so it uses
+# buffered counters.
+_resolve_cache_hit = metrics.counter(
+    _INDEXER_CACHE_METRIC, tags={"cache_hit": "true", "caller": "resolve"}
+)
+_resolve_cache_miss = metrics.counter(
+    _INDEXER_CACHE_METRIC, tags={"cache_hit": "false", "caller": "resolve"}
+)
+
 
 class StringIndexerCache:
     def __init__(self, cache_name: str, partition_key: str):
@@ -162,10 +171,10 @@ class CachingIndexer(StringIndexer):
         result = self.cache.get(key)
 
         if result and isinstance(result, int):
-            metrics.incr(_INDEXER_CACHE_METRIC, tags={"cache_hit": "true", "caller": "resolve"})
+            _resolve_cache_hit.incr()
             return result
 
-        metrics.incr(_INDEXER_CACHE_METRIC, tags={"cache_hit": "false", "caller": "resolve"})
+        _resolve_cache_miss.incr()
         id = self.indexer.resolve(use_case_id, org_id, string)
 
         if id is not None:
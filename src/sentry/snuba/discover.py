@@ -95,64 +95,93 @@ def is_real_column(col):
     return True
 
 
-def format_time(data, start, end, rollup, orderby):
-    rv = []
-    start = int(to_naive_timestamp(naiveify_datetime(start)) / rollup) * rollup
-    end = (int(to_naive_timestamp(naiveify_datetime(end)) / rollup) * rollup) + rollup
-    data_by_time = {}
+class TimeseriesBuckets:
+    """
+    The time buckets of a timeseries query.
+
+    Rows are placed into a column with one slot per bucket, from which the
+    (zerofilled) series is read in bucket order. A single instance can be used
+    for all series of a query, e.g. the top events, so that the buckets are
+    only computed once and every distinct timestamp string is only parsed once.
+    """
+
+    def __init__(self, start, end, rollup):
+        self.rollup = rollup
+        self.start = int(to_naive_timestamp(naiveify_datetime(start)) / rollup) * rollup
+        self.end = (int(to_naive_timestamp(naiveify_datetime(end)) / rollup) * rollup) + rollup
+        self.times = range(self.start, self.end, rollup)
+        self._parsed_times: Dict[str, int] = {}
 
-    for obj in data:
+    def parse_time(self, value):
         # This is needed for SnQL, and was originally done in utils.snuba.get_snuba_translators
-        if isinstance(obj["time"], str):
+        if not isinstance(value, str):
+            return value
+
+        parsed = self._parsed_times.get(value)
+        if parsed is None:
             # `datetime.fromisoformat` is new in Python3.7 and before Python3.11, it is not a full
             # ISO 8601 parser. It is only the inverse function of `datetime.isoformat`, which is
             # the format returned by snuba. This is significantly faster when compared to other
             # parsers like `dateutil.parser.parse` and `datetime.strptime`.
-            obj["time"] = int(to_timestamp(datetime.fromisoformat(obj["time"])))
-        if obj["time"] in data_by_time:
-            data_by_time[obj["time"]].append(obj)
-        else:
-            data_by_time[obj["time"]] = [obj]
+            parsed = self._parsed_times[value] = int(to_timestamp(datetime.fromisoformat(value)))
+        return parsed
+
+    def column(self, data):
+        """
+        Returns a list with the rows of every bucket, or `None` for empty
+        buckets. Rows outside of the buckets or not aligned to them are
+        dropped.
+        """
+        column: List[Optional[List[Any]]] = [None] * len(self.times)
+
+        for obj in data:
+            obj["time"] = time = self.parse_time(obj["time"])
+            if not isinstance(time, (int, float)):
+                continue
+
+            offset, remainder = divmod(time - self.start, self.rollup)
+            if remainder or not 0 <= offset < len(column):
+                continue
+
+            rows = column[int(offset)]
+            if rows is None:
+                column[int(offset)] = [obj]
+            else:
+                rows.append(obj)
 
-    for key in range(start, end, rollup):
-        if key in data_by_time and len(data_by_time[key]) > 0:
-            rv.extend(data_by_time[key])
+        return column
 
-    if "-time" in orderby:
-        return list(reversed(rv))
+    def format_time(self, data, orderby):
+        rv = []
+        for rows in self.column(data):
+            if rows:
+                rv.extend(rows)
 
-    return rv
+        if "-time" in orderby:
+            return list(reversed(rv))
 
+        return rv
 
-def zerofill(data, start, end, rollup, orderby):
-    rv = []
-    start = int(to_naive_timestamp(naiveify_datetime(start)) / rollup) * rollup
-    end = (int(to_naive_timestamp(naiveify_datetime(end)) / rollup) * rollup) + rollup
-    data_by_time = {}
+    def zerofill(self, data, orderby):
+        rv = []
+        for time, rows in zip(self.times, self.column(data)):
+            if rows:
+                rv.extend(rows)
+            else:
+                rv.append({"time": time})
 
-    for obj in data:
-        # This is needed for SnQL, and was originally done in utils.snuba.get_snuba_translators
-        if isinstance(obj["time"], str):
-            # `datetime.fromisoformat` is new in Python3.7 and before Python3.11, it is not a full
-            # ISO 8601 parser. It is only the inverse function of `datetime.isoformat`, which is
-            # the format returned by snuba. This is significantly faster when compared to other
-            # parsers like `dateutil.parser.parse` and `datetime.strptime`.
-            obj["time"] = int(to_timestamp(datetime.fromisoformat(obj["time"])))
-        if obj["time"] in data_by_time:
-            data_by_time[obj["time"]].append(obj)
-        else:
-            data_by_time[obj["time"]] = [obj]
+        if "-time" in orderby:
+            return list(reversed(rv))
+
+        return rv
 
-    for key in range(start, end, rollup):
-        if key in data_by_time and len(data_by_time[key]) > 0:
-            rv.extend(data_by_time[key])
-        else:
-            rv.append({"time": key})
 
-    if "-time" in orderby:
-        return list(reversed(rv))
+def format_time(data, start, end, rollup, orderby):
+    return TimeseriesBuckets(start, end, rollup).format_time(data, orderby)
 
-    return rv
+
+def zerofill(data, start, end, rollup, orderby):
+    return TimeseriesBuckets(start, end, rollup).zerofill(data, orderby)
 
 
 def transform_tips(tips):
@@ -524,10 +553,11 @@ def top_events_timeseries(
                     "discover.top-events.timeseries.key-mismatch",
                     extra={"result_key": result_key, "top_event_keys": list(results.keys())},
                 )
+        buckets = TimeseriesBuckets(params["start"], params["end"], rollup)
         for key, item in results.items():
             results[key] = SnubaTSResult(
                 {
-                    "data": zerofill(item["data"], params["start"], params["end"], rollup, "time")
+                    "data": buckets.zerofill(item["data"], "time")
                     if zerofill_results
                     else item["data"],
                     "order": item["order"],
@@ -1,6 +1,7 @@
+import functools
 import re
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional, Sequence, TypedDict, Union
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypedDict, Union
 from urllib.parse import urlparse
 
 from sentry.spans.grouping.utils import Hash, parse_fingerprint_var
@@ -25,24 +26,52 @@ class Span(TypedDict):
 # should return `None` to indicate that the strategy should not be used
 # and to try a different strategy. If the strategy does apply, it should
 # return a list of strings that will serve as the span fingerprint.
+#
+# Strategies may only look at the `op` and `description` of the span, as
+# their results are memoized on those two values.
 CallableStrategy = Callable[[Span], Optional[Sequence[str]]]
 
+# The number of (op, description) pairs whose default fingerprint is
+# memoized per strategy. Spans of a transaction repeat the same few queries
+# and requests, so this is shared across spans and events.
+DEFAULT_FINGERPRINT_CACHE_SIZE = 4096
+
 
 @dataclass(frozen=True)
 class SpanGroupingStrategy:
     name: str
     # The strategies to use with the default fingerprint
     strategies: Sequence[CallableStrategy]
+    _default_fingerprint_cache: Callable[[Optional[str], Optional[str]], Tuple[str, ...]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_default_fingerprint_cache",
+            functools.lru_cache(maxsize=DEFAULT_FINGERPRINT_CACHE_SIZE)(
+                self._compute_default_fingerprint
+            ),
+        )
 
     def execute(self, event_data: Any) -> Dict[str, str]:
-        spans = event_data.get("spans", [])
-        span_groups = {span["span_id"]: self.get_span_group(span) for span in spans}
+        return self.execute_many([event_data])[0]
+
+    def execute_many(self, events_data: Sequence[Any]) -> List[Dict[str, str]]:
+        results = []
+
+        for event_data in events_data:
+            spans = event_data.get("spans", [])
+            span_groups = {span["span_id"]: self.get_span_group(span) for span in spans}
+
+            # make sure to get the group id for the transaction root span
+            span_id = event_data["contexts"]["trace"]["span_id"]
+            span_groups[span_id] = self.get_transaction_span_group(event_data)
 
-        # make sure to get the group id for the transaction root span
-        span_id = event_data["contexts"]["trace"]["span_id"]
-        span_groups[span_id] = self.get_transaction_span_group(event_data)
+            results.append(span_groups)
 
-        return span_groups
+        return results
 
     def get_transaction_span_group(self, event_data: Any) -> str:
         result = Hash()
@@ -66,6 +95,18 @@ class SpanGroupingStrategy:
         return result.hexdigest()
 
     def handle_default_fingerprint(self, span: Span) -> Sequence[str]:
+        op = span.get("op")
+        description = span.get("description")
+        try:
+            return self._default_fingerprint_cache(op, description)
+        except TypeError:
+            # malformed spans with unhashable values cannot be memoized
+            return self._compute_default_fingerprint(op, description)
+
+    def _compute_default_fingerprint(
+        self, op: Optional[str], description: Optional[str]
+    ) -> Tuple[str, ...]:
+        span: Span = {"op": op, "description": description}  # type: ignore[typeddict-item]
         span_group = None
 
         # Try using all of the strategies in order to generate
@@ -81,7 +122,7 @@ class SpanGroupingStrategy:
         if span_group is None:
             span_group = raw_description_strategy(span)
 
-        return span_group
+        return tuple(span_group)
 
 
 def span_op(op_name: Union[str, Sequence[str]]) -> Callable[[CallableStrategy], CallableStrategy]:
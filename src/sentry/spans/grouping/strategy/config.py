@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Dict, Sequence
+from typing import Any, Dict, List, Optional, Sequence
 
 from sentry.spans.grouping.result import SpanGroupingResults
 from sentry.spans.grouping.strategy.base import (
@@ -29,6 +29,24 @@ class SpanGroupingConfig:
         results = self.strategy.execute(event_data)
         return SpanGroupingResults(self.id, results)
 
+    def execute_strategy_many(self, events_data: Sequence[Any]) -> List[SpanGroupingResults]:
+        grouping_results: List[Optional[SpanGroupingResults]] = []
+        pending = []
+
+        for event_data in events_data:
+            existing_results = SpanGroupingResults.from_event(event_data)
+            if existing_results is not None and existing_results.id == self.id:
+                grouping_results.append(existing_results)
+            else:
+                grouping_results.append(None)
+                pending.append(event_data)
+
+        computed = iter(self.strategy.execute_many(pending))
+        return [
+            result if result is not None else SpanGroupingResults(self.id, next(computed))
+            for result in grouping_results
+        ]
+
 
 CONFIGURATIONS: Dict[str, SpanGroupingConfig] = {}
 
@@ -122,38 +122,17 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
         # it could be possible that refrequent invalidations cause the task to take excessive time
         # to complete.
         for organization in Organization.objects.filter(id=organization_id):
+            # Sections which only depend on the organization are computed once and
+            # shared by all projects.
+            org_sections = {}
             for project in Project.objects.filter(organization_id=organization_id):
                 project.set_cached_field_value("organization", organization)
-                for key in ProjectKey.objects.filter(project_id=project.id):
-                    key.set_cached_field_value("project", project)
-                    # If we find the config in the cache it means it was active.  As such we want to
-                    # recalculate it.  If the config was not there at all, we leave it and avoid the
-                    # cost of re-computation.
-                    if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
-                        action = "recompute"
-                    else:
-                        action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "organization"},
-                    )
+                configs.update(
+                    _compute_cached_project_configs(project, "organization", org_sections)
+                )
     elif project_id:
         for project in Project.objects.filter(id=project_id):
-            for key in ProjectKey.objects.filter(project_id=project_id):
-                key.set_cached_field_value("project", project)
-                # If we find the config in the cache it means it was active.  As such we want to
-                # recalculate it.  If the config was not there at all, we leave it and avoid the
-                # cost of re-computation.
-                if projectconfig_cache.backend.get(key.public_key) is not None:
-                    configs[key.public_key] = compute_projectkey_config(key)
-                    action = "recompute"
-                else:
-                    action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "project"},
-                    )
+            configs.update(_compute_cached_project_configs(project, "project"))
     elif public_key:
         try:
             key = ProjectKey.objects.get(public_key=public_key)
@@ -176,6 +155,44 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
+def _compute_cached_project_configs(project, scope, org_sections=None):
+    """Recomputes the configs of all keys of a project which are currently cached.
+
+    If we find the config in the cache it means it was active.  As such we want to
+    recalculate it.  If the config was not there at all, we leave it and avoid the cost of
+    re-computation.  Sections of the config that do not depend on the key are computed
+    only once for the project.
+    """
+    from sentry.models import ProjectKey, ProjectKeyStatus
+    from sentry.relay.config import get_project_configs_for_keys
+
+    active_keys = []
+    configs = {}
+    for key in ProjectKey.objects.filter(project_id=project.id):
+        key.set_cached_field_value("project", project)
+        if projectconfig_cache.backend.get(key.public_key) is None:
+            action = "not-cached"
+        elif key.status != ProjectKeyStatus.ACTIVE:
+            configs[key.public_key] = {"disabled": True}
+            action = "recompute"
+        else:
+            active_keys.append(key)
+            action = "recompute"
+        metrics.incr(
+            "relay.projectconfig_cache.invalidation.recompute",
+            tags={"action": action, "scope": scope},
+        )
+
+    if active_keys:
+        project_configs = get_project_configs_for_keys(
+            project, active_keys, full_config=True, org_sections=org_sections
+        )
+        for public_key, config in project_configs.items():
+            configs[public_key] = config.to_dict()
+
+    return configs
+
+
 def compute_projectkey_config(key):
     """Computes a single config for the given :class:`ProjectKey`.
 
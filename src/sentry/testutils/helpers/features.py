@@ -55,6 +55,7 @@ def Feature(names):
 
     default_features = sentry.features.has
     default_batch_has = sentry.features.batch_has
+    default_evaluate = sentry.features.evaluate
 
     def resolve_feature_name_value_for_org(organization, feature_name_value):
         if isinstance(feature_name_value, list):
@@ -119,11 +120,24 @@ def Feature(names):
             }
             return {result_key: results}
 
+    def evaluate_override(organization, projects=(), actor=None, feature_names=None):
+        snapshot = default_evaluate(
+            organization, projects, actor=actor, feature_names=feature_names
+        )
+        return snapshot.override(
+            {
+                name: resolve_feature_name_value_for_org(organization, value)
+                for name, value in names.items()
+            }
+        )
+
     with patch("sentry.features.has") as features_has:
         features_has.side_effect = features_override
         with patch("sentry.features.batch_has") as features_batch_has:
             features_batch_has.side_effect = batch_features_override
-            yield
+            with patch("sentry.features.evaluate") as features_evaluate:
+                features_evaluate.side_effect = evaluate_override
+                yield
 
 
 def with_feature(feature):
@@ -42,6 +42,20 @@ requires_not_arm64 = pytest.mark.skipif(
 )
 
 
+def benchmark_is_available() -> bool:
+    try:
+        import pytest_benchmark  # NOQA
+    except ImportError:
+        return False
+    else:
+        return True
+
+
+requires_benchmark = pytest.mark.skipif(
+    not benchmark_is_available(), reason="requires pytest-benchmark"
+)
+
+
 def xfail_if_not_postgres(reason: str) -> Callable[[T], T]:
     def decorator(function: T) -> T:
         return pytest.mark.xfail(os.environ.get("TEST_SUITE") != "postgres", reason=reason)(
@@ -4,9 +4,20 @@ from __future__ import annotations
 
 import datetime
 import decimal
+import re
 import uuid
 from enum import Enum
-from typing import IO, TYPE_CHECKING, Any, Generator, Mapping, NoReturn, TypeVar, overload
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generator,
+    Mapping,
+    NoReturn,
+    TypeVar,
+    overload,
+)
 
 import rapidjson
 import sentry_sdk
@@ -106,6 +117,155 @@ _default_escaped_encoder = JSONEncoderForHTML(
     default=better_default_encoder,
 )
 
+# rapidjson writes the hex digits of \u escapes in uppercase, simplejson in
+# lowercase. Escaped backslashes are matched too so that the text following
+# them is not mistaken for an escape.
+_UNICODE_ESCAPE_RE = re.compile(r"\\\\|\\u[0-9a-fA-F]{4}")
+
+
+def _float_types_with_repr() -> tuple[type, ...]:
+    """
+    Returns the subclasses of float that override ``__repr__``, such as float
+    enums. rapidjson encodes floats with ``repr``, simplejson with
+    ``float.__repr__``.
+    """
+    rv = []
+    subclasses = float.__subclasses__()
+    while subclasses:
+        cls = subclasses.pop()
+        if cls.__repr__ is not float.__repr__:
+            rv.append(cls)
+        subclasses.extend(cls.__subclasses__())
+    return tuple(rv)
+
+
+def _contains_instance(o: object, types: tuple[type, ...]) -> bool:
+    seen = set()
+    stack = [o]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, types):
+            return True
+        if isinstance(o, (dict, list, tuple, set, frozenset)):
+            if id(o) in seen:
+                continue
+            seen.add(id(o))
+            stack.extend(o.values() if isinstance(o, dict) else o)
+    return False
+
+
+class _RapidJSONEncoder(rapidjson.Encoder):
+    fallback_default: Callable[[object], object]
+
+    def default(self, o: object) -> object:
+        if isinstance(o, bytes):
+            # Not left to rapidjson, which also encodes bytearrays.
+            return o.decode("utf-8")
+        # simplejson encodes anything with an `_asdict` method, such as
+        # namedtuples, as an object.
+        asdict = getattr(o, "_asdict", None)
+        if callable(asdict):
+            rv = asdict()
+        elif isinstance(o, tuple):
+            rv = list(o)
+        else:
+            rv = self.fallback_default(o)
+        float_types = _float_types_with_repr()
+        if float_types and _contains_instance(rv, float_types):
+            raise TypeError("Values of float subclasses are encoded by simplejson")
+        return rv
+
+
+class RapidJSONEncoder:
+    """
+    Encodes values exactly like ``encoder``, a simplejson ``JSONEncoder``, but
+    with rapidjson. Values that rapidjson cannot encode the same way, such as
+    dictionaries with non-string keys, NaN with ``ignore_nan``, floats with a
+    custom ``repr`` or, with ``sort_keys``, keys containing NUL, are encoded by
+    ``encoder`` itself.
+    """
+
+    def __init__(self, encoder: JSONEncoder) -> None:
+        if (
+            encoder.indent is not None
+            or encoder.item_separator != ","
+            or encoder.key_separator != ":"
+            or not encoder.ensure_ascii
+            or encoder.skipkeys
+            or encoder.item_sort_key is not None
+            or encoder.for_json
+            or encoder.bigint_as_string
+            or encoder.int_as_string_bitcount is not None
+            or encoder.iterable_as_array
+            or not encoder.tuple_as_array
+            or not encoder.namedtuple_as_object
+        ):
+            raise ValueError("Only compact, ASCII-only JSON encoders are supported")
+
+        number_mode = rapidjson.NM_NONE
+        if encoder.use_decimal:
+            number_mode |= rapidjson.NM_DECIMAL
+        if encoder.allow_nan and not encoder.ignore_nan:
+            number_mode |= rapidjson.NM_NAN
+
+        mapping_mode = rapidjson.MM_ONLY_DICTS
+        if encoder.sort_keys:
+            mapping_mode |= rapidjson.MM_SORT_KEYS
+
+        self.fallback = encoder
+        self.sort_keys = encoder.sort_keys
+        self.html_safe = isinstance(encoder, JSONEncoderForHTML)
+        self._encoder = _RapidJSONEncoder(
+            ensure_ascii=True,
+            write_mode=rapidjson.WM_COMPACT,
+            number_mode=number_mode,
+            datetime_mode=rapidjson.DM_NONE,
+            # `better_default_encoder` encodes UUIDs as their hex, which rapidjson
+            # can do natively.
+            uuid_mode=(
+                rapidjson.UM_HEX if encoder.default is better_default_encoder else rapidjson.UM_NONE
+            ),
+            bytes_mode=rapidjson.BM_NONE,
+            iterable_mode=rapidjson.IM_ONLY_LISTS,
+            mapping_mode=mapping_mode,
+        )
+        self._encoder.fallback_default = encoder.default
+
+    def encode(self, o: object) -> str:
+        float_types = _float_types_with_repr()
+        if float_types and _contains_instance(o, float_types):
+            return self.fallback.encode(o)
+
+        try:
+            rv: str = self._encoder(o)
+        except (TypeError, ValueError, OverflowError, RecursionError):
+            return self.fallback.encode(o)
+
+        if self.sort_keys and "\\u0000" in rv:
+            # rapidjson compares keys as C strings, which end at the first NUL.
+            return self.fallback.encode(o)
+        if "\\u" in rv:
+            rv = _UNICODE_ESCAPE_RE.sub(lambda match: match.group(0).lower(), rv)
+        if "\x7f" in rv:
+            # simplejson escapes DEL, rapidjson considers it printable ASCII
+            rv = rv.replace("\x7f", "\\u007f")
+        if self.html_safe:
+            rv = (
+                rv.replace("&", "\\u0026")
+                .replace("<", "\\u003c")
+                .replace(">", "\\u003e")
+                .replace("'", "\\u0027")
+            )
+        return rv
+
+    def encode_bytes(self, o: object) -> bytes:
+        # The output is ASCII-only, so this is a plain copy.
+        return self.encode(o).encode("ascii")
+
+
+_rapid_default_encoder = RapidJSONEncoder(_default_encoder)
+_rapid_escaped_encoder = RapidJSONEncoder(_default_escaped_encoder)
+
 
 JSONData = Any  # https://github.com/python/typing/issues/182
 
@@ -117,13 +277,28 @@ def dump(value: JSONData, fp: IO[str], **kwargs: NoReturn) -> None:
 
 
 # NoReturn here is to make this a mypy error to pass kwargs, since they are currently silently dropped
-def dumps(value: JSONData, escape: bool = False, **kwargs: NoReturn) -> str:
+def dumps(
+    value: JSONData, escape: bool = False, use_rapid_json: bool = False, **kwargs: NoReturn
+) -> str:
     # Legacy use. Do not use. Use dumps_htmlsafe
     if escape:
+        if use_rapid_json is True:
+            return _rapid_escaped_encoder.encode(value)
         return _default_escaped_encoder.encode(value)
+    if use_rapid_json is True:
+        return _rapid_default_encoder.encode(value)
     return _default_encoder.encode(value)
 
 
+# NoReturn here is to make this a mypy error to pass kwargs, since they are currently silently dropped
+def dumps_bytes(value: JSONData, **kwargs: NoReturn) -> bytes:
+    """
+    Encodes like `dumps`, but with rapidjson and to bytes, for payloads that
+    are written to Kafka or storage anyway.
+    """
+    return _rapid_default_encoder.encode_bytes(value)
+
+
 # NoReturn here is to make this a mypy error to pass kwargs, since they are currently silently dropped
 def load(fp: IO[str] | IO[bytes], **kwargs: NoReturn) -> JSONData:
     return loads(fp.read())
@@ -138,6 +313,15 @@ def loads(value: str | bytes, use_rapid_json: bool = False, **kwargs: NoReturn)
             return _default_decoder.decode(value)
 
 
+def raw_decode(value: str, idx: int = 0) -> tuple[JSONData, int]:
+    """
+    Decodes the JSON document that starts at ``idx`` in ``value`` and returns
+    it together with the index at which it ends. Data after the document is
+    ignored.
+    """
+    return _default_decoder.raw_decode(value, idx)
+
+
 def dumps_htmlsafe(value: object) -> SafeString:
     return mark_safe(_default_escaped_encoder.encode(value))
 
@@ -173,10 +357,13 @@ __all__ = (
     "JSONData",
     "JSONDecodeError",
     "JSONEncoder",
+    "RapidJSONEncoder",
     "dump",
     "dumps",
+    "dumps_bytes",
     "dumps_htmlsafe",
     "load",
     "loads",
     "prune_empty_keys",
+    "raw_decode",
 )
@@ -1,14 +1,29 @@
 __all__ = ["timing", "incr"]
 
 
+import atexit
 import functools
 import logging
+import os
+import threading
 import time
 from contextlib import contextmanager
 from queue import Queue
 from random import random
 from threading import Thread
-from typing import Any, Callable, Generator, Optional, Tuple, Type, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from django.conf import settings
 
@@ -27,6 +42,10 @@ __all__ = [
     "gauge",
     "backend",
     "MutableTags",
+    "counter",
+    "distribution",
+    "flush_buffered",
+    "sampled_wraps",
 ]
 
 
@@ -166,6 +185,22 @@ def timing(
         logger.exception("Unable to record backend metric")
 
 
+def _presampled_timing(
+    key: str,
+    value: Union[int, float],
+    instance: Optional[str],
+    tags: Optional[Tags],
+    sample_rate: float,
+) -> None:
+    # The sampling decision was already made by the caller, so the backend
+    # must only report the sample rate and not sample again.
+    try:
+        backend.presampled_timing(key, value, instance, tags, sample_rate)
+    except Exception:
+        logger = logging.getLogger("sentry.errors")
+        logger.exception("Unable to record backend metric")
+
+
 @contextmanager
 def timer(
     key: str,
@@ -201,3 +236,283 @@ def wraps(
         return inner  # type: ignore
 
     return wrapper
+
+
+def sampled_wraps(
+    key: str,
+    sample_rate: float,
+    instance: Optional[str] = None,
+    tags: Optional[Tags] = None,
+) -> Callable[[F], F]:
+    """
+    Like `wraps`, but only times a ``sample_rate`` fraction of invocations.
+
+    The sampling decision is made before anything is measured or allocated, so
+    the remaining invocations only pay for a random number. This makes it
+    suitable for fine-grained timing of functions on hot paths. Sampled timings
+    are sent with their sample rate, which the backend reports without sampling
+    them again.
+    """
+
+    def wrapper(f: F) -> F:
+        @functools.wraps(f)
+        def inner(*args: Any, **kwargs: Any) -> Any:
+            if not _should_sample(sample_rate):
+                return f(*args, **kwargs)
+            start = time.monotonic()
+            current_tags: MutableTags = dict(tags or ())
+            try:
+                rv = f(*args, **kwargs)
+            except Exception:
+                current_tags["result"] = "failure"
+                raise
+            else:
+                current_tags["result"] = "success"
+                return rv
+            finally:
+                _presampled_timing(
+                    key, time.monotonic() - start, instance, current_tags, sample_rate
+                )
+
+        return inner  # type: ignore
+
+    return wrapper
+
+
+# How often, in seconds, a thread's buffered metrics are sent to the backend.
+BUFFER_FLUSH_INTERVAL = 1.0
+
+
+class _ThreadBuffer:
+    """
+    The buffered metrics of one thread. The thread flushes its buffer when it
+    records values, the background flusher drains buffers that were left idle.
+    """
+
+    __slots__ = ("counters", "distributions", "last_flush", "lock", "thread")
+
+    def __init__(self) -> None:
+        self.counters: Dict[BufferedCounter, Union[int, float]] = {}
+        self.distributions: Dict[BufferedDistribution, List[float]] = {}
+        self.last_flush = time.monotonic()
+        # Reentrant, in case a backend records buffered metrics while sending.
+        self.lock = threading.RLock()
+        self.thread = threading.current_thread()
+
+    def maybe_flush(self) -> None:
+        if time.monotonic() - self.last_flush >= BUFFER_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        # The lock is held while sending so that a concurrent flush only
+        # returns once the values it raced for were sent.
+        with self.lock:
+            counters, self.counters = self.counters, {}
+            distributions, self.distributions = self.distributions, {}
+            self.last_flush = time.monotonic()
+
+            for counter_handle, amount in counters.items():
+                counter_handle._flush(amount)
+            for distribution_handle, values in distributions.items():
+                distribution_handle._flush(values)
+
+
+class _LocalBuffer(threading.local):
+    buffer: Optional[_ThreadBuffer] = None
+
+
+_local = _LocalBuffer()
+_buffers_lock = threading.Lock()
+_buffers: List[_ThreadBuffer] = []
+_flusher_pid: Optional[int] = None
+_handles_lock = threading.Lock()
+_handles: Dict[Tuple[str, str, Optional[str], FrozenSet[Tuple[str, Any]]], Any] = {}
+
+
+def _get_buffer() -> _ThreadBuffer:
+    buf = _local.buffer
+    if buf is None:
+        buf = _local.buffer = _ThreadBuffer()
+        with _buffers_lock:
+            _buffers.append(buf)
+        _ensure_flusher()
+    return buf
+
+
+def _ensure_flusher() -> None:
+    # Threads don't survive a fork, so every process starts its own flusher.
+    global _flusher_pid
+    pid = os.getpid()
+    if _flusher_pid == pid:
+        return
+    with _buffers_lock:
+        if _flusher_pid == pid:
+            return
+        _flusher_pid = pid
+
+    def flusher() -> None:
+        while True:
+            time.sleep(BUFFER_FLUSH_INTERVAL)
+            try:
+                _flush_idle_buffers()
+            except Exception:
+                logger = logging.getLogger("sentry.errors")
+                logger.exception("Unable to flush buffered metrics")
+
+    t = Thread(target=flusher, name="sentry.utils.metrics.flusher")
+    t.daemon = True
+    t.start()
+
+
+def _flush_idle_buffers() -> None:
+    """
+    Sends the buffered metrics of threads that haven't flushed within the flush
+    interval, and of threads that exited, from the calling thread.
+    """
+    with _buffers_lock:
+        buffers = list(_buffers)
+        _buffers[:] = [buf for buf in buffers if buf.thread.is_alive()]
+
+    now = time.monotonic()
+    for buf in buffers:
+        if now - buf.last_flush >= BUFFER_FLUSH_INTERVAL or not buf.thread.is_alive():
+            buf.flush()
+
+
+def _flush_all_buffers() -> None:
+    with _buffers_lock:
+        buffers = list(_buffers)
+    for buf in buffers:
+        buf.flush()
+
+
+class BufferedCounter:
+    """
+    An interned counter with precomputed tags whose increments are summed in a
+    per-thread buffer and sent to the backend on an interval.
+
+    Create instances with `counter`, ideally once at import time.
+    """
+
+    __slots__ = ("key", "instance", "tags")
+
+    def __init__(self, key: str, instance: Optional[str], tags: Optional[Tags]) -> None:
+        self.key = key
+        self.instance = instance
+        self.tags = tags
+
+    def incr(self, amount: Union[int, float] = 1) -> None:
+        buf = _get_buffer()
+        with buf.lock:
+            counters = buf.counters
+            counters[self] = counters.get(self, 0) + amount
+        buf.maybe_flush()
+
+    def _flush(self, amount: Union[int, float]) -> None:
+        incr(self.key, amount, self.instance, self.tags, sample_rate=1.0)
+
+
+class BufferedDistribution:
+    """
+    An interned timing/distribution with precomputed tags. The sampling
+    decision is made when a value is recorded, sampled values are buffered per
+    thread and sent to the backend on an interval.
+
+    Create instances with `distribution`, ideally once at import time.
+    """
+
+    __slots__ = ("key", "instance", "tags", "sample_rate")
+
+    def __init__(
+        self, key: str, instance: Optional[str], tags: Optional[Tags], sample_rate: float
+    ) -> None:
+        self.key = key
+        self.instance = instance
+        self.tags = tags
+        self.sample_rate = sample_rate
+
+    def record(self, value: float) -> None:
+        if not _should_sample(self.sample_rate):
+            return
+        buf = _get_buffer()
+        with buf.lock:
+            distributions = buf.distributions
+            values = distributions.get(self)
+            if values is None:
+                values = distributions[self] = []
+            values.append(value)
+        buf.maybe_flush()
+
+    @contextmanager
+    def time(self) -> Generator[None, None, None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(time.monotonic() - start)
+
+    def _flush(self, values: List[float]) -> None:
+        for value in values:
+            _presampled_timing(self.key, value, self.instance, self.tags, self.sample_rate)
+
+
+def _intern(
+    kind: str, key: str, instance: Optional[str], tags: Optional[Tags], factory: Any
+) -> Any:
+    handle_key = (kind, key, instance, frozenset((tags or {}).items()))
+    handle = _handles.get(handle_key)
+    if handle is None:
+        with _handles_lock:
+            handle = _handles.get(handle_key)
+            if handle is None:
+                handle = _handles[handle_key] = factory()
+    return handle
+
+
+def counter(
+    key: str, instance: Optional[str] = None, tags: Optional[Tags] = None
+) -> BufferedCounter:
+    """
+    Returns the interned `BufferedCounter` for the given key and tags.
+
+    Global tags are applied when the buffer is flushed, from the thread that
+    recorded the values. Values of idle threads are sent by the background
+    flusher, with the tags added for all threads only.
+    """
+    return _intern(  # type: ignore[no-any-return]
+        "counter", key, instance, tags, lambda: BufferedCounter(key, instance, dict(tags or {}))
+    )
+
+
+def distribution(
+    key: str,
+    instance: Optional[str] = None,
+    tags: Optional[Tags] = None,
+    sample_rate: float = settings.SENTRY_METRICS_SAMPLE_RATE,
+) -> BufferedDistribution:
+    """
+    Returns the interned `BufferedDistribution` for the given key and tags.
+
+    Global tags are applied when the buffer is flushed, from the thread that
+    recorded the values. Values of idle threads are sent by the background
+    flusher, with the tags added for all threads only.
+    """
+    return _intern(  # type: ignore[no-any-return]
+        f"distribution:{sample_rate}",
+        key,
+        instance,
+        tags,
+        lambda: BufferedDistribution(key, instance, dict(tags or {}), sample_rate),
+    )
+
+
+def flush_buffered() -> None:
+    """
+    Sends the current thread's buffered metrics to the backend, e.g. at the end
+    of a batch of work. Metrics left in the buffers of idle or exited threads
+    are sent by a background flusher, and all buffers are flushed at exit.
+    """
+    _get_buffer().flush()
+
+
+atexit.register(_flush_all_buffers)
@@ -1,5 +1,6 @@
 import logging
-from typing import Any, Mapping, MutableMapping, Optional, Sequence, Union
+from itertools import chain
+from typing import Any, List, Mapping, MutableMapping, Optional, Sequence, Set, Tuple, Union
 
 import sentry_sdk
 from django.conf import settings
@@ -44,6 +45,210 @@ def safe_execute(func, *args, **kwargs):
         return result
 
 
+_CONTAINER_TYPES = frozenset((dict, list, tuple))
+_SCALAR_TYPES = frozenset((int, float, bool, type(None)))
+
+# Minimum repr length of a subtree before ``trim`` considers measuring it
+# bottom-up, see ``_Trimmer``.
+BOTTOM_UP_MEASURE_MIN_LEN = 4096
+
+
+def _str_repr_len(value: str) -> int:
+    """
+    Returns ``len(repr(value))`` for a string, without building the repr for
+    the common case of printable strings that need no escaping.
+    """
+    if value.isprintable() and "\\" not in value and not ("'" in value and '"' in value):
+        return len(value) + 2
+    return len(repr(value))
+
+
+def _leaf_lens(value: Any) -> Tuple[int, int]:
+    """
+    Returns ``(len(force_str(value)), len(repr(value)))`` for a value that is
+    not traversed by ``trim``.
+    """
+    if type(value) is str:
+        return len(value), _str_repr_len(value)
+    if type(value) in _SCALAR_TYPES:
+        length = len(repr(value))
+        return length, length
+    return len(force_str(value)), len(repr(value))
+
+
+def _is_flat(value: Any) -> bool:
+    """
+    Returns whether a dict, list or tuple contains no other dicts, lists or
+    tuples.
+    """
+    if type(value) is dict and not _CONTAINER_TYPES.isdisjoint(map(type, value.values())):
+        return False
+    return _CONTAINER_TYPES.isdisjoint(map(type, value))
+
+
+def _container_repr_len(value: Any, item_lens: Sequence[int]) -> int:
+    # ``item_lens`` holds the repr lengths of the items, or of the key and the
+    # value for every dict item.
+    count = len(value)
+    if count == 0:
+        return 2
+    if type(value) is tuple and count == 1:
+        return item_lens[0] + 3
+    separators = 2 * (count - 1) + (2 * count if type(value) is dict else 0)
+    return sum(item_lens) + separators + 2
+
+
+class _Trimmer:
+    """
+    Implements ``trim`` in a single traversal of the input.
+
+    Budgets are measured in ``len(force_str(...))``, which for dicts, lists and
+    tuples is the length of their repr. The lengths of trimmed values are
+    accumulated while they are built rather than by stringifying them again,
+    and the repr lengths of the input are memoized by ``id``.
+
+    Dict items are ordered by length, so the children of every visited dict
+    need measuring. This is done with ``repr``, which is the fastest way to
+    measure a subtree once, but in deeply nested payloads where one child makes
+    up most of its parent on every level, the same data would be stringified
+    again on each of them. Once that is detected, the large child is measured
+    bottom-up instead, which memoizes the lengths of everything below it.
+    """
+
+    def __init__(self, max_size: int, max_depth: int, object_hook: Any) -> None:
+        self.max_size = max_size
+        self.max_depth = max_depth
+        self.object_hook = object_hook
+        # repr lengths of the containers of the input, by ``id``.
+        self._repr_lens: MutableMapping[int, int] = {}
+        # Containers whose items' repr lengths are memoized as well.
+        self._measured_bottom_up: Set[int] = set()
+
+    def _repr_len(self, value: Any) -> int:
+        if type(value) not in _CONTAINER_TYPES:
+            return _leaf_lens(value)[1]
+        length = self._repr_lens.get(id(value))
+        if length is None:
+            length = self._repr_lens[id(value)] = len(repr(value))
+        return length
+
+    def _str_len(self, value: Any) -> int:
+        if isinstance(value, str):
+            return len(value)
+        if type(value) in _CONTAINER_TYPES:
+            return self._repr_len(value)
+        return len(force_str(value))
+
+    def _measure_bottom_up(self, value: Any) -> None:
+        repr_lens = self._repr_lens
+        measured_bottom_up = self._measured_bottom_up
+
+        # Iterative post-order traversal, so that deeply nested input does not
+        # exhaust the stack any earlier than ``repr`` would.
+        stack: List[Tuple[Any, Optional[Sequence[Any]]]] = [(value, None)]
+        while stack:
+            node, parts = stack.pop()
+            if parts is not None:
+                repr_lens[id(node)] = _container_repr_len(
+                    node,
+                    [
+                        repr_lens[id(part)] if type(part) in _CONTAINER_TYPES else len(repr(part))
+                        for part in parts
+                    ],
+                )
+                continue
+
+            # Placeholder for self-references, which ``repr`` renders as ``[...]``.
+            repr_lens[id(node)] = 5
+            measured_bottom_up.add(id(node))
+            parts = list(chain.from_iterable(node.items())) if type(node) is dict else node
+            stack.append((node, parts))
+            for part in parts:
+                if type(part) not in _CONTAINER_TYPES or id(part) in repr_lens:
+                    continue
+                if _is_flat(part):
+                    # Containers of plain values are measured in one go.
+                    repr_lens[id(part)] = len(repr(part))
+                else:
+                    stack.append((part, None))
+
+    def trim(self, value: Any, depth: int, size: int) -> Tuple[Any, int, int]:
+        """
+        Returns the trimmed value along with the lengths of its ``force_str``
+        and its repr.
+        """
+        max_size = self.max_size
+
+        if depth > self.max_depth:
+            if not isinstance(value, str):
+                value = json.dumps(value)
+            result = truncatechars(value, max_size - size)
+            return (result, *_leaf_lens(result))
+
+        if isinstance(value, dict):
+            # If this dict was measured with ``repr`` by its parent, measuring
+            # its items is already the second pass over its data.
+            remeasured = id(value) in self._repr_lens and id(value) not in self._measured_bottom_up
+            total_len = None
+
+            result: Any = {}
+            item_lens = []
+            size += 2
+            for k in sorted(value.keys(), key=lambda x: (self._str_len(value[x]), x)):
+                v = value[k]
+                if (
+                    remeasured
+                    and type(v) in _CONTAINER_TYPES
+                    and self._repr_lens[id(v)] >= BOTTOM_UP_MEASURE_MIN_LEN
+                    and not _is_flat(v)
+                ):
+                    if total_len is None:
+                        total_len = sum(map(self._str_len, value.values()))
+                    if self._repr_lens[id(v)] * 2 > total_len:
+                        # ``v`` makes up most of a dict that was just measured
+                        # twice, so its data would keep being stringified on
+                        # every level.
+                        self._measure_bottom_up(v)
+                trim_v, trim_str_len, trim_repr_len = self.trim(v, depth + 1, size)
+                result[k] = trim_v
+                item_lens.append(self._repr_len(k))
+                item_lens.append(trim_repr_len)
+                size += trim_str_len + 1
+                if size >= max_size:
+                    break
+            repr_len = _container_repr_len(result, item_lens)
+            lens = (repr_len, repr_len)
+
+        elif isinstance(value, (list, tuple)):
+            result = []
+            item_lens = []
+            size += 2
+            for v in value:
+                trim_v, trim_str_len, trim_repr_len = self.trim(v, depth + 1, size)
+                result.append(trim_v)
+                item_lens.append(trim_repr_len)
+                size += trim_str_len
+                if size >= max_size:
+                    break
+            if isinstance(value, tuple):
+                result = tuple(result)
+            repr_len = _container_repr_len(result, item_lens)
+            lens = (repr_len, repr_len)
+
+        elif isinstance(value, str):
+            result = truncatechars(value, max_size - size)
+            lens = _leaf_lens(result)
+
+        else:
+            result = value
+            lens = _leaf_lens(result)
+
+        if self.object_hook is None:
+            return (result, *lens)
+        result = self.object_hook(result)
+        return (result, *_leaf_lens(result))
+
+
 def trim(
     value,
     max_size=settings.SENTRY_MAX_VARIABLE_SIZE,
@@ -58,50 +263,7 @@ def trim(
 
     The method of truncation depends on the type of value.
     """
-    options = {
-        "max_depth": max_depth,
-        "max_size": max_size,
-        "object_hook": object_hook,
-        "_depth": _depth + 1,
-    }
-
-    if _depth > max_depth:
-        if not isinstance(value, str):
-            value = json.dumps(value)
-        return trim(value, _size=_size, max_size=max_size)
-
-    elif isinstance(value, dict):
-        result: Any = {}
-        _size += 2
-        for k in sorted(value.keys(), key=lambda x: (len(force_str(value[x])), x)):
-            v = value[k]
-            trim_v = trim(v, _size=_size, **options)
-            result[k] = trim_v
-            _size += len(force_str(trim_v)) + 1
-            if _size >= max_size:
-                break
-
-    elif isinstance(value, (list, tuple)):
-        result = []
-        _size += 2
-        for v in value:
-            trim_v = trim(v, _size=_size, **options)
-            result.append(trim_v)
-            _size += len(force_str(trim_v))
-            if _size >= max_size:
-                break
-        if isinstance(value, tuple):
-            result = tuple(result)
-
-    elif isinstance(value, str):
-        result = truncatechars(value, max_size - _size)
-
-    else:
-        result = value
-
-    if object_hook is None:
-        return result
-    return object_hook(result)
+    return _Trimmer(max_size, max_depth, object_hook).trim(value, _depth, _size)[0]
 
 
 def get_path(data: PathSearchable, *path, **kwargs):
@@ -3,6 +3,7 @@ from datetime import timedelta
 from functools import cached_property
 from unittest import mock
 
+import pytest
 from django.conf import settings
 from django.db.models import F
 from django.utils import timezone
@@ -10,6 +11,7 @@ from django.utils import timezone
 from sentry import features
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.project import (
+    _PROJECT_SCOPE_PREFIX,
     DetailedProjectSerializer,
     ProjectSummarySerializer,
     ProjectWithOrganizationSerializer,
@@ -30,6 +32,7 @@ from sentry.testutils import SnubaTestCase, TestCase
 from sentry.testutils.helpers import with_feature
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.testutils.silo import region_silo_test
+from sentry.testutils.skips import requires_benchmark
 from sentry.utils.samples import load_data
 
 TEAM_CONTRIBUTOR = settings.SENTRY_TEAM_ROLES[0]
@@ -218,17 +221,18 @@ class ProjectSerializerTest(TestCase):
         assert result["hasAccess"] is True
         assert result["isMember"] is True
 
-    @mock.patch("sentry.features.batch_has")
-    def test_project_batch_has(self, mock_batch):
-        mock_batch.return_value = {
+    @mock.patch.object(features.default_manager, "_entity_handler")
+    def test_project_batch_has(self, mock_entity_handler):
+        mock_entity_handler.batch_has.return_value = {
             f"project:{self.project.id}": {
-                "projects:test-feature": True,
-                "projects:disabled-feature": False,
+                # The defaults of these are the other way around.
+                "projects:servicehooks": True,
+                "projects:minidump": False,
             }
         }
         result = serialize(self.project, self.user)
-        assert "test-feature" in result["features"]
-        assert "disabled-feature" not in result["features"]
+        assert "servicehooks" in result["features"]
+        assert "minidump" not in result["features"]
 
     @mock.patch("sentry.api.serializers.project.features")
     def test_project_features(self, mock_features):
@@ -237,6 +241,7 @@ class ProjectSerializerTest(TestCase):
         mock_features.has = test_features.has
         mock_features.batch_has = test_features.batch_has
         mock_features.has_for_batch = test_features.has_for_batch
+        mock_features.evaluate = test_features.evaluate
 
         early_flag = "projects:TEST_early"
         red_flag = "projects:TEST_red"
@@ -736,3 +741,30 @@ class BulkFetchProjectLatestReleases(TestCase):
             release_2,
             other_project_release,
         }
+
+
+@requires_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("method", ["has_for_batch", "evaluate"])
+def test_benchmark_project_features(method, benchmark, factories, default_user):
+    organization = factories.create_organization(owner=default_user)
+    team = factories.create_team(organization=organization)
+    projects = [
+        factories.create_project(organization=organization, teams=[team]) for _ in range(50)
+    ]
+    project_features = [
+        feature
+        for feature in features.all(feature_type=features.ProjectFeature).keys()
+        if feature.startswith(_PROJECT_SCOPE_PREFIX)
+    ]
+
+    def has_for_batch():
+        for feature_name in project_features:
+            features.has_for_batch(feature_name, organization, projects, default_user)
+
+    def evaluate():
+        features.evaluate(
+            organization, projects, actor=default_user, feature_names=project_features
+        )
+
+    benchmark(has_for_batch if method == "has_for_batch" else evaluate)
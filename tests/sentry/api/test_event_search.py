@@ -16,6 +16,7 @@ from sentry.api.event_search import (
     SearchKey,
     SearchValue,
     parse_search_query,
+    parse_search_tree,
 )
 from sentry.constants import MODULE_ROOT
 from sentry.exceptions import InvalidSearchQuery
@@ -399,6 +400,20 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
                 SearchFilter(key=SearchKey(name="random"), operator="=", value=SearchValue("-2w"))
             ]
 
+    def test_rel_time_filter_reuses_parse_tree(self):
+        now = timezone.now()
+        for offset in (timedelta(0), timedelta(days=1)):
+            # The parse tree is shared, but the relative time is resolved on every call
+            with freeze_time(now + offset):
+                assert parse_search_query("time:-2w") == [
+                    SearchFilter(
+                        key=SearchKey(name="time"),
+                        operator=">=",
+                        value=SearchValue(raw_value=now + offset - timedelta(days=14)),
+                    )
+                ]
+        assert parse_search_tree("time:-2w") is parse_search_tree("time:-2w")
+
     def test_aggregate_rel_time_filter(self):
         now = timezone.now()
         with freeze_time(now):
@@ -1,6 +1,17 @@
 import copy
+import os
+import tracemalloc
+import zlib
 
-from sentry.attachments.base import BaseAttachmentCache, CachedAttachment
+import pytest
+
+from sentry.attachments.base import (
+    ATTACHMENT_CHUNK_WINDOW,
+    BaseAttachmentCache,
+    CachedAttachment,
+    MissingAttachmentChunks,
+)
+from sentry.testutils.skips import requires_benchmark
 
 
 class InMemoryCache:
@@ -13,6 +24,8 @@ class InMemoryCache:
         self.data = {}
         #: Used to check for consistent usage of `raw` param
         self.raw_map = {}
+        self.get_many_calls = 0
+        self.set_many_calls = 0
 
     def get(self, key, raw=False):
         assert key not in self.raw_map or raw == self.raw_map[key]
@@ -28,6 +41,19 @@ class InMemoryCache:
     def delete(self, key):
         del self.data[key]
 
+    def get_many(self, keys, raw=False):
+        self.get_many_calls += 1
+        return {key: self.get(key, raw=raw) for key in keys if key in self.data}
+
+    def set_many(self, mapping, timeout=None, raw=False):
+        self.set_many_calls += 1
+        for key, value in mapping.items():
+            self.set(key, value, timeout=timeout, raw=raw)
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.delete(key)
+
 
 def test_meta_basic():
     att = CachedAttachment(key="c:foo", id=123, name="lol.txt", content_type="text/plain", chunks=3)
@@ -110,3 +136,109 @@ def test_basic_rate_limited():
     assert att2.id == att.id == 0
     assert att2.data == att.data == b"Hello World! Bye."
     assert att2.rate_limited is True
+
+
+def test_set_chunks():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    chunks = [b"%d " % i for i in range(ATTACHMENT_CHUNK_WINDOW * 2 + 1)]
+    assert cache.set_chunks("c:foo", 123, iter(chunks)) == (len(chunks), len(b"".join(chunks)))
+    assert data.set_many_calls == 3
+
+    att = CachedAttachment(key="c:foo", id=123, name="lol.txt", chunks=len(chunks))
+    cache.set("c:foo", [att])
+
+    (att2,) = cache.get("c:foo")
+    assert att2.data == b"".join(chunks)
+    assert data.get_many_calls == 3
+
+    cache.delete("c:foo")
+    assert not data.data
+
+
+def test_open_streams_chunks():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    cache.set_chunk("c:foo", 123, 0, b"Hello World! ")
+    cache.set_chunk("c:foo", 123, 1, b"")
+    cache.set_chunk("c:foo", 123, 2, b"Bye.")
+    cache.set("c:foo", [CachedAttachment(key="c:foo", id=123, name="lol.txt", chunks=3)])
+
+    (att,) = cache.get("c:foo")
+    with att.open() as fp:
+        assert fp.read(5) == b"Hello"
+        assert fp.read(10) == b" World! By"
+        assert fp.read() == b"e."
+        assert fp.read(5) == b""
+
+
+def test_open_unchunked():
+    att = CachedAttachment(name="lol.txt", data=b"Hello World!")
+    with att.open() as fp:
+        assert fp.read() == b"Hello World!"
+
+
+def test_open_missing_chunks():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    cache.set_chunk("c:foo", 123, 0, b"Hello World! ")
+    cache.set("c:foo", [CachedAttachment(key="c:foo", id=123, name="lol.txt", chunks=2)])
+
+    (att,) = cache.get("c:foo")
+    with pytest.raises(MissingAttachmentChunks), att.open() as fp:
+        fp.read()
+
+
+def test_open_bounded_memory():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    chunk_size = 1024 * 1024
+    num_chunks = 64
+    # Incompressible chunks, so that the compressed chunks held by the cache
+    # are as large as the data read from them.
+    chunk = os.urandom(chunk_size)
+    cache.set_chunks("c:foo", 123, (chunk for _ in range(num_chunks)))
+    cache.set("c:foo", [CachedAttachment(key="c:foo", id=123, name="lol.txt", chunks=num_chunks)])
+    (att,) = cache.get("c:foo")
+
+    tracemalloc.start()
+    try:
+        size = 0
+        with att.open() as fp:
+            for piece in iter(lambda: fp.read(chunk_size), b""):
+                assert piece == chunk
+                size += len(piece)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert size == chunk_size * num_chunks
+    # One window of chunks, plus the pieces being read.
+    assert peak < chunk_size * (ATTACHMENT_CHUNK_WINDOW * 2 + 4)
+
+
+@requires_benchmark
+@pytest.mark.parametrize("method", ["data", "open"])
+def test_benchmark_read_minidump(method, benchmark):
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    # A synthetic 256MB minidump made of mostly empty memory regions.
+    chunk = (os.urandom(64 * 1024) + b"\0" * 960 * 1024) * 8
+    num_chunks = 32
+    for chunk_index in range(num_chunks):
+        data.data[f"c:foo:a:0:{chunk_index}"] = zlib.compress(chunk)
+    att = CachedAttachment(key="c:foo", id=0, name="minidump", chunks=num_chunks, cache=cache)
+
+    def read():
+        if method == "data":
+            return len(cache.get_data(att))
+
+        with att.open() as fp:
+            return sum(len(piece) for piece in iter(lambda: fp.read(8 * 1024 * 1024), b""))
+
+    assert benchmark(read) == len(chunk) * num_chunks
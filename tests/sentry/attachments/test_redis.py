@@ -1,3 +1,4 @@
+import contextlib
 import zlib
 from unittest import mock
 
@@ -9,6 +10,37 @@ from sentry.utils.imports import import_string
 KEY_FMT = "c:1:%s"
 
 
+class FakePromise:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.keys = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def get(self, key):
+        self.keys.append(key)
+
+    def execute(self):
+        return [self.client.data.get(key) for key in self.keys]
+
+
+class FakeMappingClient:
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key):
+        return FakePromise(self.client.data.get(key))
+
+
 class FakeClient:
     def __init__(self):
         self.data = {}
@@ -16,6 +48,12 @@ class FakeClient:
     def get(self, key):
         return self.data[key]
 
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def map(self):
+        return contextlib.nullcontext(FakeMappingClient(self))
+
 
 @pytest.fixture
 def mock_client():
@@ -0,0 +1,118 @@
+from sentry.auth import access
+from sentry.auth.access_snapshot import (
+    _local_cache,
+    get_access_snapshot,
+    invalidate_organization_access,
+)
+from sentry.constants import ObjectStatus
+from sentry.models import OrganizationMember, OrganizationMemberTeam
+from sentry.testutils import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.silo import region_silo_test
+
+
+@region_silo_test(stable=True)
+class AccessSnapshotTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        _local_cache.clear()
+        self.user = self.create_user()
+        self.organization = self.create_organization(owner=self.create_user(), flags=0)
+        self.team = self.create_team(organization=self.organization)
+        self.other_team = self.create_team(organization=self.organization)
+        self.project = self.create_project(organization=self.organization, teams=[self.team])
+        self.other_project = self.create_project(
+            organization=self.organization, teams=[self.other_team]
+        )
+        self.member = self.create_member(
+            organization=self.organization, user=self.user, teams=[self.team]
+        )
+
+    def get_member(self):
+        return OrganizationMember.objects.get(id=self.member.id)
+
+    def test_snapshot_contents(self):
+        deleted_project = self.create_project(
+            organization=self.organization, status=ObjectStatus.PENDING_DELETION, teams=[self.team]
+        )
+        snapshot = get_access_snapshot(self.get_member())
+
+        assert snapshot.member_id == self.member.id
+        assert snapshot.team_ids == frozenset({self.team.id})
+        assert list(snapshot.project_ids) == [self.project.id]
+        assert snapshot.has_project(self.project.id)
+        assert not snapshot.has_project(self.other_project.id)
+        assert not snapshot.has_project(deleted_project.id)
+        assert snapshot.roles == ("member",)
+        assert snapshot.scopes == self.get_member().get_scopes()
+
+    def test_cached_between_lookups(self):
+        get_access_snapshot(self.get_member())
+        member = self.get_member()
+        with self.assertNumQueries(0):
+            get_access_snapshot(member)
+
+        _local_cache.clear()
+        with self.assertNumQueries(0):
+            get_access_snapshot(member)
+
+    def test_invalidated_on_team_membership_change(self):
+        snapshot = get_access_snapshot(self.get_member())
+        assert not snapshot.has_project(self.other_project.id)
+
+        with self.capture_on_commit_callbacks(execute=True):
+            OrganizationMemberTeam.objects.create(
+                team=self.other_team, organizationmember=self.member
+            )
+
+        snapshot = get_access_snapshot(self.get_member())
+        assert snapshot.team_ids == frozenset({self.team.id, self.other_team.id})
+        assert snapshot.has_project(self.other_project.id)
+
+    def test_invalidated_on_project_team_change(self):
+        get_access_snapshot(self.get_member())
+
+        with self.capture_on_commit_callbacks(execute=True):
+            self.other_project.add_team(self.team)
+
+        assert get_access_snapshot(self.get_member()).has_project(self.other_project.id)
+
+    def test_invalidated_on_organization_option_change(self):
+        self.organization.update_option("sentry:events_member_admin", True)
+        assert "event:admin" in get_access_snapshot(self.get_member()).scopes
+
+        # Updating an existing option goes through a queryset update.
+        with self.capture_on_commit_callbacks(execute=True):
+            self.organization.update_option("sentry:events_member_admin", False)
+
+        snapshot = get_access_snapshot(self.get_member())
+        assert "event:admin" not in snapshot.scopes
+        assert snapshot.scopes == self.get_member().get_scopes()
+
+    def test_invalidated_on_team_transfer(self):
+        assert get_access_snapshot(self.get_member()).has_project(self.project.id)
+
+        with self.capture_on_commit_callbacks(execute=True):
+            self.team.transfer_to(self.create_organization(owner=self.create_user()))
+
+        snapshot = get_access_snapshot(self.get_member())
+        assert not snapshot.has_project(self.project.id)
+        assert snapshot.team_ids == frozenset()
+
+    def test_stale_version_is_rebuilt(self):
+        snapshot = get_access_snapshot(self.get_member())
+        invalidate_organization_access(self.organization.id)
+
+        rebuilt = get_access_snapshot(self.get_member())
+        assert rebuilt.version != snapshot.version
+        assert list(rebuilt.project_ids) == list(snapshot.project_ids)
+
+    @override_options({"auth.access-snapshots.enabled": True})
+    def test_from_member_uses_snapshot(self):
+        result = access.from_member(self.get_member())
+
+        assert result.has_project_access(self.project)
+        assert not result.has_project_access(self.other_project)
+        assert result.team_ids_with_membership == frozenset({self.team.id})
+        assert result.project_ids_with_team_membership == frozenset({self.project.id})
+        assert result.has_scope("project:read")
@@ -1,6 +1,9 @@
+from datetime import datetime
+
 import pytest
 
 from sentry.cache.redis import RedisCache, ValueTooLarge
+from sentry.exceptions import InvalidConfiguration
 from sentry.testutils import TestCase
 
 
@@ -21,3 +24,58 @@ class RedisCacheTest(TestCase):
 
         with pytest.raises(ValueTooLarge):
             self.backend.set("foo", "x" * (RedisCache.max_size + 1), 0)
+
+    def test_many(self):
+        self.backend.set_many({"foo": {"foo": "bar"}, "bar": [1, 2]}, 50)
+        assert self.backend.get_many(["foo", "bar", "baz"]) == {
+            "foo": {"foo": "bar"},
+            "bar": [1, 2],
+        }
+        assert self.backend.get("bar") == [1, 2]
+
+        self.backend.delete_many(["foo", "bar"])
+        assert self.backend.get_many(["foo", "bar"]) == {}
+
+        with pytest.raises(ValueTooLarge):
+            self.backend.set_many({"foo": "x" * (RedisCache.max_size + 1)}, 0)
+
+    def test_many_raw(self):
+        self.backend.set_many({"foo": b"\x00\xff"}, 50, raw=True)
+        assert self.backend.get_many(["foo"], raw=True) == {"foo": b"\x00\xff"}
+
+    def test_msgpack_codec(self):
+        backend = RedisCache(codec="msgpack")
+        values = {
+            "small": {"foo": "bar"},
+            "large": {"foo": "x" * (backend.compression_threshold * 2)},
+            "date": {"foo": datetime(2023, 1, 1)},
+        }
+        backend.set_many(values, 50)
+        assert backend.get_many(list(values)) == {
+            "small": {"foo": "bar"},
+            "large": values["large"],
+            "date": {"foo": "2023-01-01T00:00:00.000000Z"},
+        }
+
+        # Entries written as JSON stay readable and vice versa.
+        self.backend.set("json", {"foo": "bar"}, 50)
+        assert backend.get("json") == {"foo": "bar"}
+        assert self.backend.get("large") == values["large"]
+
+    def test_msgpack_codec_json_fallback(self):
+        backend = RedisCache(codec="msgpack")
+        values = {
+            "int_keys": {1: "a", "nested": [{2: "b"}]},
+            "big_int": {"foo": 2**70},
+        }
+        backend.set_many(values, 50)
+        # The values are stored as JSON, and read back as JSON would return them.
+        assert backend.get_many(list(values)) == {
+            "int_keys": {"1": "a", "nested": [{"2": "b"}]},
+            "big_int": {"foo": 2**70},
+        }
+        assert backend.get("int_keys") == {"1": "a", "nested": [{"2": "b"}]}
+
+    def test_unknown_codec(self):
+        with pytest.raises(InvalidConfiguration):
+            RedisCache(codec="pickle")
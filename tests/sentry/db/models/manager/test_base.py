@@ -0,0 +1,115 @@
+import pytest
+from django.test import override_settings
+
+from sentry.db.models.manager import make_key
+from sentry.db.models.manager.base import _process_caches, _ProcessModelCache
+from sentry.models import Project, ProjectKey
+from sentry.testutils import TestCase
+
+
+@override_settings(SENTRY_MODEL_PROCESS_CACHE_ENABLED=True)
+class ProcessCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        _process_caches.clear()
+        self.other_project = self.create_project(organization=self.organization)
+
+    def test_disabled(self):
+        with override_settings(SENTRY_MODEL_PROCESS_CACHE_ENABLED=False):
+            assert Project.objects._get_process_cache() is None
+
+    def test_get_from_cache(self):
+        project = Project.objects.get_from_cache(id=self.project.id)
+        Project.objects.uncache_object(self.project.id)
+
+        with self.assertNumQueries(0):
+            cached = Project.objects.get_from_cache(id=self.project.id)
+        assert cached == project
+        assert cached is not project
+        assert cached._state.db is not None
+
+    def test_returns_copies(self):
+        Project.objects.get_from_cache(id=self.project.id).name = "changed"
+        assert Project.objects.get_from_cache(id=self.project.id).name == self.project.name
+
+    def test_returns_deep_copies(self):
+        key = self.create_project_key(project=self.project)
+        cached = ProjectKey.objects.get_from_cache(public_key=key.public_key)
+        cached.data["dynamicSdkLoaderOptions"] = {"hasReplay": True}
+
+        cached = ProjectKey.objects.get_from_cache(public_key=key.public_key)
+        assert "dynamicSdkLoaderOptions" not in cached.data
+        assert cached.data == key.data
+
+    def test_copies_dont_share_related_instances(self):
+        cached = Project.objects.get_from_cache(id=self.project.id)
+        cached.organization.name = "changed"
+        cached._state.adding = True
+
+        cached = Project.objects.get_from_cache(id=self.project.id)
+        assert cached.organization.name == self.organization.name
+        assert not cached._state.adding
+
+    def test_does_not_exist(self):
+        with pytest.raises(Project.DoesNotExist):
+            Project.objects.get_from_cache(id=0)
+
+        with self.assertNumQueries(0), pytest.raises(Project.DoesNotExist):
+            Project.objects.get_from_cache(id=0)
+
+    def test_invalidated_on_save(self):
+        Project.objects.get_from_cache(id=self.project.id)
+        self.project.update(name="renamed")
+        assert Project.objects.get_from_cache(id=self.project.id).name == "renamed"
+
+    def test_does_not_exist_invalidated_on_create(self):
+        with pytest.raises(Project.DoesNotExist):
+            Project.objects.get_from_cache(id=self.project.id + 1000)
+
+        project = self.create_project(id=self.project.id + 1000, organization=self.organization)
+        assert Project.objects.get_from_cache(id=project.id) == project
+
+    def test_invalidated_by_other_process(self):
+        Project.objects.get_from_cache(id=self.project.id)
+
+        # Another process saved the project and bypassed this process' cache.
+        Project.objects.filter(id=self.project.id).update(name="renamed")
+        Project.objects.uncache_object(self.project.id)
+        process_cache = Project.objects._get_process_cache()
+        other_process_cache = _ProcessModelCache(process_cache.log_key, 5, 10, {})
+        other_process_cache.invalidate([make_key(Project, "modelcache", {"id": self.project.id})])
+        process_cache._checked_at = 0
+
+        assert Project.objects.get_from_cache(id=self.project.id).name == "renamed"
+
+    def test_invalidates_only_saved_instance(self):
+        Project.objects.get_from_cache(id=self.project.id)
+        Project.objects.get_from_cache(id=self.other_project.id)
+
+        self.project.update(name="renamed")
+        Project.objects._get_process_cache()._checked_at = 0
+
+        with self.assertNumQueries(0):
+            assert Project.objects.get_from_cache(id=self.other_project.id) == self.other_project
+        assert Project.objects.get_from_cache(id=self.project.id).name == "renamed"
+
+    def test_value_loaded_before_invalidation_is_not_cached(self):
+        process_cache = Project.objects._get_process_cache()
+        key = make_key(Project, "modelcache", {"id": self.project.id})
+        version = process_cache.version()
+
+        process_cache.invalidate([key])
+        process_cache.set(key, self.project, version)
+        assert process_cache.get(key) is None
+
+    def test_get_many_from_cache(self):
+        ids = [self.project.id, self.other_project.id, 0]
+        projects = Project.objects.get_many_from_cache(ids)
+        assert {p.id for p in projects} == {self.project.id, self.other_project.id}
+
+        with self.assertNumQueries(0):
+            cached = Project.objects.get_many_from_cache(ids)
+        assert {p.id for p in cached} == {self.project.id, self.other_project.id}
+
+        with self.assertNumQueries(0), pytest.raises(Project.DoesNotExist):
+            Project.objects.get_from_cache(id=0)
@@ -1,8 +1,8 @@
 from unittest import mock
 from uuid import uuid4
 
-from sentry import nodestore
-from sentry.deletions.defaults.group import EventDataDeletionTask
+from sentry import deletions, nodestore
+from sentry.deletions.defaults.group import CHECKPOINTS_KEY, EventDataDeletionTask
 from sentry.eventstore.models import Event
 from sentry.models import (
     EventAttachment,
@@ -12,6 +12,7 @@ from sentry.models import (
     GroupHash,
     GroupMeta,
     GroupRedirect,
+    RegionScheduledDeletion,
     UserReport,
 )
 from sentry.tasks.deletion.groups import delete_groups
@@ -66,6 +67,7 @@ class DeleteGroupTest(TestCase, SnubaTestCase):
             event_id=self.event.event_id, project_id=self.event.project_id, name="With event id"
         )
         file = File.objects.create(name="hello.png", type="image/png")
+        self.attachment_file_id = file.id
         EventAttachment.objects.create(
             event_id=self.event.event_id,
             project_id=self.event.project_id,
@@ -95,6 +97,7 @@ class DeleteGroupTest(TestCase, SnubaTestCase):
         assert not UserReport.objects.filter(group_id=group.id).exists()
         assert not UserReport.objects.filter(event_id=self.event.event_id).exists()
         assert not EventAttachment.objects.filter(event_id=self.event.event_id).exists()
+        assert not File.objects.filter(id=self.attachment_file_id).exists()
 
         assert not GroupRedirect.objects.filter(group_id=group.id).exists()
         assert not GroupHash.objects.filter(group_id=group.id).exists()
@@ -138,3 +141,58 @@ class DeleteGroupTest(TestCase, SnubaTestCase):
             delete_groups(object_ids=[group.id])
 
         assert nodestore_delete_multi.call_count == 0
+
+    def test_event_data_checkpoint(self):
+        group = self.event.group
+        deletion = RegionScheduledDeletion.schedule(group, days=0)
+
+        with mock.patch.object(EventDataDeletionTask, "DEFAULT_CHUNK_SIZE", 1):
+            task = deletions.get(
+                task=EventDataDeletionTask, groups=[group], transaction_id=deletion.guid
+            )
+            assert task.chunk()
+
+            deletion.refresh_from_db()
+            (checkpoint,) = deletion.data[CHECKPOINTS_KEY].values()
+            assert checkpoint == list(task.last_event)
+
+            # A new task for the same deletion resumes after the checkpoint.
+            resumed = deletions.get(
+                task=EventDataDeletionTask, groups=[group], transaction_id=deletion.guid
+            )
+            assert resumed.last_event == task.last_event
+
+            while resumed.chunk():
+                pass
+
+        deletion.refresh_from_db()
+        assert deletion.data[CHECKPOINTS_KEY] == {}
+        assert not nodestore.backend.get(self.node_id)
+        assert not nodestore.backend.get(self.node_id2)
+
+    @mock.patch("sentry.nodestore.delete_multi")
+    def test_event_data_concurrent_nodestore_batches(self, nodestore_delete_multi):
+        group = self.event.group
+
+        with mock.patch.object(EventDataDeletionTask, "NODESTORE_BATCH_SIZE", 1):
+            task = deletions.get(task=EventDataDeletionTask, groups=[group])
+            while task.chunk():
+                pass
+
+        deleted = sorted(call.args[0] for call in nodestore_delete_multi.call_args_list)
+        assert deleted == sorted([[self.node_id], [self.node_id2]])
+
+    @mock.patch("sentry.deletions.defaults.group.connections")
+    @mock.patch("sentry.nodestore.delete_multi")
+    def test_event_data_nodestore_batches_close_connections(
+        self, nodestore_delete_multi, connections
+    ):
+        group = self.event.group
+
+        with mock.patch.object(EventDataDeletionTask, "NODESTORE_BATCH_SIZE", 1):
+            task = deletions.get(task=EventDataDeletionTask, groups=[group])
+            while task.chunk():
+                pass
+
+        assert nodestore_delete_multi.call_count == 2
+        assert connections.close_all.call_count == 2
@@ -6,6 +6,7 @@ from sentry.discover.arithmetic import (
     MaxOperatorError,
     Operation,
     parse_arithmetic,
+    parse_arithmetic_tree,
 )
 
 op_map = {
@@ -189,6 +190,16 @@ def test_max_operators():
     parse_arithmetic("1 + 2 * 3 * 4", 3)
 
 
+def test_parse_tree_reused():
+    equation = "spans.http + spans.db * 2"
+    assert parse_arithmetic_tree(equation) is parse_arithmetic_tree(equation)
+
+    # Validation happens on every call, not only when the equation is first parsed
+    parse_arithmetic(equation, 2)
+    with pytest.raises(MaxOperatorError):
+        parse_arithmetic(equation, 1)
+
+
 @pytest.mark.parametrize(
     "a,op,b",
     [
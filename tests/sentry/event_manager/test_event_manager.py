@@ -31,10 +31,14 @@ from sentry.dynamic_sampling import (
 )
 from sentry.event_manager import (
     EventManager,
+    GroupInfo,
     HashDiscarded,
     _get_event_instance,
+    _get_or_create_group_release_many,
+    _get_or_create_release_associated_models,
     _save_grouphash_and_group,
     has_pending_commit_resolution,
+    save_attachment,
 )
 from sentry.eventstore.models import Event
 from sentry.grouping.utils import hash_from_values
@@ -52,6 +56,7 @@ from sentry.models import (
     CommitAuthor,
     Environment,
     ExternalIssue,
+    File,
     Group,
     GroupEnvironment,
     GroupHash,
@@ -67,6 +72,7 @@ from sentry.models import (
     PullRequestCommit,
     Release,
     ReleaseCommit,
+    ReleaseEnvironment,
     ReleaseHeadCommit,
     ReleaseProjectEnvironment,
     UserReport,
@@ -140,8 +146,8 @@ class EventManagerTest(TestCase, SnubaTestCase, EventManagerTestMixin, Performan
         assert group.platform == "python"
         assert event.platform == "python"
 
-    @mock.patch("sentry.event_manager.eventstream.backend.insert")
-    def test_dupe_message_id(self, eventstream_insert):
+    @mock.patch("sentry.event_manager.eventstream.backend.insert_many")
+    def test_dupe_message_id(self, eventstream_insert_many):
         # Saves the latest event to nodestore and eventstream
         project_id = self.project.id
         event_id = "a" * 32
@@ -157,7 +163,7 @@ class EventManagerTest(TestCase, SnubaTestCase, EventManagerTestMixin, Performan
         manager.save(project_id)
         assert nodestore.backend.get(node_id)["logentry"]["formatted"] == "second"
 
-        assert eventstream_insert.call_count == 2
+        assert eventstream_insert_many.call_count == 2
 
     def test_updates_group(self):
         timestamp = time() - 300
@@ -1401,8 +1407,8 @@ class EventManagerTest(TestCase, SnubaTestCase, EventManagerTestMixin, Performan
         assert 42 not in event.tags
         assert None not in event.tags
 
-    @mock.patch("sentry.event_manager.eventstream.backend.insert")
-    def test_group_environment(self, eventstream_insert):
+    @mock.patch("sentry.event_manager.eventstream.backend.insert_many")
+    def test_group_environment(self, eventstream_insert_many):
         release_version = "1.0"
 
         def save_event():
@@ -1438,13 +1444,17 @@ class EventManagerTest(TestCase, SnubaTestCase, EventManagerTestMixin, Performan
         }
         # Ensure that the first event in the (group, environment) pair is
         # marked as being part of a new environment.
-        eventstream_insert.assert_called_with(
-            event=event,
-            **group_states1,
-            primary_hash="acbd18db4cc2f85cedef654fccc4a4d8",
-            skip_consume=False,
-            received_timestamp=event.data["received"],
-            group_states=[{"id": event.group.id, **group_states1}],
+        eventstream_insert_many.assert_called_with(
+            [
+                {
+                    "event": event,
+                    **group_states1,
+                    "primary_hash": "acbd18db4cc2f85cedef654fccc4a4d8",
+                    "skip_consume": False,
+                    "received_timestamp": event.data["received"],
+                    "group_states": [{"id": event.group.id, **group_states1}],
+                }
+            ]
         )
 
         event = save_event()
@@ -1457,13 +1467,17 @@ class EventManagerTest(TestCase, SnubaTestCase, EventManagerTestMixin, Performan
 
         # Ensure that the next event in the (group, environment) pair is *not*
         # marked as being part of a new environment.
-        eventstream_insert.assert_called_with(
-            event=event,
-            **group_states2,
-            primary_hash="acbd18db4cc2f85cedef654fccc4a4d8",
-            skip_consume=False,
-            received_timestamp=event.data["received"],
-            group_states=[{"id": event.group.id, **group_states2}],
+        eventstream_insert_many.assert_called_with(
+            [
+                {
+                    "event": event,
+                    **group_states2,
+                    "primary_hash": "acbd18db4cc2f85cedef654fccc4a4d8",
+                    "skip_consume": False,
+                    "received_timestamp": event.data["received"],
+                    "group_states": [{"id": event.group.id, **group_states2}],
+                }
+            ]
         )
 
     def test_default_fingerprint(self):
@@ -1790,6 +1804,15 @@ class EventManagerTest(TestCase, SnubaTestCase, EventManagerTestMixin, Performan
             assert o.kwargs["category"] == DataCategory.ATTACHMENT
             assert o.kwargs["quantity"] == 5
 
+    def test_save_attachment_deletes_file_on_error(self):
+        attachment = CachedAttachment(name="a1", data=b"hello")
+
+        with mock.patch.object(File, "putfile", side_effect=OSError("storage unavailable")):
+            with pytest.raises(OSError):
+                save_attachment(None, attachment, self.project, "a" * 32)
+
+        assert not File.objects.filter(name="a1").exists()
+
     def test_honors_crash_report_limit(self):
         from sentry.utils.outcomes import track_outcome
 
@@ -2981,6 +3004,40 @@ class ReleaseIssueTest(TestCase):
             first_seen=self.timestamp + 100,
         )
 
+    def test_batch_with_out_of_order_timestamps(self):
+        group = self.create_group(project=self.project)
+        timestamps = [self.timestamp + 100, self.timestamp, self.timestamp + 200]
+        jobs = [
+            {
+                "project_id": self.project.id,
+                "release": self.release,
+                "environment": self.environment1,
+                "event": mock.Mock(datetime=self.convert_timestamp(timestamp)),
+                "groups": [GroupInfo(group=group, is_new=False, is_regression=False)],
+            }
+            for timestamp in timestamps
+        ]
+        projects = {self.project.id: self.project}
+
+        _get_or_create_release_associated_models(jobs, projects)
+        _get_or_create_group_release_many(jobs, projects)
+
+        first_seen = self.convert_timestamp(self.timestamp)
+        last_seen = self.convert_timestamp(self.timestamp + 200)
+        for model, filters in (
+            (ReleaseEnvironment, {"organization_id": self.project.organization_id}),
+            (ReleaseProjectEnvironment, {"project": self.project}),
+        ):
+            instance = model.objects.get(
+                release_id=self.release.id, environment_id=self.environment1.id, **filters
+            )
+            assert (instance.first_seen, instance.last_seen) == (first_seen, last_seen)
+
+        group_release = GroupRelease.objects.get(group_id=group.id, release_id=self.release.id)
+        assert (group_release.first_seen, group_release.last_seen) == (first_seen, last_seen)
+        for job in jobs:
+            assert job["groups"][0].group_release.id == group_release.id
+
 
 @region_silo_test
 @apply_feature_flag_on_cls("organizations:dynamic-sampling")
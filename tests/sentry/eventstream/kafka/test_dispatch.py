@@ -1,12 +1,13 @@
 import time
 from datetime import datetime
+from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
 from arroyo.backends.kafka import KafkaPayload
 from arroyo.types import BrokerValue, Message, Partition, Topic
 
-from sentry.eventstream.kafka.dispatch import _get_task_kwargs_and_dispatch
+from sentry.eventstream.kafka.dispatch import _get_ordering_key, _get_task_kwargs_and_dispatch
 from sentry.utils import json
 
 
@@ -127,3 +128,20 @@ def test_dispatch_task_with_occurrence(mock_post_process_group: Mock) -> None:
         },
         "queue": "post_process_issue_platform",
     }
+
+
+def test_ordering_key() -> None:
+    partition = Partition(Topic("test"), 0)
+
+    def make_message(headers: Any) -> Message[KafkaPayload]:
+        payload = KafkaPayload(key=b"1", value=b"", headers=headers)
+        return Message(BrokerValue(payload, partition, 1, datetime.now()))
+
+    grouped = [("project_id", b"1"), ("group_id", b"43"), ("event_id", b"a" * 32)]
+    other_event = [("project_id", b"1"), ("group_id", b"43"), ("event_id", b"b" * 32)]
+    assert _get_ordering_key(make_message(grouped)) == _get_ordering_key(make_message(other_event))
+
+    issueless = [("project_id", b"1"), ("event_id", b"a" * 32)]
+    assert _get_ordering_key(make_message(issueless)) == b"a" * 32
+
+    assert _get_ordering_key(make_message([])) == b"1"
@@ -17,6 +17,7 @@ from sentry.issues.occurrence_consumer import process_event_and_issue_occurrence
 from sentry.receivers import create_default_projects
 from sentry.snuba.dataset import Dataset, EntityKey
 from sentry.testutils import SnubaTestCase, TestCase
+from sentry.testutils.helpers import override_options
 from sentry.testutils.silo import region_silo_test
 from sentry.utils import json, snuba
 from sentry.utils.samples import load_data
@@ -101,15 +102,16 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase, OccurrenceTestMixin):
         # only return headers and body payload
         return produce_kwargs["headers"], payload2
 
-    @patch("sentry.eventstream.backend.insert", autospec=True)
+    @patch("sentry.eventstream.backend.insert_many", autospec=True)
     def test(self, mock_eventstream_insert):
         now = datetime.utcnow()
 
         event = self.__build_event(now)
 
         # verify eventstream was called by EventManager
-        insert_args, insert_kwargs = list(mock_eventstream_insert.call_args)
-        assert not insert_args
+        (inserts,), _ = mock_eventstream_insert.call_args
+        assert len(inserts) == 1
+        insert_args, insert_kwargs = (), inserts[0]
 
         group_state = {
             "is_new_group_environment": True,
@@ -138,7 +140,7 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase, OccurrenceTestMixin):
             == 1
         )
 
-    @patch("sentry.eventstream.backend.insert", autospec=True)
+    @patch("sentry.eventstream.backend.insert_many", autospec=True)
     def test_issueless(self, mock_eventstream_insert):
         now = datetime.utcnow()
         event = self.__build_transaction_event()
@@ -166,7 +168,7 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase, OccurrenceTestMixin):
         )
         assert len(result["data"]) == 1
 
-    @patch("sentry.eventstream.backend.insert", autospec=True)
+    @patch("sentry.eventstream.backend.insert_many", autospec=True)
     def test_multiple_groups(self, mock_eventstream_insert):
         now = datetime.utcnow()
         event = self.__build_transaction_event()
@@ -223,7 +225,7 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase, OccurrenceTestMixin):
             exc_info=True,
         )
 
-    @patch("sentry.eventstream.backend.insert", autospec=True)
+    @patch("sentry.eventstream.backend.insert_many", autospec=True)
     def test_groupevent_occurrence_passed(self, mock_eventstream_insert):
 
         now = datetime.utcnow()
@@ -286,15 +288,16 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase, OccurrenceTestMixin):
         assert result["data"][0]["group_id"] == self.group.id
         assert result["data"][0]["occurrence_id"] == group_event.occurrence.id
 
-    @patch("sentry.eventstream.backend.insert", autospec=True)
+    @patch("sentry.eventstream.backend.insert_many", autospec=True)
     def test_error_queue(self, mock_eventstream_insert):
         now = datetime.utcnow()
 
         event = self.__build_event(now)
 
         # verify eventstream was called by EventManager
-        insert_args, insert_kwargs = list(mock_eventstream_insert.call_args)
-        assert not insert_args
+        (inserts,), _ = mock_eventstream_insert.call_args
+        assert len(inserts) == 1
+        insert_args, insert_kwargs = (), inserts[0]
 
         group_state = {
             "is_new_group_environment": True,
@@ -317,7 +320,7 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase, OccurrenceTestMixin):
         assert "occurrence_id" not in dict(headers)
         assert body["queue"] == "post_process_errors"
 
-    @patch("sentry.eventstream.backend.insert", autospec=True)
+    @patch("sentry.eventstream.backend.insert_many", autospec=True)
     def test_transaction_queue(self, mock_eventstream_insert):
         event = self.__build_transaction_event()
         event.group_id = None
@@ -343,7 +346,7 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase, OccurrenceTestMixin):
         assert "occurrence_id" not in dict(headers)
         assert body["queue"] == "post_process_transactions"
 
-    @patch("sentry.eventstream.backend.insert", autospec=True)
+    @patch("sentry.eventstream.backend.insert_many", autospec=True)
     def test_issue_platform_queue(self, mock_eventstream_insert):
         event = self.__build_transaction_event()
         event.group_id = None
@@ -372,6 +375,43 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase, OccurrenceTestMixin):
         assert ("occurrence_id", bytes(group_event.occurrence.id, encoding="utf-8")) in headers
         assert body["queue"] == "post_process_issue_platform"
 
+    @patch("sentry.eventstream.backend.insert_many", autospec=True)
+    def test_insert_many(self, mock_eventstream_insert):
+        error_event = self.__build_event(datetime.utcnow())
+        transaction_event = self.__build_transaction_event()
+        group_state = {
+            "is_new_group_environment": False,
+            "is_new": False,
+            "is_regression": False,
+        }
+        inserts = [
+            {
+                "event": event,
+                **group_state,
+                "primary_hash": "acbd18db4cc2f85cedef654fccc4a4d8",
+                "skip_consume": False,
+                "received_timestamp": event.data["received"],
+                "group_states": None,
+            }
+            for event in (error_event, transaction_event)
+        ]
+
+        self.kafka_eventstream.insert_many(inserts)
+
+        producer = self.producer_mock
+        # callbacks of earlier messages are served once per batch
+        producer.poll.assert_called_once_with(0.0)
+        producer.flush.assert_not_called()
+
+        assert [call.kwargs["topic"] for call in producer.produce.call_args_list] == [
+            settings.KAFKA_EVENTS,
+            settings.KAFKA_TRANSACTIONS,
+        ]
+        for call, event in zip(producer.produce.call_args_list, (error_event, transaction_event)):
+            version, type_, payload1, payload2 = json.loads(call.kwargs["value"])
+            assert (version, type_) == (2, "insert")
+            assert payload1["event_id"] == event.event_id
+
     def test_insert_generic_event_contexts(self):
         create_default_projects()
         es = SnubaProtocolEventStream()
@@ -411,3 +451,31 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase, OccurrenceTestMixin):
             assert "contexts" in send_extra_data_data
             contexts_after_processing = send_extra_data_data["contexts"]
             assert contexts_after_processing == {**{"geo": geo_interface}}
+
+
+class KafkaEventStreamProducerTest(TestCase):
+    @override_options(
+        {
+            "eventstream:kafka-producer.linger-ms": 50,
+            "eventstream:kafka-producer.batch-num-messages": 1000,
+        }
+    )
+    @patch("sentry.eventstream.kafka.backend.Producer")
+    def test_producer_shared_by_cluster(self, producer_cls):
+        eventstream = KafkaEventStream()
+
+        producer = eventstream.get_producer(settings.KAFKA_EVENTS)
+        assert eventstream.get_producer(settings.KAFKA_TRANSACTIONS) is producer
+        assert producer_cls.call_count == 1
+
+        (config,), _ = producer_cls.call_args
+        assert config["linger.ms"] == 50
+        assert config["batch.num.messages"] == 1000
+
+    @patch("sentry.eventstream.kafka.backend.Producer")
+    def test_producer_batching_defaults_to_cluster_config(self, producer_cls):
+        KafkaEventStream().get_producer(settings.KAFKA_EVENTS)
+
+        (config,), _ = producer_cls.call_args
+        assert "linger.ms" not in config
+        assert "batch.num.messages" not in config
@@ -1,6 +1,7 @@
 from typing import Any, Optional
 from unittest import mock
 
+import pytest
 from django.conf import settings
 
 from sentry import features
@@ -291,3 +292,104 @@ class FeatureManagerTest(TestCase):
 
         assert "feat:4" in manager.entity_features
         assert "feat:5" in manager.entity_features
+
+    def test_evaluate(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", OrganizationFeature)
+        manager.add("organizations:other-feature", OrganizationFeature)
+        manager.add("projects:feature", ProjectFeature)
+        manager.add("projects:other-feature", ProjectFeature)
+        manager.add("users:feature", UserFeature)
+        manager.add_handler(MockBatchHandler())
+        other_project = self.create_project(organization=self.organization)
+
+        snapshot = manager.evaluate(self.organization, [self.project, other_project])
+        assert snapshot.feature_names == (
+            "organizations:feature",
+            "organizations:other-feature",
+            "projects:feature",
+            "projects:other-feature",
+        )
+        assert snapshot.has("organizations:feature")
+        assert not snapshot.has("organizations:other-feature")
+        assert snapshot.get_enabled() == ["organizations:feature"]
+        for project in (self.project, other_project):
+            assert snapshot.has("projects:feature", project)
+            assert not snapshot.has("projects:other-feature", project)
+            assert snapshot.get_enabled(project) == ["projects:feature"]
+
+        with pytest.raises(ValueError):
+            manager.evaluate(self.organization, feature_names=["users:feature"])
+
+    def test_evaluate_matches_has(self):
+        project_flag = "projects:test_evaluate"
+        organization_flag = "organizations:test_evaluate"
+        p1, p2, p3 = (self.create_project(organization=self.organization) for _ in range(3))
+
+        class ProjectHandler(features.FeatureHandler):
+            features = {project_flag}
+
+            def has(self, feature, actor):
+                return True if feature.project == p1 else None
+
+            def batch_has(self, *a, **k):
+                raise NotImplementedError("unreachable")
+
+        entity_handler = mock.Mock()
+        entity_handler.has.side_effect = lambda feature, actor: (
+            False if getattr(feature, "project", None) == p2 else True
+        )
+        entity_handler.batch_has.side_effect = (
+            lambda names, actor, projects=None, organization=None: (
+                {f"project:{p.id}": {name: p != p2 for name in names} for p in projects}
+                if projects
+                else {f"organization:{organization.id}": {name: True for name in names}}
+            )
+        )
+
+        manager = features.FeatureManager()
+        manager.add(project_flag, ProjectFeature)
+        manager.add(organization_flag, OrganizationFeature)
+        manager.add_handler(ProjectHandler())
+        manager.add_entity_handler(entity_handler)
+
+        snapshot = manager.evaluate(self.organization, [p1, p2, p3], actor=self.user)
+        assert snapshot.has(organization_flag) == manager.has(organization_flag, self.organization)
+        for project in (p1, p2, p3):
+            assert snapshot.has(project_flag, project) == manager.has(project_flag, project)
+        # One call for the organization features, one for all project features.
+        assert entity_handler.batch_has.call_count == 2
+
+    def test_evaluate_defaults(self):
+        manager = features.FeatureManager()
+        manager.add("projects:feature", ProjectFeature)
+
+        with mock.patch.dict(settings.SENTRY_FEATURES, {"projects:feature": True}):
+            snapshot = manager.evaluate(self.organization, [self.project])
+        assert snapshot.has("projects:feature", self.project)
+
+    def test_evaluate_override(self):
+        manager = features.FeatureManager()
+        manager.add("projects:feature", ProjectFeature)
+        manager.add("projects:other-feature", ProjectFeature)
+        manager.add_handler(MockBatchHandler())
+
+        snapshot = manager.evaluate(self.organization, [self.project]).override(
+            {"projects:feature": False, "projects:other-feature": True, "projects:unknown": True}
+        )
+        assert snapshot.get_enabled(self.project) == ["projects:other-feature"]
+
+    def test_evaluate_cached_per_request(self):
+        manager = features.FeatureManager()
+        manager.add("projects:feature", ProjectFeature)
+
+        assert manager.evaluate(self.organization, [self.project]) is not manager.evaluate(
+            self.organization, [self.project]
+        )
+
+        with mock.patch("sentry.app.env.request", mock.Mock()):
+            snapshot = manager.evaluate(self.organization, [self.project])
+            assert manager.evaluate(self.organization, [self.project]) is snapshot
+            assert manager.evaluate(self.organization, []) is not snapshot
+
+        features.manager.clear_snapshot_cache()
@@ -0,0 +1,167 @@
+import time
+from unittest import mock
+
+from sentry.event_manager import _save_aggregate
+from sentry.eventstore.models import Event
+from sentry.grouping.grouphash_cache import (
+    _local_cache,
+    cache_grouphashes,
+    get_cached_grouphashes,
+    invalidate_grouphash_cache,
+)
+from sentry.grouping.result import CalculatedHashes
+from sentry.models import GroupHash, GroupStatus, GroupTombstone
+from sentry.testutils import TestCase
+from sentry.testutils.helpers import override_options
+from sentry.testutils.silo import region_silo_test
+
+
+@region_silo_test(stable=True)
+class GroupHashCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        _local_cache.clear()
+        invalidate_grouphash_cache(self.project.id)
+        self.group = self.create_group(project=self.project)
+        self.grouphash = GroupHash.objects.create(
+            project=self.project, hash="a" * 32, group=self.group
+        )
+
+    def test_miss_then_hit(self):
+        cached, version = get_cached_grouphashes(self.project, ["a" * 32])
+        assert cached is None
+        assert version is not None
+
+        cache_grouphashes(self.project, [self.grouphash], version)
+
+        with self.assertNumQueries(0):
+            cached, _ = get_cached_grouphashes(self.project, ["a" * 32])
+        assert [(gh.id, gh.hash, gh.group_id) for gh in cached] == [
+            (self.grouphash.id, "a" * 32, self.group.id)
+        ]
+        assert cached[0].state == GroupHash.State.UNLOCKED
+        assert cached[0].group_tombstone_id is None
+
+        _local_cache.clear()
+        with self.assertNumQueries(0):
+            cached, _ = get_cached_grouphashes(self.project, ["a" * 32])
+        assert [gh.id for gh in cached] == [self.grouphash.id]
+
+    def test_partial_hit_is_a_miss(self):
+        _, version = get_cached_grouphashes(self.project, ["a" * 32])
+        cache_grouphashes(self.project, [self.grouphash], version)
+
+        cached, _ = get_cached_grouphashes(self.project, ["a" * 32, "b" * 32])
+        assert cached is None
+
+    def test_uncacheable_grouphashes(self):
+        tombstone = GroupTombstone.objects.create(project_id=self.project.id, previous_group_id=1)
+        grouphashes = [
+            GroupHash.objects.create(project=self.project, hash="b" * 32),
+            GroupHash.objects.create(
+                project=self.project, hash="c" * 32, group_tombstone_id=tombstone.id
+            ),
+            GroupHash.objects.create(
+                project=self.project,
+                hash="d" * 32,
+                group=self.group,
+                state=GroupHash.State.LOCKED_IN_MIGRATION,
+            ),
+        ]
+        _, version = get_cached_grouphashes(self.project, ["b" * 32])
+        cache_grouphashes(self.project, grouphashes, version)
+
+        for grouphash in grouphashes:
+            assert get_cached_grouphashes(self.project, [grouphash.hash])[0] is None
+
+    def test_invalidate(self):
+        _, version = get_cached_grouphashes(self.project, ["a" * 32])
+        cache_grouphashes(self.project, [self.grouphash], version)
+        assert get_cached_grouphashes(self.project, ["a" * 32])[0] is not None
+
+        invalidate_grouphash_cache(self.project.id)
+        cached, new_version = get_cached_grouphashes(self.project, ["a" * 32])
+        assert cached is None
+        assert new_version != version
+
+    def test_store_after_invalidation_is_ignored(self):
+        _, version = get_cached_grouphashes(self.project, ["a" * 32])
+        invalidate_grouphash_cache(self.project.id)
+        cache_grouphashes(self.project, [self.grouphash], version)
+
+        assert get_cached_grouphashes(self.project, ["a" * 32])[0] is None
+
+
+@region_silo_test(stable=True)
+class SaveAggregateGroupHashCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        _local_cache.clear()
+        invalidate_grouphash_cache(self.project.id)
+
+    def save_aggregate(self):
+        event = Event(self.project.id, "89aeed6a472e4c5fb992d14df4d7e1b6", data={})
+        return _save_aggregate(
+            event,
+            hashes=CalculatedHashes(
+                hashes=["a" * 32, "b" * 32], hierarchical_hashes=[], tree_labels=[]
+            ),
+            release=None,
+            metadata={},
+            received_timestamp=time.time(),
+            level=10,
+            culprit="",
+        )
+
+    @override_options({"grouping.grouphash-cache.enabled": True})
+    def test_skips_get_or_create(self):
+        group_info = self.save_aggregate()
+        assert group_info.is_new
+        # Hashes of new groups are cached by the next event.
+        assert self.save_aggregate().group.id == group_info.group.id
+
+        with mock.patch.object(
+            GroupHash.objects, "get_or_create", side_effect=AssertionError
+        ) as get_or_create:
+            assert self.save_aggregate().group.id == group_info.group.id
+        assert not get_or_create.called
+
+    def test_disabled(self):
+        group_info = self.save_aggregate()
+        self.save_aggregate()
+
+        with mock.patch.object(
+            GroupHash.objects, "get_or_create", wraps=GroupHash.objects.get_or_create
+        ) as get_or_create:
+            assert self.save_aggregate().group.id == group_info.group.id
+        assert get_or_create.call_count == 2
+
+    @override_options({"grouping.grouphash-cache.enabled": True})
+    def test_stale_group_is_resolved_from_database(self):
+        group = self.save_aggregate().group
+        self.save_aggregate()
+
+        # Simulate a merge that the cache was not told about.
+        new_group = self.create_group(project=self.project)
+        group.update(status=GroupStatus.PENDING_MERGE)
+        GroupHash.objects.filter(group=group).update(group=new_group)
+
+        assert self.save_aggregate().group.id == new_group.id
+
+        with mock.patch.object(
+            GroupHash.objects, "get_or_create", side_effect=AssertionError
+        ) as get_or_create:
+            assert self.save_aggregate().group.id == new_group.id
+        assert not get_or_create.called
+
+    @override_options({"grouping.grouphash-cache.enabled": True})
+    def test_deleted_group_is_resolved_from_database(self):
+        group = self.save_aggregate().group
+        self.save_aggregate()
+
+        GroupHash.objects.filter(group=group).delete()
+        group.delete()
+
+        group_info = self.save_aggregate()
+        assert group_info.is_new
+        assert group_info.group.id != group.id
@@ -6,9 +6,13 @@ from freezegun import freeze_time
 from sentry.ingest.transaction_clusterer import ClustererNamespace
 from sentry.ingest.transaction_clusterer.base import ReplacementRule
 from sentry.ingest.transaction_clusterer.datasource.redis import (
+    SampleBuffer,
     _get_projects_key,
     _get_redis_key,
     _record_sample,
+    _record_samples,
+    _sample_buffer,
+    add_to_set,
     clear_samples,
     get_active_projects,
     get_redis_client,
@@ -146,6 +150,100 @@ def test_distribution():
     assert freshness > 800, freshness
 
 
+@mock.patch("sentry.ingest.transaction_clusterer.datasource.redis.MAX_SET_SIZE", 5)
+def test_record_samples():
+    project = Project(id=101, name="p1", organization=Organization(pk=66))
+    client = get_redis_client()
+
+    _record_samples(ClustererNamespace.TRANSACTIONS, project, ["a", "b", "a"])
+    assert set(get_transaction_names(project)) == {"a", "b"}
+    assert client.smembers(_get_projects_key(ClustererNamespace.TRANSACTIONS)) == {"101"}
+
+    _record_samples(ClustererNamespace.TRANSACTIONS, project, [str(i) for i in range(10)])
+    assert len(set(get_transaction_names(project))) == 5
+
+
+@mock.patch("sentry.ingest.transaction_clusterer.datasource.redis.MAX_SET_SIZE", 100)
+def test_record_samples_distribution():
+    """A batch is capped after every value, like individual writes are"""
+    project = Project(id=103, name="", organization=Organization(pk=66))
+    _record_samples(ClustererNamespace.TRANSACTIONS, project, [str(i) for i in range(1000)])
+
+    freshness = sum(map(int, get_transaction_names(project))) / 100
+    assert freshness > 800, freshness
+
+
+def test_sample_buffer():
+    project1 = Project(id=101, name="p1", organization=Organization(pk=66))
+    project2 = Project(id=102, name="p2", organization=Organization(pk=66))
+    buffer = SampleBuffer(max_samples=6, flush_interval=60)
+
+    with mock.patch(
+        "sentry.ingest.transaction_clusterer.datasource.redis.add_to_set",
+        wraps=add_to_set,
+    ) as add_to_set_mock:
+        for name in ("/a", "/b", "/a", "/a", "/c"):
+            buffer.add(ClustererNamespace.TRANSACTIONS, project1, name)
+        assert add_to_set_mock.call_count == 0
+        assert set(get_transaction_names(project1)) == set()
+
+        buffer.add(ClustererNamespace.TRANSACTIONS, project2, "/d")
+
+        # Six samples were written with one call per project.
+        assert add_to_set_mock.call_count == 2
+
+    assert set(get_transaction_names(project1)) == {"/a", "/b", "/c"}
+    assert set(get_transaction_names(project2)) == {"/d"}
+    client = get_redis_client()
+    assert client.smembers(_get_projects_key(ClustererNamespace.TRANSACTIONS)) == {"101", "102"}
+
+
+def test_sample_buffer_flush_interval():
+    project = Project(id=101, name="p1", organization=Organization(pk=66))
+    with freeze_time("2000-01-01 01:00:00") as frozen_time:
+        buffer = SampleBuffer(max_samples=100, flush_interval=10)
+        buffer.add(ClustererNamespace.TRANSACTIONS, project, "/a")
+        assert set(get_transaction_names(project)) == set()
+
+        frozen_time.tick(10)
+        buffer.add(ClustererNamespace.TRANSACTIONS, project, "/b")
+        assert set(get_transaction_names(project)) == {"/a", "/b"}
+
+
+def test_sample_buffer_flush_idle():
+    project = Project(id=101, name="p1", organization=Organization(pk=66))
+    with freeze_time("2000-01-01 01:00:00") as frozen_time, mock.patch(
+        "sentry.ingest.transaction_clusterer.datasource.redis.threading.Thread"
+    ) as thread:
+        buffer = SampleBuffer(max_samples=100, flush_interval=10)
+        buffer.add(ClustererNamespace.TRANSACTIONS, project, "/a")
+        buffer.add(ClustererNamespace.TRANSACTIONS, project, "/b")
+        # The background flusher is started once.
+        assert thread.call_count == 1
+
+        buffer.flush_idle()
+        assert set(get_transaction_names(project)) == set()
+
+        frozen_time.tick(10)
+        buffer.flush_idle()
+        assert set(get_transaction_names(project)) == {"/a", "/b"}
+
+
+@django_db_all
+def test_record_transaction_name_buffered(default_organization):
+    project = Project(id=111, name="project", organization_id=default_organization.id)
+    event_data = {"transaction": "/a/b/c", "transaction_info": {"source": "url"}}
+
+    # Start with an empty buffer that was just flushed.
+    _sample_buffer.flush()
+    with override_options({"txnames.sample-buffer.enabled": True}):
+        record_transaction_name(project, event_data)
+        assert set(get_transaction_names(project)) == set()
+
+        _sample_buffer.flush()
+        assert set(get_transaction_names(project)) == {"/a/b/c"}
+
+
 @mock.patch("sentry.ingest.transaction_clusterer.datasource.redis._record_sample")
 @django_db_all
 @pytest.mark.parametrize(
@@ -24,6 +24,13 @@ class DatadogMetricsBackendTest(TestCase):
             "sentrytest.foo", 30, sample_rate=1, tags=["instance:bar"], host=get_hostname()
         )
 
+    @patch("datadog.threadstats.base.ThreadStats.timing")
+    def test_presampled_timing(self, mock_timing):
+        self.backend.presampled_timing("foo", 30, instance="bar", sample_rate=0.1)
+        mock_timing.assert_called_once_with(
+            "sentrytest.foo", 30, sample_rate=0.1, tags=["instance:bar"], host=get_hostname()
+        )
+
     @patch("datadog.threadstats.base.ThreadStats.gauge")
     def test_gauge(self, mock_gauge):
         self.backend.gauge("foo", 5, instance="bar")
@@ -27,6 +27,12 @@ def test_timing(mock_timing, statsd_backend):
     mock_timing.assert_called_once_with("sentrytest.foo", 30, 1)
 
 
+@patch("statsd.StatsClient._send_stat")
+def test_presampled_timing(mock_send_stat, statsd_backend):
+    statsd_backend.presampled_timing("foo", 30, sample_rate=0.1)
+    mock_send_stat.assert_called_once_with("sentrytest.foo", "30.000000|ms|@0.1", 1)
+
+
 @patch("statsd.StatsClient.gauge")
 def test_gauge(mock_gauge, statsd_backend):
     statsd_backend.gauge("foo", 5)
@@ -0,0 +1,49 @@
+from sentry.models import Environment, GroupEnvironment
+from sentry.testutils import TestCase
+from sentry.testutils.silo import region_silo_test
+
+
+@region_silo_test(stable=True)
+class GetOrCreateManyTest(TestCase):
+    def test_simple(self):
+        group = self.create_group(project=self.project)
+        other_group = self.create_group(project=self.project)
+        release = self.create_release(project=self.project)
+        env = Environment.objects.create(organization_id=self.organization.id, name="prod")
+
+        existing, created = GroupEnvironment.get_or_create(group_id=group.id, environment_id=env.id)
+        assert created
+
+        group_environments = GroupEnvironment.get_or_create_many(
+            {(group.id, env.id): release.id, (other_group.id, env.id): release.id}
+        )
+
+        instance, created = group_environments[(group.id, env.id)]
+        assert instance.id == existing.id
+        assert instance.first_release_id is None
+        assert not created
+
+        instance, created = group_environments[(other_group.id, env.id)]
+        assert instance.group_id == other_group.id
+        assert instance.environment_id == env.id
+        assert instance.first_release_id == release.id
+        assert created
+
+        with self.assertNumQueries(0):
+            group_environments = GroupEnvironment.get_or_create_many(
+                {(other_group.id, env.id): release.id}
+            )
+        assert group_environments[(other_group.id, env.id)] == (instance, False)
+
+    def test_concurrently_created(self):
+        group = self.create_group(project=self.project)
+        env = Environment.objects.create(organization_id=self.organization.id, name="prod")
+
+        # Created by another process, bypassing the cache of this one.
+        existing = GroupEnvironment.objects.create(group_id=group.id, environment_id=env.id)
+
+        instance, created = GroupEnvironment.get_or_create_many({(group.id, env.id): None})[
+            (group.id, env.id)
+        ]
+        assert instance.id == existing.id
+        assert not created
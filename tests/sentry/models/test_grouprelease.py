@@ -46,3 +46,49 @@ class GetOrCreateTest(TestCase):
 
         assert grouprelease.first_seen == datetime
         assert grouprelease.last_seen == datetime_new
+
+
+@region_silo_test(stable=True)
+class GetOrCreateManyTest(TestCase):
+    def test_simple(self):
+        project = self.create_project()
+        group = self.create_group(project=project)
+        other_group = self.create_group(project=project)
+        release = Release.objects.create(version="abc", organization_id=project.organization_id)
+        release.add_project(project)
+        env = Environment.objects.create(organization_id=project.organization_id, name="prod")
+        datetime = timezone.now()
+
+        existing = GroupRelease.get_or_create(
+            group=group, release=release, environment=env, datetime=datetime
+        )
+
+        datetime_new = datetime + timedelta(days=1)
+        datetime_first = datetime + timedelta(hours=1)
+        group_releases = GroupRelease.get_or_create_many(
+            {
+                (group, release, env): (datetime_first, datetime_new),
+                (other_group, release, env): (datetime_first, datetime_new),
+            }
+        )
+
+        assert group_releases[(group, release, env)].id == existing.id
+        assert group_releases[(group, release, env)].first_seen == datetime
+        assert group_releases[(group, release, env)].last_seen == datetime_new
+
+        created = group_releases[(other_group, release, env)]
+        assert created.group_id == other_group.id
+        assert created.project_id == project.id
+        assert created.environment == "prod"
+        assert created.first_seen == datetime_first
+        assert created.last_seen == datetime_new
+        assert GroupRelease.objects.filter(group_id=other_group.id).count() == 1
+
+        with self.assertNumQueries(0):
+            group_releases = GroupRelease.get_or_create_many(
+                {
+                    (group, release, env): (datetime_new, datetime_new),
+                    (other_group, release, env): (datetime_new, datetime_new),
+                }
+            )
+        assert group_releases[(other_group, release, env)].id == created.id
@@ -9,6 +9,7 @@ from sentry.models import (
     UserEmail,
 )
 from sentry.models.groupowner import GroupOwner, GroupOwnerType, OwnerRuleType
+from sentry.models.projectownership import get_ownership_index
 from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema, resolve_actors
 from sentry.services.hybrid_cloud.user.service import user_service
 from sentry.testutils import TestCase
@@ -558,6 +559,37 @@ class ProjectOwnershipTestCase(TestCase):
             self.project.id, {"stacktrace": {"frames": [frame]}}
         ) == ([ActorTuple(self.team.id, Team)], [rule])
 
+    def test_get_owners_schema_updated(self):
+        rule_a = Rule(Matcher("path", "*.py"), [Owner("team", self.team.slug)])
+        rule_b = Rule(Matcher("path", "src/*"), [Owner("user", self.user.email)])
+        data = {"stacktrace": {"frames": [{"filename": "src/foo.py"}]}}
+
+        ownership = ProjectOwnership.objects.create(
+            project_id=self.project.id, schema=dump_schema([rule_a]), fallthrough=True
+        )
+        self.assert_ownership_equals(
+            ProjectOwnership.get_owners(self.project.id, data),
+            ([ActorTuple(self.team.id, Team)], [rule_a]),
+        )
+
+        # The compiled schema is rebuilt once the rules change.
+        ownership.schema = dump_schema([rule_b])
+        ownership.save()
+        self.assert_ownership_equals(
+            ProjectOwnership.get_owners(self.project.id, data),
+            ([ActorTuple(self.user.id, User)], [rule_b]),
+        )
+
+    def test_get_ownership_index_cached(self):
+        rule = Rule(Matcher("path", "*.py"), [Owner("team", self.team.slug)])
+        other_rule = Rule(Matcher("path", "*.js"), [Owner("team", self.team.slug)])
+        schema = dump_schema([rule])
+
+        index = get_ownership_index(self.project.id, schema)
+        assert get_ownership_index(self.project.id, dump_schema([rule])) is index
+        assert get_ownership_index(self.project2.id, schema) is not index
+        assert get_ownership_index(self.project.id, dump_schema([other_rule])) is not index
+
     def test_saves_without_either_auto_assignment_option(self):
         # Project has group for autoassigned_owner_cache
         self.group = self.create_group(project=self.project)
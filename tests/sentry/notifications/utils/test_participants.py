@@ -2,6 +2,8 @@ from datetime import timedelta
 from typing import Iterable, Mapping, Optional, Sequence, Set, Union
 
 import pytest
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from sentry.eventstore.models import Event
@@ -21,7 +23,9 @@ from sentry.notifications.utils.participants import (
     get_fallthrough_recipients,
     get_owner_reason,
     get_owners,
+    get_owners_many,
     get_send_to,
+    get_send_to_many,
 )
 from sentry.ownership import grammar
 from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema
@@ -371,6 +375,37 @@ class GetSendToOwnersTest(_ParticipantsTest):
 
         assert self.get_send_to_owners(event) == {}
 
+    def test_send_to_many(self):
+        events = [
+            self.store_event_owners(filename)
+            for filename in ("empty.lol", "user.jsx", "team.py", "everyone.cbl", "no_rule.cpp")
+        ]
+        expected = {event: self.get_send_to_owners(event) for event in events}
+
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            send_to = get_send_to_many(self.project, ActionTargetType.ISSUE_OWNERS, events)
+        assert send_to == expected
+
+        # Settings are looked up once for the teams and once for the users of all events
+        setting_queries = [
+            query
+            for query in queries.captured_queries
+            if "sentry_notificationsetting" in query["sql"]
+        ]
+        assert len(setting_queries) == 2
+
+    def test_send_to_many_does_not_query_per_event(self):
+        def count_queries(events: Sequence[Event]) -> int:
+            with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+                get_send_to_many(self.project, ActionTargetType.ISSUE_OWNERS, events)
+            return len(queries.captured_queries)
+
+        # Events without matching rules fall through to the project members, which
+        # are only resolved once. The first call warms up the caches.
+        events = [self.store_event_owners(f"no_rule_{i}.cpp") for i in range(5)]
+        get_send_to_many(self.project, ActionTargetType.ISSUE_OWNERS, events)
+        assert count_queries(events[:1]) == count_queries(events)
+
     @with_feature("organizations:streamline-targeting-context")
     def test_send_to_suspect_committers(self):
         """
@@ -677,6 +712,30 @@ class GetOwnersCase(_ParticipantsTest):
         self.assert_recipients(expected=[self.user_1], received=recipients)
         assert outcome == "match"
 
+    # If matched, and no all-recipients flag, the owner of the last matching rule is notified
+    def test_get_owners_single_participant_last_owner(self):
+        self.create_ownership(self.project, [self.rule_3, self.rule_2, self.rule_1])
+        event = self.create_event(self.project)
+        recipients, outcome = get_owners(project=self.project, event=event)
+        assert recipients == [RpcActor.from_object(self.team_1)]
+        assert outcome == "match"
+
+    def test_get_owners_many_keeps_rule_order(self):
+        self.create_ownership(self.project, [self.rule_3, self.rule_1, self.rule_2])
+        event = self.create_event(self.project)
+        result = get_owners_many(project=self.project, events=[event, None])
+        assert result[event] == ([RpcActor.from_object(self.team_2)], "match")
+        assert result[None][1] == "everyone"
+
+        with self.feature("organizations:notification-all-recipients"):
+            recipients, outcome = get_owners_many(project=self.project, events=[event])[event]
+        assert recipients == [
+            RpcActor.from_object(self.user_1),
+            RpcActor.from_object(self.team_1),
+            RpcActor.from_object(self.team_2),
+        ]
+        assert outcome == "match"
+
     # If matched, we don't look at the fallthrough flag
     def test_get_owners_match_ignores_fallthrough(self):
         self.create_ownership(self.project, [self.rule_1, self.rule_2, self.rule_3], True)
@@ -12,6 +12,7 @@ from sentry.options.manager import UpdateChannel
 from sentry.options.store import OptionsStore
 from sentry.testutils import TestCase
 from sentry.testutils.silo import no_silo_test
+from sentry.testutils.skips import requires_benchmark
 
 
 @no_silo_test(stable=True)
@@ -161,3 +162,71 @@ class OptionsStoreTest(TestCase):
         mocked_time.return_value = 26
         store.clean_local_cache()
         assert not store._local_cache
+
+    def test_subscribe(self):
+        store, key = self.store, self.key
+        store.set(key, "bar", UpdateChannel.CLI)
+        store.subscribe(poll_interval=None)
+        assert store.subscribed
+
+        with patch.object(Option.objects, "get_queryset", side_effect=RuntimeError()):
+            with patch.object(store.cache, "get", side_effect=RuntimeError()):
+                assert store.get(key) == "bar"
+                assert store.get(self.make_key()) is None
+
+        store.set(key, "baz", UpdateChannel.CLI)
+        assert store.get(key) == "baz"
+        store.delete(key)
+        assert store.get(key) is None
+
+        store.unsubscribe()
+        assert not store.subscribed
+
+    def test_subscribe_change_in_other_process(self):
+        store, key = self.store, self.key
+        other_store = OptionsStore(cache=store.cache)
+        store.subscribe(poll_interval=None)
+
+        assert not store.refresh_snapshot()
+        other_store.set(key, "bar", UpdateChannel.CLI)
+        assert store.get(key) is None
+
+        assert store.refresh_snapshot()
+        assert store.get(key) == "bar"
+        assert not store.refresh_snapshot()
+
+    def test_subscribe_refresh_interval(self):
+        store, key = self.store, self.key
+        store.subscribe(poll_interval=None, refresh_interval=0)
+
+        # Changed without rotating the version, e.g. in a shell.
+        Option.objects.create(key=key.name, value="bar")
+        assert store.refresh_snapshot()
+        assert store.get(key) == "bar"
+
+    def test_subscribe_manager_defaults(self):
+        self.store.subscribe(poll_interval=None)
+        self.manager.register("subscribed-option", default="foo")
+
+        with patch.object(self.store, "set_cache") as set_cache:
+            assert self.manager.get("subscribed-option") == "foo"
+        assert not set_cache.called
+
+
+@requires_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("subscribed", [False, True])
+def test_benchmark_options_get(subscribed, benchmark):
+    store = OptionsStore(cache=LocMemCache("test", settings.CACHES["default"]))
+    manager = OptionsManager(store=store)
+    manager.register("benchmark-stored", default=0)
+    manager.register("benchmark-default", default=0)
+    manager.set("benchmark-stored", 1)
+    if subscribed:
+        store.subscribe(poll_interval=None)
+
+    def get():
+        manager.get("benchmark-stored")
+        manager.get("benchmark-default")
+
+    benchmark(get)
@@ -3,6 +3,7 @@ import pytest
 from sentry.ownership.grammar import (
     Matcher,
     Owner,
+    OwnershipIndex,
     Rule,
     convert_codeowners_syntax,
     convert_schema_to_rules_text,
@@ -12,6 +13,7 @@ from sentry.ownership.grammar import (
     parse_code_owners,
     parse_rules,
 )
+from sentry.testutils.skips import requires_benchmark
 
 fixture_data = """
 # cool stuff comment
@@ -511,6 +513,7 @@ def _assert_matcher(matcher: Matcher, path_details, expected):
     """Helper function to reduce repeated code"""
     frames = {"stacktrace": {"frames": path_details}}
     assert matcher.test(frames) == expected
+    assert (OwnershipIndex([matcher]).matching_rule_indexes(frames) == [0]) == expected
 
 
 @pytest.mark.parametrize(
@@ -881,6 +884,86 @@ def test_codeowners_match_threads():
     assert Matcher("codeowners", "/usr/*/src/*/app.py").test(data)
 
 
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"request": {"url": "http://google.com/foo"}},
+        {"tags": [["foo", "bar baz"]], "platform": "python"},
+        {
+            "stacktrace": {
+                "frames": [
+                    {"filename": "src/sentry/app.py", "module": "foo.bar"},
+                    {"abs_path": "/usr/src/components/Button.tsx"},
+                ]
+            }
+        },
+        {
+            "platform": "javascript",
+            "exception": {
+                "values": [
+                    {
+                        "stacktrace": {
+                            "frames": [
+                                {"filename": "frontend/app.ts"},
+                                {"filename": "FRONTEND/index.js"},
+                                None,
+                                {"abs_path": "src/components/index.ts", "module": "foo bar"},
+                            ]
+                        }
+                    }
+                ]
+            },
+        },
+    ],
+)
+def test_ownership_index(data):
+    rules = parse_rules(fixture_data)
+    index = OwnershipIndex.from_schema(dump_schema(rules))
+    expected = [i for i, rule in enumerate(rules) if rule.test(data)]
+    assert index.matching_rule_indexes(data) == expected
+
+
+def test_ownership_index_invalid_version():
+    with pytest.raises(RuntimeError):
+        OwnershipIndex.from_schema({"$version": 2, "rules": []})
+
+
+def make_codeowners_schema(rules_count):
+    rules = []
+    for i in range(rules_count):
+        if i % 10 == 0:
+            matcher = {"type": "path", "pattern": f"src/app/team{i}/*.py"}
+        elif i % 25 == 1:
+            matcher = {"type": "codeowners", "pattern": f"*.ext{i}"}
+        else:
+            matcher = {"type": "codeowners", "pattern": f"/src/app/team{i}/module/"}
+        rules.append({"matcher": matcher, "owners": [{"type": "team", "identifier": f"team{i}"}]})
+    return {"$version": 1, "rules": rules}
+
+
+@requires_benchmark
+@pytest.mark.parametrize("compiled", [False, True])
+def test_benchmark_ownership_rules_5k(benchmark, compiled):
+    schema = make_codeowners_schema(5000)
+    frames = [
+        {
+            "filename": f"src/app/team{i * 100}/module/file{i}.py",
+            "abs_path": f"/srv/src/app/team{i * 100}/module/file{i}.py",
+        }
+        for i in range(50)
+    ]
+    data = {"platform": "python", "exception": {"values": [{"stacktrace": {"frames": frames}}]}}
+    index = OwnershipIndex.from_schema(schema)
+
+    def match():
+        if compiled:
+            return index.matching_rule_indexes(data)
+        return [i for i, rule in enumerate(load_schema(schema)) if rule.test(data)]
+
+    assert len(benchmark(match)) == 50
+
+
 def test_parse_code_owners():
     assert parse_code_owners(codeowners_fixture_data) == (
         ["@getsentry/frontend", "@getsentry/docs", "@getsentry/ecosystem"],
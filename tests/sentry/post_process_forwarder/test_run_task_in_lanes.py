@@ -0,0 +1,163 @@
+import threading
+import time
+from datetime import datetime
+from typing import List
+from unittest.mock import Mock, call, patch
+
+import pytest
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.processing.strategies import MessageRejected
+from arroyo.types import BrokerValue, Message, Partition, Topic
+
+from sentry.post_process_forwarder.post_process_forwarder import RunTaskInLanes
+
+partition = Partition(Topic("events"), 0)
+
+
+def make_message(key: int, offset: int) -> Message[KafkaPayload]:
+    return Message(
+        BrokerValue(KafkaPayload(str(key).encode(), b"", []), partition, offset, datetime.now())
+    )
+
+
+def get_key(message: Message[KafkaPayload]) -> int:
+    return int(message.payload.key)
+
+
+def wait_for(strategy: RunTaskInLanes, next_step: Mock, count: int) -> None:
+    for _ in range(50):
+        strategy.poll()
+        if next_step.submit.call_count >= count:
+            return
+        time.sleep(0.01)
+
+
+def committed_offsets(next_step: Mock) -> List[int]:
+    return [c.args[0].committable[partition] for c in next_step.submit.call_args_list]
+
+
+def test_same_key_runs_in_order() -> None:
+    processed = []
+
+    def function(message: Message[KafkaPayload]) -> None:
+        if message.value.offset == 0:
+            time.sleep(0.1)
+        processed.append(message.value.offset)
+
+    next_step = Mock()
+    strategy = RunTaskInLanes(function, get_key, 4, 100, next_step)
+    for offset in range(3):
+        strategy.submit(make_message(1, offset))
+
+    wait_for(strategy, next_step, 3)
+    assert processed == [0, 1, 2]
+    assert committed_offsets(next_step) == [1, 2, 3]
+
+
+def test_commits_up_to_oldest_pending_message() -> None:
+    release = threading.Event()
+
+    def function(message: Message[KafkaPayload]) -> None:
+        if get_key(message) == 0:
+            release.wait(5)
+
+    next_step = Mock()
+    strategy = RunTaskInLanes(function, get_key, 2, 100, next_step)
+    strategy.submit(make_message(0, 0))
+    strategy.submit(make_message(1, 1))
+
+    # the message of the other lane is done, but must not be committed
+    # before the blocked one.
+    time.sleep(0.05)
+    strategy.poll()
+    assert next_step.submit.call_count == 0
+
+    release.set()
+    wait_for(strategy, next_step, 2)
+    assert committed_offsets(next_step) == [1, 2]
+
+    strategy.close()
+    strategy.join()
+    next_step.close.assert_called_once_with()
+
+
+def test_rejects_messages_over_max_pending() -> None:
+    release = threading.Event()
+    next_step = Mock()
+    strategy = RunTaskInLanes(lambda message: release.wait(5), get_key, 2, 2, next_step)
+    strategy.submit(make_message(0, 0))
+    strategy.submit(make_message(1, 1))
+
+    with pytest.raises(MessageRejected):
+        strategy.submit(make_message(0, 2))
+
+    release.set()
+    strategy.close()
+    strategy.join(5)
+    assert committed_offsets(next_step) == [1, 2]
+
+
+def test_join_without_timeout_waits_for_pending_messages() -> None:
+    def function(message: Message[KafkaPayload]) -> None:
+        time.sleep(0.05)
+
+    next_step = Mock()
+    strategy = RunTaskInLanes(function, get_key, 2, 100, next_step)
+    for offset in range(4):
+        strategy.submit(make_message(offset % 2, offset))
+
+    strategy.close()
+    strategy.join(None)
+    assert committed_offsets(next_step) == [1, 2, 3, 4]
+    next_step.join.assert_called_once_with(None)
+
+
+def test_join_timeout_cancels_queued_messages() -> None:
+    release = threading.Event()
+    processed = []
+
+    def function(message: Message[KafkaPayload]) -> None:
+        release.wait(5)
+        processed.append(message.value.offset)
+
+    next_step = Mock()
+    strategy = RunTaskInLanes(function, get_key, 1, 100, next_step)
+    for offset in range(3):
+        strategy.submit(make_message(0, offset))
+
+    strategy.close()
+    strategy.join(0.05)
+    release.set()
+    time.sleep(0.05)
+
+    # Only the message that was already running completes.
+    assert processed == [0]
+    assert next_step.submit.call_count == 0
+
+
+@patch("sentry.post_process_forwarder.post_process_forwarder.metrics")
+def test_reports_lane_metrics(mock_metrics: Mock) -> None:
+    release = threading.Event()
+
+    def function(message: Message[KafkaPayload]) -> None:
+        if get_key(message) == 0:
+            release.wait(5)
+
+    strategy = RunTaskInLanes(function, get_key, 2, 100, Mock())
+    strategy.submit(make_message(0, 0))
+    strategy.submit(make_message(0, 1))
+    time.sleep(0.05)
+    strategy.poll()
+
+    assert (
+        call("post_process_forwarder.lane.pending", 2, tags={"lane": "0"})
+        in mock_metrics.gauge.call_args_list
+    )
+    assert (
+        call("post_process_forwarder.lane.pending", 0, tags={"lane": "1"})
+        in mock_metrics.gauge.call_args_list
+    )
+
+    release.set()
+    strategy.close()
+    strategy.join(5)
@@ -79,6 +79,30 @@ def test_adjust_instruction_addr_sample_format():
     assert frames[4] == {"instruction_addr": "0xdeadbeef", "adjust_instruction_addr": False}
 
 
+def test_adjust_instruction_addr_sample_format_shared_leaf():
+    profile = {
+        "version": "1",
+        "platform": "cocoa",
+        "profile": {
+            "frames": [
+                {"instruction_addr": "0xdeadbeef"},
+                {"instruction_addr": "0xbeefdead"},
+            ],
+            "stacks": [[0, 1], [0], [1, 0], [0, 1]],
+        },
+        "debug_meta": {"images": []},
+    }
+
+    _, stacktraces, _ = _prepare_frames_from_profile(profile)
+
+    # stacks with the same leaf frame share its copy
+    assert profile["profile"]["stacks"] == [[2, 1], [2], [3, 0], [2, 1]]
+    assert stacktraces[0]["frames"][2:] == [
+        {"instruction_addr": "0xdeadbeef", "adjust_instruction_addr": False},
+        {"instruction_addr": "0xbeefdead", "adjust_instruction_addr": False},
+    ]
+
+
 def test_adjust_instruction_addr_original_format():
     profile = {
         "platform": "cocoa",
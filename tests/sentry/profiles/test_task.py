@@ -1,3 +1,6 @@
+import random
+from array import array
+from copy import deepcopy
 from functools import cached_property
 from io import BytesIO
 from os.path import join
@@ -8,9 +11,16 @@ from django.urls import reverse
 
 from sentry.lang.javascript.processing import _handles_frame as is_valid_javascript_frame
 from sentry.models import Project
-from sentry.profiles.task import _deobfuscate, _normalize, _process_symbolicator_results_for_sample
+from sentry.profiles.task import (
+    _deobfuscate,
+    _normalize,
+    _prepare_frames_from_profile,
+    _process_symbolicator_results_for_sample,
+    get_frame_index_map,
+)
 from sentry.testutils import TestCase
 from sentry.testutils.factories import get_fixture_path
+from sentry.testutils.skips import requires_benchmark
 from sentry.utils import json
 
 PROFILES_FIXTURES_PATH = get_fixture_path("profiles")
@@ -419,3 +429,91 @@ class ProfilesProcessTaskTest(TestCase):
         _process_symbolicator_results_for_sample(profile, stacktraces, frames_sent)
 
         assert profile["profile"]["stacks"] == [[0, 1, 2, 3]]
+
+
+def test_get_frame_index_map():
+    frames = [
+        {"original_index": 0},
+        {"original_index": 0},
+        {"original_index": 1},
+        # no frame originated from the frame at index 2
+        {"original_index": 3},
+        {"original_index": 3},
+        {"original_index": 3},
+    ]
+    assert get_frame_index_map(frames) == array("l", [0, 2, 3, 3, 6])
+    assert get_frame_index_map([{}, {}]) == array("l", [0, 1, 2])
+    assert get_frame_index_map([]) == array("l", [0])
+
+
+def make_rust_profile(frames_count: int, stacks_count: int, stack_depth: int):
+    rng = random.Random(0)
+    return {
+        "version": "1",
+        "platform": "rust",
+        "debug_meta": {"images": []},
+        "profile": {
+            "frames": [
+                {"instruction_addr": hex(0x55BD050E0000 + i * 16), "lang": "rust"}
+                for i in range(frames_count)
+            ],
+            # most samples land in a few hot functions
+            "stacks": [
+                [rng.randrange(frames_count // 100)]
+                + [rng.randrange(frames_count) for _ in range(stack_depth - 1)]
+                for _ in range(stacks_count)
+            ],
+            "samples": [{"stack_id": i} for i in range(stacks_count)],
+        },
+    }
+
+
+def fake_symbolicate(frames):
+    # every tenth frame has a function inlined into it
+    symbolicated_frames = []
+    for i, frame in enumerate(frames):
+        address = int(frame["instruction_addr"], 16)
+        if address % 160 == 0:
+            symbolicated_frames.append({"function": f"inlined_{address}", "original_index": i})
+        symbolicated_frames.append(
+            {**frame, "function": f"function_{address}", "original_index": i}
+        )
+    return [{"frames": symbolicated_frames}]
+
+
+def test_process_symbolicator_results_for_sample_inlined_frames():
+    profile = make_rust_profile(frames_count=100, stacks_count=50, stack_depth=20)
+    expected_stacks = []
+    for stack in profile["profile"]["stacks"]:
+        expected_stack = []
+        for i in stack:
+            address = int(profile["profile"]["frames"][i]["instruction_addr"], 16)
+            if address % 160 == 0:
+                expected_stack.append(f"inlined_{address}")
+            expected_stack.append(f"function_{address}")
+        expected_stacks.append(expected_stack)
+
+    _, stacktraces, frames_sent = _prepare_frames_from_profile(profile)
+    stacktraces = fake_symbolicate(stacktraces[0]["frames"])
+    _process_symbolicator_results_for_sample(profile, stacktraces, frames_sent)
+
+    frames = profile["profile"]["frames"]
+    stacks = [[frames[i]["function"] for i in stack] for stack in profile["profile"]["stacks"]]
+    assert stacks == expected_stacks
+
+
+@requires_benchmark
+def test_benchmark_symbolicate_large_sample_profile(benchmark):
+    profile = make_rust_profile(frames_count=20000, stacks_count=50000, stack_depth=40)
+
+    def setup():
+        return (deepcopy(profile),), {}
+
+    def symbolicate(profile):
+        _, stacktraces, frames_sent = _prepare_frames_from_profile(profile)
+        stacktraces = fake_symbolicate(stacktraces[0]["frames"])
+        _process_symbolicator_results_for_sample(profile, stacktraces, frames_sent)
+        return profile
+
+    result = benchmark.pedantic(symbolicate, setup=setup, rounds=5)
+    assert len(result["profile"]["stacks"]) == 50000
@@ -0,0 +1,100 @@
+import itertools
+
+import pytest
+from freezegun import freeze_time
+
+from sentry.ratelimits.hybrid import HybridRateLimiter
+from sentry.ratelimits.redis import RedisRateLimiter
+from sentry.testutils import TestCase
+from sentry.testutils.silo import region_silo_test
+from sentry.testutils.skips import requires_benchmark
+
+
+@region_silo_test(stable=True)
+class HybridRateLimiterTest(TestCase):
+    def setUp(self):
+        self.backend = HybridRateLimiter()
+        self.redis_backend = RedisRateLimiter()
+
+    def test_simple_key(self):
+        with freeze_time("2000-01-01"):
+            assert not self.backend.is_limited("foo", 1)
+            assert self.backend.is_limited("foo", 1)
+
+    def test_limit_is_exact_for_single_process(self):
+        with freeze_time("2000-01-01"):
+            results = [self.backend.is_limited("foo", 10, self.project) for _ in range(20)]
+            assert results == [False] * 10 + [True] * 10
+
+    def test_local_decisions_are_synced(self):
+        with freeze_time("2000-01-01"):
+            for _ in range(5):
+                assert not self.backend.is_limited("foo", 100)
+
+            # Only the first check went to redis.
+            assert self.redis_backend.current_value("foo") == 1
+            assert self.backend.current_value("foo") == 5
+
+            self.backend.sync()
+            assert self.redis_backend.current_value("foo") == 5
+
+    def test_sync_interval(self):
+        with freeze_time("2000-01-01") as frozen_time:
+            backend = HybridRateLimiter(sync_interval=0.5)
+            for _ in range(5):
+                backend.is_limited("foo", 100, window=60)
+            assert self.redis_backend.current_value("foo", window=60) == 1
+
+            frozen_time.tick(1)
+            backend.is_limited("foo", 100, window=60)
+            assert self.redis_backend.current_value("foo", window=60) == 5
+
+    def test_max_local_pending(self):
+        backend = HybridRateLimiter(max_local_pending=2)
+        with freeze_time("2000-01-01"):
+            for _ in range(7):
+                backend.is_limited("foo", 100)
+            # 1 remote, 2 local, 1 remote (+2), 2 local, 1 remote (+2)
+            assert self.redis_backend.current_value("foo") == 7
+
+    def test_is_limited_with_value(self):
+        with freeze_time("2000-01-01") as frozen_time:
+            limited, value, reset_time = self.backend.is_limited_with_value("foo", 1, window=5)
+            assert not limited
+            assert value == 1
+
+            limited, value, _ = self.backend.is_limited_with_value("foo", 1, window=5)
+            assert limited
+            assert value == 2
+
+            frozen_time.tick(5)
+            limited, value, next_reset_time = self.backend.is_limited_with_value("foo", 1, window=5)
+            assert not limited
+            assert value == 1
+            assert next_reset_time == reset_time + 5
+
+    def test_error_bound_with_multiple_processes(self):
+        limit = 100
+        max_local_pending = 5
+        processes = [HybridRateLimiter(max_local_pending=max_local_pending) for _ in range(4)]
+
+        with freeze_time("2000-01-01"):
+            allowed = sum(
+                not backend.is_limited("foo", limit)
+                for backend in itertools.islice(itertools.cycle(processes), 400)
+            )
+
+        assert limit <= allowed <= limit + len(processes) * max_local_pending
+
+
+@requires_benchmark
+@pytest.mark.parametrize("backend_cls", [RedisRateLimiter, HybridRateLimiter])
+def test_benchmark_rate_limiter(backend_cls, benchmark):
+    # Simulate several API processes sharing hot keys, each with its own local state.
+    processes = itertools.cycle([backend_cls() for _ in range(8)])
+    keys = itertools.cycle([f"user:{i}" for i in range(20)])
+
+    def check():
+        next(processes).is_limited(next(keys), 10000)
+
+    benchmark(check)
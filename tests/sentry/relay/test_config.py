@@ -21,7 +21,11 @@ from sentry.dynamic_sampling.rules.base import NEW_MODEL_THRESHOLD_IN_MINUTES
 from sentry.models import ProjectKey
 from sentry.models.projectteam import ProjectTeam
 from sentry.models.transaction_threshold import TransactionMetric
-from sentry.relay.config import ProjectConfig, get_project_config
+from sentry.relay.config import (
+    ProjectConfig,
+    get_project_config,
+    get_project_configs_for_keys,
+)
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.factories import Factories
 from sentry.testutils.helpers import Feature
@@ -130,6 +134,38 @@ def test_get_project_config(default_project, insta_snapshot, django_cache, full)
     insta_snapshot(cfg)
 
 
+@django_db_all
+@region_silo_test(stable=True)
+@freeze_time("2022-10-21 18:50:25.000000+00:00")
+def test_get_project_configs_for_keys(default_project, django_cache):
+    other_key = Factories.create_project_key(default_project)
+    keys = list(ProjectKey.objects.filter(project=default_project))
+    assert len(keys) == 2
+    default_project.update_option("sentry:relay-rev", "fixed-rev")
+
+    org_sections = {}
+    configs = get_project_configs_for_keys(default_project, keys, org_sections=org_sections)
+
+    assert set(configs.keys()) == {key.public_key for key in keys}
+    assert other_key.public_key in configs
+    for key in keys:
+        expected = get_project_config(default_project, project_keys=[key]).to_dict()
+        assert configs[key.public_key].to_dict() == expected
+
+    assert set(org_sections.keys()) == {"trustedRelays", "eventRetention"}
+
+
+@django_db_all
+@region_silo_test(stable=True)
+def test_get_project_configs_for_keys_non_visible(default_project):
+    keys = list(ProjectKey.objects.filter(project=default_project))
+    default_project.update(status=ObjectStatus.PENDING_DELETION)
+    configs = get_project_configs_for_keys(default_project, keys)
+    assert {k: cfg.to_dict() for k, cfg in configs.items()} == {
+        key.public_key: {"disabled": True} for key in keys
+    }
+
+
 SOME_EXCEPTION = RuntimeError("foo")
 
 
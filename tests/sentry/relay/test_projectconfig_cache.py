@@ -1,5 +1,7 @@
 from unittest import mock
 
+from sentry.models import ProjectKey, ProjectOption
+from sentry.relay.config import get_project_config
 from sentry.relay.projectconfig_cache import redis
 from sentry.utils.pytest.fixtures import django_db_all
 
@@ -23,3 +25,59 @@ def test_read_write():
     my_key = "fake-dsn-1"
     cache.set_many({my_key: "my-value"})
     assert cache.get(my_key) == "my-value"
+
+
+@django_db_all
+def test_unchanged_config_is_not_rewritten(monkeypatch):
+    cache = redis.RedisProjectConfigCache()
+    my_key = "fake-dsn-2"
+    cache.set_many({my_key: {"disabled": False, "lastFetch": "2023-01-01T00:00:00Z"}})
+
+    incr_mock = mock.Mock()
+    monkeypatch.setattr(redis.metrics, "incr", incr_mock)
+    cache.set_many({my_key: {"disabled": False, "lastFetch": "2023-01-02T00:00:00Z"}})
+
+    assert (
+        mock.call("relay.projectconfig_cache.write", amount=1, tags={"action": "unchanged"})
+        in incr_mock.call_args_list
+    )
+    assert cache.get(my_key)["lastFetch"] == "2023-01-01T00:00:00Z"
+
+    cache.set_many({my_key: {"disabled": True}})
+    assert cache.get(my_key) == {"disabled": True}
+
+
+@django_db_all
+def test_unchanged_project_config_is_not_rewritten(default_project, monkeypatch):
+    # Without ``sentry:relay-rev``, every computation has a new revision.
+    ProjectOption.objects.unset_value(default_project, "sentry:relay-rev")
+    ProjectOption.objects.unset_value(default_project, "sentry:relay-rev-lastchange")
+    cache = redis.RedisProjectConfigCache()
+    key = ProjectKey.objects.filter(project=default_project)[0]
+
+    first = get_project_config(default_project, project_keys=[key]).to_dict()
+    cache.set_many({key.public_key: first})
+
+    incr_mock = mock.Mock()
+    monkeypatch.setattr(redis.metrics, "incr", incr_mock)
+    second = get_project_config(default_project, project_keys=[key]).to_dict()
+    assert second["rev"] != first["rev"]
+    cache.set_many({key.public_key: second})
+
+    assert (
+        mock.call("relay.projectconfig_cache.write", amount=1, tags={"action": "unchanged"})
+        in incr_mock.call_args_list
+    )
+    assert cache.get(key.public_key)["rev"] == first["rev"]
+
+
+@django_db_all
+def test_deleted_config_is_rewritten():
+    cache = redis.RedisProjectConfigCache()
+    my_key = "fake-dsn-3"
+    cache.set_many({my_key: {"disabled": True}})
+    cache.delete_many([my_key])
+    assert cache.get(my_key) is None
+
+    cache.set_many({my_key: {"disabled": True}})
+    assert cache.get(my_key) == {"disabled": True}
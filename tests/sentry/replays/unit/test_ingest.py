@@ -0,0 +1,131 @@
+import uuid
+import zlib
+
+import pytest
+
+from sentry.replays.usecases.ingest import RecordingSegmentEvents, iter_json_array
+from sentry.replays.usecases.ingest.dom_index import parse_replay_actions
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils import json
+
+
+def make_click(index: int):
+    return {
+        "type": 5,
+        "timestamp": 1674298825,
+        "data": {
+            "tag": "breadcrumb",
+            "payload": {
+                "timestamp": 1674298825.403,
+                "type": "default",
+                "category": "ui.click",
+                "message": "div#hello.hello.world",
+                "data": {
+                    "nodeId": index,
+                    "node": {
+                        "id": index,
+                        "tagName": "div",
+                        "attributes": {"id": "hello", "class": "hello world"},
+                        "textContent": "Hellö, wörld! ✓",
+                    },
+                },
+            },
+        },
+    }
+
+
+def make_recording(num_events: int, snapshot_size: int):
+    """Return a synthetic recording: a full snapshot followed by incremental and click events."""
+    events = [{"type": 2, "timestamp": 1674298825, "data": {"node": "x" * snapshot_size}}]
+    for index in range(num_events):
+        if index % 100 == 0:
+            events.append(make_click(index))
+        else:
+            events.append(
+                {
+                    "type": 3,
+                    "timestamp": 1674298825 + index,
+                    "data": {"source": 2, "texts": [], "attributes": [], "removes": [], "x": 1.5},
+                }
+            )
+    return events
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_recording_segment_events(compressed, chunk_size):
+    events = make_recording(num_events=300, snapshot_size=1000)
+    events.extend([1, -2.5e10, "ä", None, True, [], {}])
+    data = json.dumps(events).encode()
+    segment_bytes = zlib.compress(data) if compressed else data
+
+    segment_events = RecordingSegmentEvents(segment_bytes, chunk_size)
+    assert list(segment_events) == events
+
+    segment_events.consume()
+    assert segment_events.size_uncompressed == len(data)
+
+
+def test_recording_segment_events_consume_after_partial_read():
+    data = json.dumps(make_recording(num_events=1000, snapshot_size=1000)).encode()
+    segment_events = RecordingSegmentEvents(zlib.compress(data), chunk_size=1024)
+
+    assert next(iter(segment_events))["type"] == 2
+    assert segment_events.size_uncompressed < len(data)
+
+    segment_events.consume()
+    assert segment_events.size_uncompressed == len(data)
+
+
+@pytest.mark.parametrize("data", [b"", b"{}", b"[1,2", b"[1 2]", b"[1,]", b"[{]"])
+def test_iter_json_array_invalid(data):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([data[i : i + 1] for i in range(len(data))]))
+
+
+def test_iter_json_array_split_numbers():
+    data = b"[\n 3.25,\n 1.5e-07,\n -2E+10,\n 10,\n 0.5e3\n]"
+    expected = [3.25, 1.5e-07, -2e10, 10, 500.0]
+
+    # Split the array at every offset, including inside of fractions and exponents.
+    for offset in range(1, len(data)):
+        assert list(iter_json_array([data[:offset], data[offset:]])) == expected
+
+    for chunk_size in range(1, 10):
+        chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+        assert list(iter_json_array(chunks)) == expected
+
+
+def test_iter_json_array_empty():
+    assert list(iter_json_array([b" [ ", b" ] "])) == []
+
+
+def test_parse_replay_actions_streaming():
+    replay_id = uuid.uuid4().hex
+    events = make_recording(num_events=3000, snapshot_size=1000)
+    segment_bytes = zlib.compress(json.dumps(events).encode())
+
+    streamed = parse_replay_actions(1, replay_id, 30, RecordingSegmentEvents(segment_bytes))
+    parsed = parse_replay_actions(1, replay_id, 30, events)
+    assert streamed is not None and parsed is not None
+    assert streamed["payload"] == parsed["payload"]
+
+
+@requires_benchmark
+@pytest.mark.parametrize("streaming", [False, True])
+def test_benchmark_parse_large_recording(benchmark, streaming):
+    # A multi-megabyte segment with a large full snapshot, like the ones recorded for pages
+    # with big DOMs.
+    events = make_recording(num_events=20000, snapshot_size=4 * 1024 * 1024)
+    segment_bytes = zlib.compress(json.dumps(events).encode())
+
+    def parse():
+        if streaming:
+            segment_data = RecordingSegmentEvents(segment_bytes)
+        else:
+            segment_data = json.loads(
+                zlib.decompress(segment_bytes, zlib.MAX_WBITS | 32), use_rapid_json=True
+            )
+        return parse_replay_actions(1, "1", 30, segment_data)
+
+    assert benchmark(parse) is not None
@@ -0,0 +1,98 @@
+import threading
+import time
+import uuid
+import zlib
+from unittest import mock
+
+import pytest
+import sentry_sdk
+
+from sentry.replays.lib.storage import RecordingSegmentStorageMeta
+from sentry.replays.usecases import reader
+from sentry.testutils.helpers import override_options
+from sentry.testutils.skips import requires_benchmark
+
+
+def make_segments(count: int, replay_id: str = "a" * 32):
+    return [
+        RecordingSegmentStorageMeta(
+            project_id=1, replay_id=replay_id, segment_id=i, retention_days=30
+        )
+        for i in range(count)
+    ]
+
+
+class FakeStorage:
+    def __init__(self, latency: float = 0) -> None:
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get(self, segment: RecordingSegmentStorageMeta) -> bytes:
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return zlib.compress(f'[{{"segment":{segment.segment_id}}}]'.encode())
+
+
+@pytest.mark.django_db
+def test_download_segments_in_order():
+    segments = make_segments(50)
+
+    with mock.patch.object(reader, "storage", FakeStorage()):
+        result = b"".join(reader.download_segments(segments))
+
+    assert result == b"[" + b",".join(b'[{"segment":%d}]' % i for i in range(50)) + b"]"
+
+
+@pytest.mark.django_db
+def test_download_segments_empty():
+    assert b"".join(reader.download_segments([])) == b"[]"
+
+
+@pytest.mark.django_db
+def test_download_segments_bounded_lookahead():
+    fake_storage = FakeStorage()
+
+    with mock.patch.object(reader, "storage", fake_storage):
+        stream = reader.download_segments(make_segments(500))
+        assert next(stream) == b"["
+        assert next(stream) == b'[{"segment":0}]'
+
+        # Only the segments ahead of the one streamed are downloaded, not the whole replay.
+        assert fake_storage.calls <= reader.DOWNLOAD_LOOKAHEAD + 1
+        stream.close()
+
+
+@pytest.mark.django_db
+def test_download_segment_cache():
+    fake_storage = FakeStorage()
+    segment = make_segments(1, replay_id=uuid.uuid4().hex)[0]
+    transaction = sentry_sdk.start_transaction(op="test", name="test_download_segment_cache")
+
+    with mock.patch.object(reader, "storage", fake_storage):
+        with override_options({"replay.reader.segment-cache-size": 1024}):
+            for _ in range(2):
+                result = reader.download_segment(segment, transaction, sentry_sdk.Hub.current)
+                assert result == b'[{"segment":0}]'
+            assert fake_storage.calls == 1
+
+        # The cache is disabled by default.
+        reader.download_segment(segment, transaction, sentry_sdk.Hub.current)
+        assert fake_storage.calls == 2
+
+
+@requires_benchmark
+@pytest.mark.django_db
+def test_benchmark_download_segments_time_to_first_byte(benchmark):
+    segments = make_segments(500)
+
+    def first_segment():
+        stream = reader.download_segments(segments)
+        next(stream)
+        segment = next(stream)
+        stream.close()
+        return segment
+
+    with mock.patch.object(reader, "storage", FakeStorage(latency=0.005)):
+        assert benchmark(first_segment) == b'[{"segment":0}]'
@@ -14,6 +14,7 @@ from sentry.search.events import constants
 from sentry.search.events.builder import QueryBuilder
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
+from sentry.testutils.skips import requires_benchmark
 from sentry.utils.snuba import QueryOutsideRetentionError
 from sentry.utils.validators import INVALID_ID_DETAILS
 
@@ -810,3 +811,50 @@ class QueryBuilderTest(TestCase):
                 query="profile.id:foo",
                 selected_columns=["count()"],
             )
+
+
+# Query shapes that dashboards and the performance landing page build repeatedly
+BENCHMARK_QUERY_SHAPES = {
+    "dashboard": {
+        "query": "event.type:transaction transaction.op:http.server !transaction:/health",
+        "selected_columns": ["transaction", "count()", "p95(transaction.duration)"],
+        "orderby": ["-count()"],
+    },
+    "landing": {
+        "query": "event.type:transaction (http.method:GET OR http.method:POST)",
+        "selected_columns": [
+            "transaction",
+            "project",
+            "tpm()",
+            "p50(transaction.duration)",
+            "p95(transaction.duration)",
+            "failure_rate()",
+            "count_unique(user)",
+        ],
+        "orderby": ["-tpm()"],
+    },
+    "equations": {
+        "query": "event.type:transaction",
+        "selected_columns": ["transaction", "count()", "count_unique(user)"],
+        "equations": ["count() / count_unique(user)", "count() * 2"],
+        "orderby": ["-count()"],
+    },
+}
+
+
+@requires_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("shape", sorted(BENCHMARK_QUERY_SHAPES))
+def test_benchmark_builder_construction(shape, benchmark, default_project):
+    now = timezone.now()
+    params = {
+        "organization_id": default_project.organization_id,
+        "project_id": [default_project.id],
+        "start": now - datetime.timedelta(days=1),
+        "end": now,
+    }
+
+    def build():
+        QueryBuilder(Dataset.Discover, params, **BENCHMARK_QUERY_SHAPES[shape]).get_snql_query()
+
+    benchmark(build)
@@ -1526,6 +1526,37 @@ class MetricQueryBuilderTest(MetricBuilderBaseTest):
             use_aggregate_conditions=True,
         )
 
+    @mock.patch("sentry.snuba.metrics.datasource.get_custom_measurements")
+    def test_custom_measurements_shared_between_builders(self, mock_measurements):
+        measurement = {
+            "name": "measurements.custom.measurement",
+            "type": "distribution",
+            "operations": ["avg", "p50"],
+            "unit": "millisecond",
+            "metric_id": 123,
+            "mri_string": "d:transactions/measurements.custom.measurement@millisecond",
+        }
+        mock_measurements.return_value = [measurement]
+
+        for _ in range(2):
+            query = MetricsQueryBuilder(
+                self.params,
+                dataset=Dataset.PerformanceMetrics,
+                selected_columns=["transaction", "p50(transaction.duration)"],
+            )
+            assert query.custom_measurement_map == [measurement]
+        assert mock_measurements.call_count == 1
+
+        # Builders for other projects of the org don't share the measurements
+        params = {**self.params, "project_id": [self.create_project().id]}
+        query = MetricsQueryBuilder(
+            params,
+            dataset=Dataset.PerformanceMetrics,
+            selected_columns=["transaction", "p50(transaction.duration)"],
+        )
+        assert query.custom_measurement_map == [measurement]
+        assert mock_measurements.call_count == 2
+
     def test_group_by_not_in_select(self):
         query = MetricsQueryBuilder(
             self.params,
@@ -17,6 +17,8 @@ from sentry.snuba import discover
 from sentry.snuba.dataset import Dataset
 from sentry.testutils import TestCase
 from sentry.testutils.helpers.datetime import before_now
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils.dates import to_timestamp
 from sentry.utils.snuba import get_array_column_alias
 
 ARRAY_COLUMNS = ["measurements", "span_op_breakdowns"]
@@ -2479,3 +2481,72 @@ def test_zerofill():
 
     assert results[0]["time"] == 1546387200
     assert results[7]["time"] == 1546992000
+
+
+def test_zerofill_rows():
+    data = [
+        {"time": "2019-01-03T00:00:00+00:00", "count": 1},
+        {"time": 1546473600, "count": 2},
+        # not aligned to the buckets
+        {"time": 1546473601, "count": 3},
+        # outside of the buckets
+        {"time": 1546300800, "count": 4},
+        {"time": "2019-01-05T00:00:00+00:00", "count": 5},
+    ]
+    results = discover.zerofill(
+        data, datetime(2019, 1, 2, 0, 0), datetime(2019, 1, 5, 23, 59, 59), 86400, "time"
+    )
+
+    assert results == [
+        {"time": 1546387200},
+        {"time": 1546473600, "count": 1},
+        {"time": 1546473600, "count": 2},
+        {"time": 1546560000},
+        {"time": 1546646400, "count": 5},
+    ]
+    assert discover.format_time(
+        data, datetime(2019, 1, 2, 0, 0), datetime(2019, 1, 5, 23, 59, 59), 86400, "-time"
+    ) == [
+        {"time": 1546646400, "count": 5},
+        {"time": 1546473600, "count": 2},
+        {"time": 1546473600, "count": 1},
+    ]
+
+
+def test_timeseries_buckets_shared_between_series():
+    buckets = discover.TimeseriesBuckets(
+        datetime(2019, 1, 2, 0, 0), datetime(2019, 1, 3, 23, 59, 59), 86400
+    )
+    first = buckets.zerofill([{"time": "2019-01-02T00:00:00+00:00", "count": 1}], "time")
+    second = buckets.zerofill([{"time": "2019-01-03T00:00:00+00:00", "count": 2}], "time")
+
+    assert first == [{"time": 1546387200, "count": 1}, {"time": 1546473600}]
+    assert second == [{"time": 1546387200}, {"time": 1546473600, "count": 2}]
+    # Zero rows are not shared between series.
+    assert first[1] is not second[0]
+
+
+@requires_benchmark
+def test_benchmark_top_events_zerofill(benchmark):
+    start = datetime(2019, 1, 1, 0, 0)
+    rollup = 60
+    num_buckets = 10000
+    end = datetime.utcfromtimestamp(to_timestamp(start) + rollup * (num_buckets - 1))
+    times = [
+        datetime.utcfromtimestamp(to_timestamp(start) + rollup * i).isoformat() + "+00:00"
+        for i in range(num_buckets)
+    ]
+    series = {
+        f"series-{key}": [{"time": time, "count": i} for i, time in enumerate(times) if i % 4]
+        for key in range(10)
+    }
+
+    def zerofill():
+        buckets = discover.TimeseriesBuckets(start, end, rollup)
+        return {
+            key: buckets.zerofill([dict(row) for row in rows], "time")
+            for key, rows in series.items()
+        }
+
+    results = benchmark(zerofill)
+    assert all(len(result) == num_buckets for result in results.values())
@@ -1,4 +1,5 @@
 from typing import List, Mapping, Optional
+from unittest import mock
 
 import pytest
 
@@ -18,7 +19,9 @@ from sentry.spans.grouping.strategy.config import (
     register_configuration,
 )
 from sentry.spans.grouping.utils import hash_values
+from sentry.testutils.performance_issues.event_generators import EVENTS, get_event
 from sentry.testutils.performance_issues.span_builder import SpanBuilder
+from sentry.testutils.skips import requires_benchmark
 
 
 def test_register_duplicate_confiig() -> None:
@@ -571,3 +574,82 @@ def test_default_2022_10_27_strategy(spans: List[Span], expected: Mapping[str, L
         key: hash_values(values)
         for key, values in {**expected, "a" * 16: ["transaction name"]}.items()
     }
+
+
+def test_default_fingerprint_is_memoized() -> None:
+    mock_strategy = mock.Mock(side_effect=lambda span: [span["description"].upper()])
+    strategy = SpanGroupingStrategy(name="memoized-strategy", strategies=[mock_strategy])
+    event = {
+        "transaction": "transaction name",
+        "contexts": {"trace": {"span_id": "a" * 16}},
+        "spans": [
+            SpanBuilder().with_span_id("b" * 16).with_op("db").with_description("hi").build(),
+            SpanBuilder().with_span_id("c" * 16).with_op("db").with_description("hi").build(),
+            SpanBuilder().with_span_id("d" * 16).with_op("http").with_description("hi").build(),
+        ],
+    }
+
+    results = strategy.execute_many([event, event])
+    assert (
+        results[0]
+        == results[1]
+        == {
+            "a" * 16: hash_values(["transaction name"]),
+            "b" * 16: hash_values(["HI"]),
+            "c" * 16: hash_values(["HI"]),
+            "d" * 16: hash_values(["HI"]),
+        }
+    )
+    assert mock_strategy.call_count == 2
+
+
+def test_execute_strategy_many() -> None:
+    configuration = CONFIGURATIONS["default:2022-10-27"]
+    events = [
+        {
+            "transaction": "transaction name",
+            "contexts": {"trace": {"span_id": "a" * 16}},
+            "spans": [
+                SpanBuilder()
+                .with_span_id("b" * 16)
+                .with_op("db")
+                .with_description(f"SELECT * FROM table WHERE id = {i}")
+                .build()
+            ],
+        }
+        for i in range(3)
+    ]
+    # Existing results of the same configuration are reused.
+    events.append(
+        {
+            "transaction": "transaction name",
+            "contexts": {"trace": {"span_id": "a" * 16, "hash": "a" * 16}},
+            "spans": [SpanBuilder().with_span_id("b" * 16).with_hash("b" * 16).build()],
+            "span_grouping_config": {"id": "default:2022-10-27"},
+        }
+    )
+
+    results = configuration.execute_strategy_many(events)
+    assert [result.results for result in results] == [
+        configuration.execute_strategy(event).results for event in events
+    ]
+    assert results[0].results == results[1].results == results[2].results
+    assert results[3].results == {"a" * 16: "a" * 16, "b" * 16: "b" * 16}
+
+
+@requires_benchmark
+@pytest.mark.parametrize("memoized", [False, True])
+def test_benchmark_execute_many(memoized, benchmark) -> None:
+    strategy = CONFIGURATIONS["default:2022-10-27"].strategy
+    events = [
+        event
+        for event in map(get_event, sorted(EVENTS))
+        if "trace" in event.get("contexts", {}) and "transaction" in event
+    ] * 10
+
+    def execute():
+        if not memoized:
+            strategy._default_fingerprint_cache.cache_clear()  # type: ignore[attr-defined]
+        strategy.execute_many(events)
+
+    benchmark(execute)
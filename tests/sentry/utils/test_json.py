@@ -1,10 +1,14 @@
+import collections
 import datetime
+import decimal
 import uuid
-from enum import Enum
+from enum import Enum, IntEnum
 from unittest import TestCase
 
+import pytest
 from django.utils.translation import gettext_lazy as _
 
+from sentry.testutils.skips import requires_benchmark
 from sentry.utils import json
 
 
@@ -48,3 +52,143 @@ class JSONTest(TestCase):
 
     def test_translation(self):
         self.assertEqual(json.dumps(_("word")), '"word"')
+
+    def test_dumps_bytes(self):
+        res = {"foo": ["bär", datetime.datetime(2011, 1, 1)]}
+        assert json.dumps_bytes(res) == json.dumps(res).encode("utf-8")
+        assert json.loads(json.dumps_bytes(res)) == {"foo": ["bär", "2011-01-01T00:00:00.000000Z"]}
+
+    def test_rapid_json_escape(self):
+        res = "<script>alert('&');</script>"
+        assert json.dumps(res, escape=True, use_rapid_json=True) == json.dumps(res, escape=True)
+
+
+Point = collections.namedtuple("Point", "x y")
+
+
+class IntChoice(IntEnum):
+    a = 1
+
+
+class FloatChoice(float, Enum):
+    a = 1.5
+
+
+CONFORMANCE_VALUES = [
+    None,
+    True,
+    0,
+    -5,
+    2**70,
+    1.5,
+    1e16,
+    1e-7,
+    0.1,
+    float("nan"),
+    float("inf"),
+    -float("inf"),
+    "",
+    "plain",
+    "é",
+    " ",
+    "😀",
+    "\x00\x1f\x7f",
+    "back\\slash \\u00E9",
+    "<a href='x'>&</a>",
+    '"quoted"',
+    b"bytes",
+    bytearray(b"bytes"),
+    [1, (2, 3)],
+    (1, 2),
+    Point(1, [2]),
+    {"nested": Point(1, 2)},
+    {1: "int key", None: "none key", False: "bool key", 1.5: "float key"},
+    {"b": 1, "a": 2, "é": 3},
+    {"b": 1, "a\x00z": 2, "a\x00a": 3, "a": 4},
+    {"set"},
+    frozenset([1]),
+    decimal.Decimal("1.10"),
+    uuid.UUID(int=12345),
+    datetime.datetime(2020, 1, 2, 3, 4, 5, 6),
+    datetime.datetime(2020, 1, 2, tzinfo=datetime.timezone.utc),
+    datetime.date(2020, 1, 2),
+    datetime.time(1, 2, 3, 400),
+    datetime.time(1, 2, tzinfo=datetime.timezone.utc),
+    Enum("foo", "a b c").a,
+    IntChoice.a,
+    FloatChoice.a,
+    {"nested": [FloatChoice.a]},
+    {FloatChoice.a: "float enum key"},
+    Point(FloatChoice.a, 2),
+    _("word"),
+    lambda: None,
+    object(),
+    {"deep": [{"deeper": ["é", 1.0, None, {"date": datetime.date(2021, 1, 1)}]}]},
+]
+
+CONFORMANCE_ENCODERS = {
+    "default": json._default_encoder,
+    "escaped": json._default_escaped_encoder,
+    # The configuration nodestore uses
+    "sorted": json.JSONEncoder(
+        separators=(",", ":"), sort_keys=True, allow_nan=True, ensure_ascii=True
+    ),
+}
+
+
+@pytest.mark.parametrize("encoder", sorted(CONFORMANCE_ENCODERS))
+@pytest.mark.parametrize("value", CONFORMANCE_VALUES, ids=repr)
+def test_rapid_json_encoder_conformance(encoder, value):
+    fallback = CONFORMANCE_ENCODERS[encoder]
+    rapid = json.RapidJSONEncoder(fallback)
+
+    try:
+        expected = fallback.encode(value)
+    except (TypeError, ValueError) as e:
+        with pytest.raises(type(e)):
+            rapid.encode(value)
+    else:
+        assert rapid.encode(value) == expected
+        assert rapid.encode_bytes(value) == expected.encode("utf-8")
+
+
+def test_rapid_json_encoder_unsupported_config():
+    with pytest.raises(ValueError):
+        json.RapidJSONEncoder(json.JSONEncoder(indent=2))
+
+    with pytest.raises(ValueError):
+        json.RapidJSONEncoder(json.JSONEncoder(ensure_ascii=False))
+
+
+BENCHMARK_PAYLOAD = {
+    "event_id": uuid.UUID(int=1).hex,
+    "datetime": datetime.datetime(2020, 1, 2, 3, 4, 5),
+    "tags": [["level", "error"], ["browser", "Chrome 114"], ["unicode", "é😀"]],
+    "exception": {
+        "values": [
+            {
+                "type": "ValueError",
+                "stacktrace": {
+                    "frames": [
+                        {
+                            "filename": f"module_{i}.py",
+                            "lineno": i,
+                            "in_app": i % 2 == 0,
+                            "vars": {"arg": "x" * 40, "count": i, "ratio": i / 3},
+                        }
+                        for i in range(50)
+                    ]
+                },
+            }
+        ]
+    },
+}
+
+
+@requires_benchmark
+@pytest.mark.parametrize("backend", ["simplejson", "rapidjson"])
+def test_benchmark_dumps(backend, benchmark):
+    if backend == "rapidjson":
+        benchmark(json.dumps_bytes, BENCHMARK_PAYLOAD)
+    else:
+        benchmark(lambda: json.dumps(BENCHMARK_PAYLOAD).encode("utf-8"))
@@ -1,7 +1,10 @@
+import threading
+import time
 from unittest import mock
 
 import pytest
 
+from sentry.testutils.skips import requires_benchmark
 from sentry.utils import metrics
 
 
@@ -44,3 +47,161 @@ def test_wraps():
         args, kwargs = timing.call_args
         assert args[0] == "key"
         assert args[3] == {"foo": True, "result": "success"}
+
+
+def test_sampled_wraps():
+    @metrics.sampled_wraps("key", sample_rate=0.0)
+    def never(a):
+        return a
+
+    @metrics.sampled_wraps("key", sample_rate=0.5, tags={"foo": True})
+    def sometimes(a):
+        return a
+
+    with mock.patch.object(metrics.backend, "presampled_timing") as timing, mock.patch(
+        "sentry.utils.metrics.random", return_value=0.9
+    ):
+        assert never(10) == 10
+        assert timing.call_count == 0
+
+        assert sometimes(10) == 10
+        assert timing.call_count == 1
+        args, kwargs = timing.call_args
+        assert args[0] == "key"
+        assert args[3] == {"foo": True, "result": "success"}
+        assert args[4] == 0.5
+
+
+def test_counter_is_interned():
+    assert metrics.counter("key", tags={"a": "b"}) is metrics.counter("key", tags={"a": "b"})
+    assert metrics.counter("key", tags={"a": "b"}) is not metrics.counter("key", tags={"a": "c"})
+    assert metrics.distribution("key") is not metrics.counter("key")
+
+
+def test_buffered_counter():
+    handle = metrics.counter("buffered.key", tags={"foo": "bar"})
+    metrics.flush_buffered()
+
+    with mock.patch("sentry.utils.metrics.incr") as incr:
+        handle.incr()
+        handle.incr(2)
+        assert incr.call_count == 0
+
+        metrics.flush_buffered()
+        assert incr.call_args_list == [
+            mock.call("buffered.key", 3, None, {"foo": "bar"}, sample_rate=1.0)
+        ]
+
+        metrics.flush_buffered()
+        assert incr.call_count == 1
+
+
+def test_buffered_counter_flush_interval():
+    handle = metrics.counter("buffered.key")
+    metrics.flush_buffered()
+
+    with mock.patch("sentry.utils.metrics.incr") as incr, mock.patch(
+        "sentry.utils.metrics.BUFFER_FLUSH_INTERVAL", 0
+    ):
+        handle.incr()
+        assert incr.call_count == 1
+
+
+def test_buffered_counter_flushed_for_idle_threads():
+    handle = metrics.counter("buffered.key")
+    recorded = threading.Event()
+    done = threading.Event()
+
+    def worker():
+        handle.incr()
+        recorded.set()
+        done.wait()
+
+    with mock.patch("sentry.utils.metrics.incr") as incr, mock.patch(
+        "sentry.utils.metrics.BUFFER_FLUSH_INTERVAL", 0.05
+    ):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        try:
+            recorded.wait()
+            # The worker doesn't record anything else, the background flusher sends the value.
+            deadline = time.monotonic() + 5
+            while not incr.call_count and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            done.set()
+            thread.join()
+
+        assert incr.call_args_list == [mock.call("buffered.key", 1, None, {}, sample_rate=1.0)]
+
+
+def test_buffered_counter_flushed_for_exited_threads():
+    handle = metrics.counter("buffered.key")
+
+    with mock.patch("sentry.utils.metrics.incr") as incr:
+        thread = threading.Thread(target=handle.incr)
+        thread.start()
+        thread.join()
+
+        metrics._flush_idle_buffers()
+        assert incr.call_args_list == [mock.call("buffered.key", 1, None, {}, sample_rate=1.0)]
+
+
+def test_buffered_distribution():
+    handle = metrics.distribution("buffered.timing", tags={"foo": "bar"}, sample_rate=0.5)
+    never = metrics.distribution("buffered.timing", sample_rate=0.0)
+    metrics.flush_buffered()
+
+    with mock.patch.object(metrics.backend, "presampled_timing") as timing, mock.patch(
+        "sentry.utils.metrics.random", return_value=0.9
+    ):
+        handle.record(1.5)
+        never.record(2.0)
+        with handle.time():
+            pass
+        assert timing.call_count == 0
+
+        metrics.flush_buffered()
+        assert timing.call_count == 2
+        assert timing.call_args_list[0] == mock.call(
+            "buffered.timing", 1.5, None, {"foo": "bar"}, 0.5
+        )
+
+
+BENCHMARK_BACKENDS = [
+    "sentry.metrics.dummy.DummyMetricsBackend",
+    "sentry.metrics.statsd.StatsdMetricsBackend",
+]
+
+
+@pytest.fixture(params=BENCHMARK_BACKENDS, ids=lambda path: path.rsplit(".", 1)[-1])
+def metrics_backend(request, monkeypatch):
+    from sentry.metrics.middleware import MiddlewareWrapper
+    from sentry.utils.imports import import_string
+
+    backend = MiddlewareWrapper(import_string(request.param)())
+    monkeypatch.setattr(metrics, "backend", backend)
+    yield backend
+    metrics.flush_buffered()
+
+
+@requires_benchmark
+def test_benchmark_incr(metrics_backend, benchmark):
+    benchmark(metrics.incr, "benchmark.key", tags={"cache_hit": "true", "caller": "resolve"})
+
+
+@requires_benchmark
+def test_benchmark_buffered_counter(metrics_backend, benchmark):
+    handle = metrics.counter("benchmark.key", tags={"cache_hit": "true", "caller": "resolve"})
+    benchmark(handle.incr)
+
+
+@requires_benchmark
+def test_benchmark_timing(metrics_backend, benchmark):
+    benchmark(metrics.timing, "benchmark.timing", 1.0, tags={"caller": "resolve"})
+
+
+@requires_benchmark
+def test_benchmark_buffered_distribution(metrics_backend, benchmark):
+    handle = metrics.distribution("benchmark.timing", tags={"caller": "resolve"})
+    benchmark(handle.record, 1.0)
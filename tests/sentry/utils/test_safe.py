@@ -5,8 +5,10 @@ from unittest.mock import Mock, patch
 import pytest
 
 from sentry.testutils import TestCase
+from sentry.testutils.skips import requires_benchmark
 from sentry.utils.canonical import CanonicalKeyDict
 from sentry.utils.safe import (
+    _str_repr_len,
     get_path,
     safe_execute,
     safe_urlencode,
@@ -18,6 +20,27 @@ from sentry.utils.safe import (
 a_very_long_string = "a" * 1024
 
 
+def nested_payload(depth):
+    # Every level holds most of the data of the level above, which is the worst
+    # case for ordering dict items by their length.
+    if depth == 0:
+        return {"values": list(range(2000)), "name": "leaf"}
+    return {"child": nested_payload(depth - 1), "name": f"level {depth}", "tags": ("a", "b")}
+
+
+def event_like_payload():
+    return {
+        "extra": {
+            f"var{i}": {"items": list(range(20)), "value": "x" * 50, "meta": {"id": i}}
+            for i in range(30)
+        },
+        "contexts": {
+            "os": {"name": "Linux", "version": "5.4"},
+            "runtime": {"name": "CPython", "version": "3.8.12"},
+        },
+    }
+
+
 class TrimTest(unittest.TestCase):
     def test_simple_string(self):
         assert trim(a_very_long_string) == a_very_long_string[:509] + "..."
@@ -60,6 +83,54 @@ class TrimTest(unittest.TestCase):
         a = {"a": {"b": {"c": []}}}
         assert trm(a) == {"a": {"b": {"c": "[]"}}}
 
+    def test_tuples(self):
+        assert trim(("a", ("b",), ())) == ("a", ("b",), ())
+        assert trim({"a": (1,), "b": "x" * 10}, max_size=12) == {"a": (1,), "b": "xx..."}
+
+    def test_sorted_by_nested_length(self):
+        # Items are ordered by the length of their string representation,
+        # including nested quotes, escapes and separators.
+        data = {"a": ['it\'s "quoted"'], "b": ["\n" * 3], "c": {"k": None}, "d": ("x",)}
+        assert list(trim(data)) == ["d", "b", "c", "a"]
+        assert trim(data, max_size=20) == {"d": ("x",), "b": ["\n\n\n"]}
+
+    def test_str_repr_len(self):
+        for value in (
+            "",
+            "abc",
+            "it's",
+            'say "hi"',
+            "both ' and \"",
+            "tab\t",
+            "\\",
+            "\x00",
+            "\xfc",
+        ):
+            assert _str_repr_len(value) == len(repr(value))
+
+    def test_deeply_nested(self):
+        data = nested_payload(10)
+        result = trim(data, max_size=100, max_depth=20)
+        assert list(result) == ["name", "tags", "child"]
+        assert result["child"]["name"] == "level 9"
+        assert "values" not in str(result)
+
+        # Measuring large subtrees bottom-up must not change the result.
+        with patch("sentry.utils.safe.BOTTOM_UP_MEASURE_MIN_LEN", 0):
+            assert trim(data, max_size=100, max_depth=20) == result
+        with patch("sentry.utils.safe.BOTTOM_UP_MEASURE_MIN_LEN", float("inf")):
+            assert trim(data, max_size=100, max_depth=20) == result
+
+
+@requires_benchmark
+@pytest.mark.parametrize(
+    "payload",
+    [nested_payload(12), event_like_payload()],
+    ids=["nested", "event_like"],
+)
+def test_benchmark_trim(payload, benchmark):
+    benchmark(trim, payload)
+
 
 class SafeExecuteTest(TestCase):
     def test_with_nameless_function(self):